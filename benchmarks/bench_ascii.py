@@ -0,0 +1,57 @@
+"""
+ASCII conversion benchmark - compares image_to_ascii against the original
+per-pixel getpixel loop and checks the output is byte-identical.
+Usage:
+  python benchmarks/bench_ascii.py                      # demo/default.png
+  python benchmarks/bench_ascii.py image.png 50 300 500 # custom image and widths
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from PIL import Image
+from src.draw_ascii import get_ascii_char, image_to_ascii
+
+DEFAULT_IMAGE = Path(__file__).parent.parent / "demo" / "default.png"
+DEFAULT_WIDTHS = [50, 100, 300, 500]
+
+
+def image_to_ascii_reference(image, width):
+    """The original implementation: getpixel + get_ascii_char per cell."""
+    aspect_ratio = image.width / image.height
+    height = int((width*aspect_ratio)*0.5)
+
+    image = image.resize((width, height))
+    image = image.convert('RGB')
+    ascii_str = ""
+
+    for y in range(height):
+        for x in range(width):
+            pixel = image.getpixel((x,y))
+            ascii_str += get_ascii_char(pixel)
+        ascii_str += "\n"
+
+    return ascii_str
+
+
+def best_of(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    image_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_IMAGE
+    widths = [int(w) for w in sys.argv[2:]] or DEFAULT_WIDTHS
+    img = Image.open(image_path)
+    img.load()
+
+    print(f"{'width':>6} {'reference':>12} {'lut':>12} {'speedup':>8}  identical")
+    for width in widths:
+        ref_time, ref = best_of(lambda: image_to_ascii_reference(img, width))
+        lut_time, out = best_of(lambda: image_to_ascii(img, width))
+        print(f"{width:>6} {ref_time * 1000:>10.2f}ms {lut_time * 1000:>10.2f}ms {ref_time / lut_time:>7.1f}x  {ref == out}")
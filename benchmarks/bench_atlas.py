@@ -0,0 +1,46 @@
+"""
+Glyph atlas benchmark - draws the ASCII block with per-line draw.text and with
+the glyph atlas, and checks the two canvases are pixel-identical.
+Usage:
+  python benchmarks/bench_atlas.py              # demo/default.png at several widths
+  python benchmarks/bench_atlas.py 50 500       # custom widths
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+from src.draw_ascii import image_to_ascii
+from src.glyph_atlas import draw_text_block
+
+DEFAULT_IMAGE = Path(__file__).parent.parent / "demo" / "default.png"
+FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf"
+DEFAULT_WIDTHS = [50, 100, 200, 500]
+COLOR = (173, 216, 230, 255)
+
+
+def render(lines, font, line_spacing, use_atlas):
+    canvas = Image.new("RGBA", (max(len(line) for line in lines) * 10 + 20, len(lines) * line_spacing + 20), (0, 0, 0, 200))
+    draw = ImageDraw.Draw(canvas)
+    start = time.perf_counter()
+    if use_atlas:
+        draw_text_block(draw, (10, 10), lines, line_spacing, COLOR, font)
+    else:
+        for i, line in enumerate(lines):
+            draw.text((10, 10 + i * line_spacing), line, fill=COLOR, font=font)
+    return time.perf_counter() - start, canvas
+
+
+if __name__ == "__main__":
+    widths = [int(w) for w in sys.argv[1:]] or DEFAULT_WIDTHS
+    font = ImageFont.truetype(FONT_PATH, 16)
+    img = Image.open(DEFAULT_IMAGE)
+    print(f"{'width':>6} {'draw.text':>12} {'atlas':>12} {'speedup':>8}  identical")
+    for width in widths:
+        lines = image_to_ascii(img, width).split("\n")
+        render(lines, font, 20, True)  # warm the atlas
+        text_time, reference = min(render(lines, font, 20, False) for _ in range(3))
+        atlas_time, composed = min(render(lines, font, 20, True) for _ in range(3))
+        identical = ImageChops.difference(reference, composed).getbbox() is None
+        print(f"{width:>6} {text_time * 1000:>10.2f}ms {atlas_time * 1000:>10.2f}ms {text_time / atlas_time:>7.1f}x  {identical}")
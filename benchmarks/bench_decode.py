@@ -0,0 +1,58 @@
+"""
+Avatar decode benchmark - compares Image.open + full decode with open_for_ascii
+(JPEG draft / reduce) on large synthetic photos, and checks the decode budget.
+Usage:
+  python benchmarks/bench_decode.py                 # 460px avatar and 12/24 MP photos at width 50
+  python benchmarks/bench_decode.py 100 300         # custom widths
+"""
+import sys
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from PIL import Image, ImageDraw
+from bench_ascii import best_of
+from src.draw_ascii import DEFAULT_WIDTH, image_to_ascii, open_for_ascii
+
+SIZES = [(460, 460), (4000, 3000), (6000, 4000)]
+
+
+def synthetic_photo(size: tuple, fmt: str) -> bytes:
+    image = Image.linear_gradient("L").resize(size).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for i in range(0, min(size) // 2, max(1, min(size) // 24)):
+        draw.ellipse((i, i, size[0] - i, size[1] - i), outline=(i % 256, 80, 200), width=max(1, min(size) // 100))
+    buffer = BytesIO()
+    image.save(buffer, fmt, quality=90) if fmt == "JPEG" else image.save(buffer, fmt)
+    return buffer.getvalue()
+
+
+def full_decode(data: bytes, width: int) -> tuple:
+    image = Image.open(BytesIO(data))
+    image.load()
+    return image.size, image_to_ascii(image, width)
+
+
+def fast_decode(data: bytes, width: int) -> tuple:
+    image = open_for_ascii(BytesIO(data), width)
+    return image.size, image_to_ascii(image, width)
+
+
+if __name__ == "__main__":
+    widths = [int(w) for w in sys.argv[1:]] or [DEFAULT_WIDTH]
+    print(f"{'source':>16} {'width':>6} {'full':>10} {'decoded':>11} {'fast':>10} {'decoded':>11} {'speedup':>8}")
+    for fmt in ("JPEG", "PNG"):
+        for size in SIZES:
+            data = synthetic_photo(size, fmt)
+            for width in widths:
+                full_time, (full_size, _) = best_of(lambda: full_decode(data, width))
+                fast_time, (fast_size, _) = best_of(lambda: fast_decode(data, width))
+                print(f"{fmt:>5} {size[0]:>4}x{size[1]:<5} {width:>6} {full_time * 1000:>8.1f}ms "
+                      f"{full_size[0]:>5}x{full_size[1]:<5} {fast_time * 1000:>8.1f}ms "
+                      f"{fast_size[0]:>5}x{fast_size[1]:<5} {full_time / fast_time:>7.1f}x")
+
+    try:
+        open_for_ascii(BytesIO(synthetic_photo((6000, 4000), "PNG")), DEFAULT_WIDTH, max_pixels=10_000_000)
+        print("decode budget: NOT enforced")
+    except ValueError as e:
+        print(f"decode budget: {e}")
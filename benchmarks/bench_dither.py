@@ -0,0 +1,47 @@
+"""
+ASCII quality-mode benchmark - times image_to_ascii with each contrast and
+dither mode against the plain path, and counts the distinct characters each
+mode produces for a low-contrast copy of the image.
+Usage:
+  python benchmarks/bench_dither.py                      # demo/default.png
+  python benchmarks/bench_dither.py image.png 50 300 500 # custom image and widths
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from PIL import Image, ImageEnhance
+from bench_ascii import DEFAULT_IMAGE, DEFAULT_WIDTHS, best_of
+from src.draw_ascii import image_to_ascii
+
+MODES = [
+    (None, None),
+    ("autocontrast", None),
+    ("equalize", None),
+    (None, "ordered"),
+    ("autocontrast", "ordered"),
+    (None, "floyd-steinberg"),
+    ("autocontrast", "floyd-steinberg"),
+]
+LOW_CONTRAST = 0.2
+
+
+def label(contrast, dither) -> str:
+    return "+".join(mode for mode in (contrast, dither) if mode) or "plain"
+
+
+if __name__ == "__main__":
+    image_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_IMAGE
+    widths = [int(w) for w in sys.argv[2:]] or DEFAULT_WIDTHS
+    img = Image.open(image_path)
+    img.load()
+    low = ImageEnhance.Contrast(img.convert("RGB")).enhance(LOW_CONTRAST)
+
+    print(f"{'mode':<30} {'width':>6} {'time':>10} {'vs plain':>9} {'chars (low contrast)':>21}")
+    for width in widths:
+        plain_time, _ = best_of(lambda: image_to_ascii(img, width), repeat=7)
+        for contrast, dither in MODES:
+            mode_time, _ = best_of(lambda: image_to_ascii(img, width, contrast, dither), repeat=7)
+            chars = len(set(image_to_ascii(low, width, contrast, dither)) - {"\n"})
+            print(f"{label(contrast, dither):<30} {width:>6} {mode_time * 1000:>8.2f}ms "
+                  f"{mode_time / plain_time:>8.2f}x {chars:>21}")
@@ -0,0 +1,80 @@
+"""
+Organization stats benchmark - runs fetch_org_stats against a synthetic
+organization on the mock API at several repo counts and reports time, API
+requests and Python heap peak (tracemalloc) per backend. The mock runs in a
+child process so its request log isn't counted in the peak. The "listing" row
+is the user-mode pattern for comparison: iterate the whole PaginatedList into
+a list, then filter it client-side.
+Usage:
+  python benchmarks/bench_org.py                    # 500 and 5000 repos, 40 members, both backends
+  python benchmarks/bench_org.py 1000 5000 --members --backends graphql
+"""
+import argparse
+import multiprocessing
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from github import Github
+from src import http_cache
+from src.mock_github import MockGitHub, make_dataset
+from src.org_stats import PAGE_SIZE, fetch_org_stats
+
+
+def traced(fn) -> tuple:
+    """(result, seconds, Python heap peak in bytes) for one call of fn."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def serve_mock(conn, count: int, members: list):
+    """Child process: run the mock for one organization, answering "requests" with the request count."""
+    dataset = make_dataset(logins=members, n_repos=0, orgs={"bench-org": count})
+    with MockGitHub(dataset, rate_limit=10**9) as api:
+        conn.send(api.base_url)
+        while conn.recv() == "requests":
+            conn.send(len(api.requests))
+
+
+def listing(g: Github, org: str) -> int:
+    repos = [repo for repo in g.get_organization(org).get_repos(type="all")]
+    return len([repo for repo in repos if repo.visibility == "public" and not repo.fork])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("repos", type=int, nargs="*", default=[500, 5000])
+    parser.add_argument("--members", action="store_true", help="include the per-member breakdown")
+    parser.add_argument("--n-members", type=int, default=40)
+    parser.add_argument("--backends", nargs="+", choices=("rest", "graphql"), default=["rest", "graphql"])
+    args = parser.parse_args()
+    http_cache.install(cache=False)
+    members = [f"member{i}" for i in range(args.n_members)]
+
+    print(f"{'repos':>6} {'mode':<8} {'requests':>9} {'time':>8} {'heap peak':>10}  result")
+    for count in args.repos:
+        conn, child_conn = multiprocessing.Pipe()
+        mock = multiprocessing.Process(target=serve_mock, args=(child_conn, count, members), daemon=True)
+        mock.start()
+        g = http_cache.github_client(members[0], conn.recv(), per_page=PAGE_SIZE)
+        runs = [("listing", lambda: listing(g, "bench-org"))]
+        runs += [(backend, lambda backend=backend: fetch_org_stats(g, "bench-org", backend, members=args.members))
+                 for backend in args.backends]
+        for mode, fn in runs:
+            conn.send("requests")
+            before = conn.recv()
+            result, elapsed, peak = traced(fn)
+            conn.send("requests")
+            summary = (f"{result} public sources listed" if mode == "listing" else
+                       f"{result['repos']} repos, {result['total_stars']} stars, {result['total_commits']} commits")
+            print(f"{count:>6} {mode:<8} {conn.recv() - before:>9} {elapsed:>7.2f}s "
+                  f"{peak / 2**20:>8.1f}MB  {summary}")
+        conn.send("stop")
+        mock.join()
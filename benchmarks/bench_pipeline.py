@@ -0,0 +1,48 @@
+"""
+Pipeline benchmark - runs the gen_image task graph against the local mock API
+with one worker (every phase back to back) and with the default pool, and
+prints the per-task timings of the concurrent run.
+Usage:
+  python benchmarks/bench_pipeline.py                  # 100 repos, 20ms per response
+  python benchmarks/bench_pipeline.py 500 0.05         # custom repo count and latency
+"""
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+from bench_ascii import best_of
+from src import draw_ascii, http_cache
+from src.gen_readme import card_graph
+from src.mock_github import MockGitHub, make_dataset
+
+
+def run(g, max_workers):
+    # A fresh directory per run, so the stats state, fingerprints and outputs start cold
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(ROOT / "config.json", tmp)
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            graph = card_graph(g, max_workers=max_workers)
+            graph.run()
+        finally:
+            os.chdir(cwd)
+    return graph
+
+
+if __name__ == "__main__":
+    n_repos = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+    draw_ascii.LOGO_CACHE.directory = None
+    http_cache.install(cache=False)
+    with MockGitHub(make_dataset(n_repos=n_repos), latency=latency) as api:
+        g = http_cache.github_client("octocat", api.base_url)
+        serial_time, _ = best_of(lambda: run(g, 1))
+        concurrent_time, graph = best_of(lambda: run(g, None))
+    print(f"{n_repos} repos, {latency * 1000:.0f}ms latency: serial {serial_time:.2f}s, "
+          f"task graph {concurrent_time:.2f}s ({serial_time / concurrent_time:.2f}x)\n")
+    graph.report()
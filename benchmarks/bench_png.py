@@ -0,0 +1,73 @@
+"""
+PNG encoding benchmark - encodes the card fixture as full RGBA and as an exact
+palette image over a grid of zlib levels and strategies. Reports the byte
+size, encode time and whether the decoded pixels match the RGBA render.
+Sizes are relative to the previous encoder: RGBA, level 6, Pillow's strategy.
+Usage:
+  python benchmarks/bench_png.py                 # dark and light card at scale 1, dark at scale 2
+  python benchmarks/bench_png.py --levels 6 9    # only these zlib levels
+"""
+import argparse
+import sys
+import zlib
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from PIL import Image
+from bench_ascii import best_of
+from run_benchmarks import DEFAULT_IMAGE, STATS_FIXTURE
+from src.config import CONFIG
+from src.draw_ascii import image_to_ascii
+from src.gen_readme import (FONT_SIZE, _scaled, card_layout, load_font, palette_image, rasterize,
+                            return_preffered_color)
+
+STRATEGIES = {
+    "pillow": -1,  # Pillow picks: Z_FILTERED for RGBA, Z_DEFAULT_STRATEGY for palette images
+    "default": zlib.Z_DEFAULT_STRATEGY,
+    "filtered": zlib.Z_FILTERED,
+    "rle": zlib.Z_RLE,
+    "fixed": zlib.Z_FIXED,
+}
+CARDS = [("dark", 1), ("light", 1), ("dark", 2)]
+
+
+def encode(image, level: int, strategy: int) -> bytes:
+    buffer = BytesIO()
+    options = {"transparency": image.info["transparency"]} if image.mode == "P" else {}
+    image.save(buffer, format="PNG", compress_level=level, compress_type=strategy, **options)
+    return buffer.getvalue()
+
+
+def lossless(data: bytes, reference) -> bool:
+    return Image.open(BytesIO(data)).convert("RGBA").tobytes() == reference.tobytes()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 6, 9])
+    parser.add_argument("--strategies", nargs="+", choices=sorted(STRATEGIES), default=sorted(STRATEGIES))
+    args = parser.parse_args()
+
+    config = CONFIG.data()
+    ascii_art = image_to_ascii(Image.open(DEFAULT_IMAGE), 50)
+    color = return_preffered_color(config["preferred_color"])
+    print(f"{'card':<10} {'encoding':<8} {'level':>5} {'strategy':<9} {'bytes':>9} {'vs old':>9} {'encode':>9} lossless")
+    for background, scale in CARDS:
+        font, _ = load_font(_scaled(FONT_SIZE, scale))
+        image = rasterize(card_layout(config, STATS_FIXTURE, ascii_art, font, scale), font, color, background, scale)
+        name = f"{background}@{scale}x"
+        baseline = len(encode(image, 6, STRATEGIES["pillow"]))
+        map_time, indexed = best_of(lambda: palette_image(image))
+        print(f"{name:<10} palette_image: {map_time * 1000:.1f}ms, "
+              f"{len(indexed.getpalette()) // 3 if indexed else '>256'} colours")
+        for label, source in (("rgba", image), ("palette", indexed)):
+            if source is None:
+                continue
+            for level in args.levels:
+                for strategy in args.strategies:
+                    encode_time, data = best_of(lambda: encode(source, level, STRATEGIES[strategy]))
+                    if label == "palette":
+                        encode_time += map_time
+                    print(f"{name:<10} {label:<8} {level:>5} {strategy:<9} {len(data):>9} "
+                          f"{len(data) / baseline:>8.2f}x {encode_time * 1000:>7.1f}ms {lossless(data, image)}")
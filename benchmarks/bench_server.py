@@ -0,0 +1,100 @@
+"""
+Card server load test - starts the mock GitHub API and a CardServer, then
+hammers the card endpoints from many client threads.
+
+A cold burst for one user checks that concurrent requests share a single
+fetch. The mixed load over every user and format reports throughput and
+latency. A signed push webhook then checks that only the pushed user is
+refetched.
+Usage:
+  python benchmarks/bench_server.py                    # 20 users, 30 repos, 32 clients x 50 requests
+  python benchmarks/bench_server.py 50 100 64 100      # users, repos, clients, requests per client
+"""
+import hashlib
+import hmac
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import requests
+from src import draw_ascii, http_cache
+from src.mock_github import MockGitHub, make_dataset
+from src.server import CardServer
+
+PATHS = ["fetch.png", "fetch.txt", "fetch.ansi", "stats.json"]
+SECRET = "bench"
+
+
+def fetch_count(api, login: str) -> int:
+    # Every fetch downloads the avatar exactly once
+    return sum(1 for method, path in api.requests if path.split("?")[0] == f"/avatars/{login}.png")
+
+
+def get(session, url: str) -> float:
+    start = time.perf_counter()
+    response = session.get(url)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def percentile(values: list, q: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(len(values) * q))]
+
+
+if __name__ == "__main__":
+    n_users, n_repos, clients, per_client = ([int(arg) for arg in sys.argv[1:5]] + [20, 30, 32, 50][len(sys.argv) - 1:])[:4]
+    logins = [f"user{i}" for i in range(n_users)]
+    draw_ascii.LOGO_CACHE.directory = None
+    http_cache.install(cache=False, pool_size=clients)
+
+    with MockGitHub(make_dataset(logins=logins, n_repos=n_repos), latency=0.005, rate_limit=10**9) as api, \
+            tempfile.TemporaryDirectory() as state_dir, \
+            CardServer(logins[0], api_url=api.base_url, port=0, state_dir=state_dir, webhook_secret=SECRET,
+                       logins=logins) as server, \
+            ThreadPoolExecutor(max_workers=clients) as pool:
+        session = requests.Session()
+        session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=clients))
+
+        # Cold burst: every client asks for the same uncached card at once
+        start = time.perf_counter()
+        list(pool.map(lambda _: get(session, f"{server.base_url}/{logins[0]}/fetch.png"), range(clients)))
+        print(f"cold burst: {clients} concurrent requests in {time.perf_counter() - start:.2f}s, "
+              f"{fetch_count(api, logins[0])} fetch(es) of {logins[0]}")
+
+        # Mixed load over every user and format
+        rng = random.Random(0)
+        urls = [f"{server.base_url}/{rng.choice(logins)}/{rng.choice(PATHS)}" for _ in range(clients * per_client)]
+        start = time.perf_counter()
+        latencies = list(pool.map(lambda url: get(session, url), urls))
+        elapsed = time.perf_counter() - start
+        print(f"mixed load: {len(urls)} requests in {elapsed:.2f}s ({len(urls) / elapsed:.0f} req/s), "
+              f"p50 {statistics.median(latencies) * 1000:.1f}ms, p95 {percentile(latencies, 0.95) * 1000:.1f}ms, "
+              f"p99 {percentile(latencies, 0.99) * 1000:.1f}ms")
+        health = session.get(f"{server.base_url}/healthz").json()
+        print(f"cache: {json.dumps(health)}")
+
+        # Warm load: everything is cached now
+        start = time.perf_counter()
+        latencies = list(pool.map(lambda url: get(session, url), urls))
+        elapsed = time.perf_counter() - start
+        print(f"warm load:  {len(urls)} requests in {elapsed:.2f}s ({len(urls) / elapsed:.0f} req/s), "
+              f"p50 {statistics.median(latencies) * 1000:.1f}ms, p95 {percentile(latencies, 0.95) * 1000:.1f}ms")
+
+        # Push webhook for one user: only that user is fetched again
+        payload = json.dumps({"repository": {"owner": {"login": logins[1]}}}).encode()
+        signature = "sha256=" + hmac.new(SECRET.encode(), payload, hashlib.sha256).hexdigest()
+        unsigned = session.post(f"{server.base_url}/webhook", data=payload)
+        response = session.post(f"{server.base_url}/webhook", data=payload,
+                                headers={"X-GitHub-Event": "push", "X-Hub-Signature-256": signature})
+        before = {login: fetch_count(api, login) for login in logins[:3]}
+        for login in logins[:3]:
+            get(session, f"{server.base_url}/{login}/fetch.png")
+        after = {login: fetch_count(api, login) - before[login] for login in logins[:3]}
+        print(f"webhook: unsigned -> {unsigned.status_code}, signed -> {response.status_code} {response.json()}, "
+              f"refetched {after}")
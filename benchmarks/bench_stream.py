@@ -0,0 +1,83 @@
+"""
+Streaming and directory ASCII benchmark. It writes wide renders to /dev/null,
+once by building the whole string with image_to_ascii and once with
+iter_ascii_rows, and reports the Python heap peak and time of each (PIL's pixel
+buffers are not on the Python heap). It then converts a generated directory
+with convert_directory at increasing worker counts and reports throughput
+against a serial in-process loop.
+Usage:
+  python benchmarks/bench_stream.py                   # 200 images, widths 1000 2000 4000
+  python benchmarks/bench_stream.py 500 100 1000      # images, then widths
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from PIL import Image
+from bench_ascii import DEFAULT_IMAGE
+from src.ascii_batch import _convert, convert_directory, iter_images, output_path
+from src.draw_ascii import image_to_ascii, iter_ascii_rows
+
+
+def heap_peak(fn) -> tuple:
+    """(Python heap peak in bytes, seconds) for one call of fn."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def make_images(directory: str, count: int):
+    source = Image.open(DEFAULT_IMAGE).convert("RGB")
+    for i in range(count):
+        # A spread of sizes and formats, like a folder of avatars
+        size = 120 + (i % 5) * 80
+        path = os.path.join(directory, f"{i // 50:02d}", f"{i:04d}.{('png', 'jpg')[i % 2]}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        source.resize((size, size)).save(path)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    widths = [int(arg) for arg in sys.argv[2:]] or [1000, 2000, 4000]
+    image = Image.open(DEFAULT_IMAGE)
+    image.load()
+
+    print(f"{'width':>6} {'string peak':>12} {'stream peak':>12} {'string':>9} {'stream':>9}")
+    with open(os.devnull, "w") as devnull:
+        for width in widths:
+            whole, whole_time = heap_peak(lambda: devnull.write(image_to_ascii(image, width)))
+            streamed, stream_time = heap_peak(lambda: devnull.writelines(iter_ascii_rows(image, width)))
+            print(f"{width:>6} {whole / 2**20:>10.1f}MB {streamed / 2**20:>10.1f}MB "
+                  f"{whole_time * 1000:>7.0f}ms {stream_time * 1000:>7.0f}ms")
+
+    src_dir = tempfile.mkdtemp()
+    out_dir = tempfile.mkdtemp()
+    try:
+        make_images(src_dir, count)
+        start = time.perf_counter()
+        for source in iter_images(src_dir):
+            _convert(source, output_path(source, src_dir, out_dir), 50, None, None)
+        serial = time.perf_counter() - start
+        print(f"\n{count} images at width 50 ({os.cpu_count()} CPUs)")
+        print(f"serial   {serial:.2f}s  {count / serial:>6.0f} images/s")
+        workers = 1
+        while workers <= max(2, os.cpu_count() or 1):
+            start = time.perf_counter()
+            results = list(convert_directory(src_dir, out_dir, 50, workers=workers))
+            elapsed = time.perf_counter() - start
+            failed = sum(1 for result in results if result.error)
+            print(f"{workers:>2} workers {elapsed:.2f}s  {count / elapsed:>6.0f} images/s"
+                  f"{f'  {failed} failed' if failed else ''}")
+            workers *= 2
+    finally:
+        shutil.rmtree(src_dir)
+        shutil.rmtree(out_dir)
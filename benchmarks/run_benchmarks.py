@@ -0,0 +1,214 @@
+"""
+Benchmark suite - times each pipeline stage and compares against a stored baseline.
+
+Stages:
+  ascii[W]        image_to_ascii on demo/default.png at width W
+  ascii-ordered[W] the same with autocontrast and ordered dithering
+  ascii-fs[W]     the same with autocontrast and Floyd-Steinberg dithering
+  layout          calculate_content_height for a fixed stats fixture
+  render          render_image + encode_png for the same fixture (what gen_image does after fetching)
+  render-svg      render_svg for the same fixture
+  fetch-rest[N]   fetch_stats against the local mock API with N repos, cold state
+  fetch-graphql[N] same through the GraphQL backend
+
+Results are written as JSON. With a baseline, the run fails (exit 1) when a
+stage's best time exceeds baseline * threshold + slack. Baselines are machine
+specific; regenerate with --update-baseline on the machine that runs the check.
+Usage:
+  python benchmarks/run_benchmarks.py                          # full suite, compare with baseline.json
+  python benchmarks/run_benchmarks.py --repos 10 100 --output results.json
+  python benchmarks/run_benchmarks.py --stages ascii layout    # only stages with these prefixes
+  python benchmarks/run_benchmarks.py --update-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)  # config.json is read relative to the working directory
+
+DEFAULT_IMAGE = ROOT / "demo" / "default.png"
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_WIDTHS = [50, 100, 300, 500]
+DEFAULT_REPOS = [10, 100, 1000]
+DEFAULT_THRESHOLD = 1.5
+DEFAULT_SLACK_MS = 2.0
+
+# Representative card contents, so layout and render don't depend on the network
+STATS_FIXTURE = {
+    "username": "octocat",
+    "bio": "Building things that fetch other things, mostly in Python and TypeScript",
+    "location": "San Francisco",
+    "company": "@github",
+    "email": None,
+    "hireable": True,
+    "followers": 1234,
+    "following": 56,
+    "public_repos": 42,
+    "public_gists": 8,
+    "total_stars": 9001,
+    "bytes_of_code": 12345678,
+    "created_at": "25-01-2011",
+    "updated_at": "01-06-2024",
+    "languages": "\n- Python: 5123456 bytes of code\n- TypeScript: 3456789 bytes of code\n"
+                 "- Go: 1234567 bytes of code\n- Shell: 234567 bytes of code\n- C: 123456 bytes of code",
+    "total_commits": 4321,
+    "total_issues": 123,
+    "total_prs": 45,
+}
+
+
+def measure(fn, repeat: int) -> tuple:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"best": min(times), "median": statistics.median(times), "runs": repeat}
+
+
+def bench_ascii(widths: list, repeat: int) -> dict:
+    from PIL import Image
+    from src.draw_ascii import image_to_ascii
+
+    image = Image.open(DEFAULT_IMAGE)
+    image.load()
+    results = {}
+    for name, dither in (("ascii", None), ("ascii-ordered", "ordered"), ("ascii-fs", "floyd-steinberg")):
+        contrast = "autocontrast" if dither else None
+        for width in widths:
+            results[f"{name}[{width}]"] = measure(lambda: image_to_ascii(image, width, contrast, dither), repeat)
+    return results
+
+
+def bench_card(repeat: int) -> dict:
+    from PIL import Image
+    from src.config import CONFIG
+    from src.draw_ascii import image_to_ascii
+    from src.gen_readme import FONT_SIZE, calculate_content_height, encode_png, load_font, render_image
+    from src.svg_card import render_svg
+
+    config = CONFIG.data()
+    ascii_art = image_to_ascii(Image.open(DEFAULT_IMAGE), 50)
+    font, _ = load_font(FONT_SIZE)
+    if font is None:
+        print("No suitable fonts found, skipping layout and render")
+        return {}
+    lines = ascii_art.split("\n")
+
+    def layout():
+        # A fresh font each time, so no measurement cache survives between runs
+        calculate_content_height(config, STATS_FIXTURE, load_font(FONT_SIZE)[0], lines,
+                                 FONT_SIZE + 4, 5, 10, 450, 60, 1200)
+
+    return {
+        "layout": measure(layout, repeat),
+        "render": measure(lambda: encode_png(render_image(config, STATS_FIXTURE, ascii_art, font)), repeat),
+        "render-svg": measure(lambda: render_svg(config, STATS_FIXTURE, ascii_art), repeat),
+    }
+
+
+def bench_fetch(repo_counts: list, backends: list, repeat: int) -> dict:
+    from src import http_cache
+    from src.fetch_info import fetch_stats
+    from src.mock_github import MockGitHub, make_dataset
+
+    results = {}
+    for n_repos in repo_counts:
+        with MockGitHub(make_dataset(n_repos=n_repos)) as api, tempfile.TemporaryDirectory() as tmp:
+            g = http_cache.github_client("octocat", api.base_url)
+            for backend in backends:
+                run = iter(range(repeat))
+
+                def fetch():
+                    # A state file per run, so every run is a cold fetch
+                    fetch_stats(g, backend=backend, state_path=os.path.join(tmp, f"{backend}-{next(run)}.json"))
+
+                results[f"fetch-{backend}[{n_repos}]"] = measure(fetch, repeat)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, slack_ms: float) -> list:
+    """Stages whose best time regressed past the baseline, as (stage, best, limit)."""
+    regressions = []
+    for stage, result in results.items():
+        if stage not in baseline:
+            continue
+        limit = baseline[stage]["best"] * threshold + slack_ms / 1000
+        if result["best"] > limit:
+            regressions.append((stage, result["best"], limit))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--widths", type=int, nargs="+", default=DEFAULT_WIDTHS)
+    parser.add_argument("--repos", type=int, nargs="+", default=DEFAULT_REPOS)
+    parser.add_argument("--backends", nargs="+", default=["rest", "graphql"])
+    parser.add_argument("--stages", nargs="+", help="only run stages whose name starts with one of these")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per stage (fetch stages use a third, at least 1)")
+    parser.add_argument("--output", help="write results JSON here instead of stdout")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--slack-ms", type=float, default=DEFAULT_SLACK_MS,
+                        help="absolute allowance on top of the threshold, for sub-millisecond stages")
+    parser.add_argument("--update-baseline", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    def wanted(prefix):
+        return not args.stages or any(prefix.startswith(stage) or stage.startswith(prefix) for stage in args.stages)
+
+    results = {}
+    if wanted("ascii"):
+        results.update(bench_ascii(args.widths, args.repeat))
+    if wanted("layout") or wanted("render"):
+        results.update(bench_card(args.repeat))
+    if wanted("fetch"):
+        backends = [backend for backend in args.backends if wanted(f"fetch-{backend}")]
+        results.update(bench_fetch(args.repos, backends, max(1, args.repeat // 3)))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    try:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["results"]
+    except FileNotFoundError:
+        baseline = None
+    if args.update_baseline:
+        # Stages that weren't run keep their previous baseline
+        report["results"] = dict(baseline or {}, **results)
+        Path(args.baseline).write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+    if baseline is None:
+        print(f"No baseline at {args.baseline}, nothing to compare", file=sys.stderr)
+        return 0
+    regressions = compare(results, baseline, args.threshold, args.slack_ms)
+    for stage, best, limit in regressions:
+        print(f"REGRESSION {stage}: {best * 1000:.2f}ms > {limit * 1000:.2f}ms", file=sys.stderr)
+    if not regressions:
+        print(f"All {len(results)} stages within {args.threshold}x of baseline", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
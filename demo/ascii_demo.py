@@ -4,18 +4,19 @@ Usage:
   python ascii_demo.py                    # Use default image (default.png)
   python ascii_demo.py image.png          # Use specified image
   python ascii_demo.py image.png 80       # Use specified image with custom width
+  python ascii_demo.py anim.gif 80        # Every frame of an animated GIF/WebP
+  python ascii_demo.py photos/ 80 out/    # Convert a whole directory to .txt files (default out/ascii)
 """
 import sys
 import os
 from pathlib import Path
-from PIL import Image
 
 try:
-    from src import get_ascii_char, image_to_ascii, DEFAULT_WIDTH
+    from src import get_ascii_char, iter_ascii_rows, iter_frames, DEFAULT_WIDTH
 except ImportError:
     # Fallback if src is not in path
     sys.path.insert(0, str(Path(__file__).parent.parent))
-    from src import get_ascii_char, image_to_ascii, DEFAULT_WIDTH
+    from src import get_ascii_char, iter_ascii_rows, iter_frames, DEFAULT_WIDTH
 
 
 def show_ascii_scale():
@@ -49,10 +50,12 @@ def convert_image_to_ascii(image_path, width=DEFAULT_WIDTH):
         print(f"\nConverting image: {image_path}")
         print(f"Width: {width} characters\n")
         
-        img = Image.open(image_path)
-        ascii_art = image_to_ascii(img, width=width)
-        
-        print(ascii_art)
+        # Decodes only as many pixels as the ASCII grid needs, so large photos stay cheap;
+        # rows are printed as they are converted, one frame at a time for animations
+        for index, frame in enumerate(iter_frames(image_path, width)):
+            if index:
+                print(f"\n--- frame {index + 1} ---\n")
+            sys.stdout.writelines(iter_ascii_rows(frame, width=width))
         print("\n" + "="*60)
         print("Done! ASCII art generated from image")
         print("="*60 + "\n")
@@ -89,6 +92,11 @@ if __name__ == "__main__":
             print("Usage: python ascii_demo.py <image_path> [width]")
             print(f"Example: python ascii_demo.py photo.png {DEFAULT_WIDTH}\n")
     
-    # Convert image if we have one
-    if image_path:
+    # Convert image (or every image in a directory) if we have one
+    if image_path and os.path.isdir(image_path):
+        from src.ascii_batch import run_directory
+
+        out_dir = sys.argv[3] if len(sys.argv) > 3 else os.path.join("out", "ascii")
+        run_directory(image_path, out_dir, width)
+    elif image_path:
         convert_image_to_ascii(image_path, width)
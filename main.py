@@ -1,21 +1,208 @@
+import argparse
 import os
 import sys
 import traceback
-from dotenv import load_dotenv
-from github import Github
-from src.gen_readme import generate_fetch, generate_readme, gen_image
 
-def main():
-    try:
-        load_dotenv()
-        token = os.getenv("GH_TOKEN")
-        if not token:
-            raise ValueError("GH_TOKEN environment variable not set")
-            
-        g = Github(token)
-        generate_readme(g)
-        print("✨ README updated successfully! Wahooo!")
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the GitHub fetch card and README.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="bypass the on-disk HTTP and ASCII caches; repos unchanged since the last run are still "
+                             "read from the incremental state (set \"incremental\": false in config.json to refetch them)")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="render out/<login>/fetch.png for every account listed in FILE (login or login:TOKEN_ENV per line)")
+    parser.add_argument("--format", choices=("png", "svg", "ansi", "text"), default="png",
+                        help="png/svg render out/fetch.<format> and update README.md; ansi/text print the card to stdout")
+    parser.add_argument("--stage", choices=("all", "fetch", "render"), default="all",
+                        help="fetch writes a snapshot of the GitHub data, render builds the outputs from it "
+                             "without network access, all does both in one go (default)")
+    parser.add_argument("--snapshot", default="out/snapshot.json", metavar="FILE",
+                        help="snapshot written by --stage fetch and read by --stage render")
+    parser.add_argument("--record", metavar="DIR",
+                        help="save every GitHub response to DIR for later --replay")
+    parser.add_argument("--replay", metavar="DIR",
+                        help="answer every GitHub request from a recording in DIR, offline")
+    parser.add_argument("--profile", nargs="?", const="out/profile.json", metavar="TRACE",
+                        help="time every phase, count API calls per endpoint and write a JSON trace "
+                             "(default out/profile.json)")
+    parser.add_argument("--cprofile", metavar="FILE",
+                        help="also dump cProfile stats for the main thread to FILE (implies --profile)")
+    parser.add_argument("--tracemalloc", metavar="FILE",
+                        help="also trace allocations and dump a tracemalloc snapshot to FILE (implies --profile)")
+    parser.add_argument("--serve", metavar="[HOST:]PORT",
+                        help="serve /<login>/fetch.png (and .txt, .ansi, stats.json) over HTTP instead of writing out/")
+    parser.add_argument("--cache-ttl", type=float, default=600, metavar="SECONDS",
+                        help="with --serve, how long a fetched user stays cached (default 600)")
+    parser.add_argument("--cache-mb", type=float, default=64, metavar="MB",
+                        help="with --serve, memory bound of the card cache (default 64)")
+    parser.add_argument("--logins", nargs="+", metavar="LOGIN",
+                        help="with --serve, the only logins to serve (default any, up to --max-logins)")
+    parser.add_argument("--max-logins", type=int, default=100, metavar="N",
+                        help="with --serve and no --logins, how many distinct logins may be fetched (default 100)")
+    parser.add_argument("--org", metavar="ORG",
+                        help="aggregate stats over every public repo of an organization into out/<ORG>/org_stats.json")
+    parser.add_argument("--members", action="store_true",
+                        help="with --org, add a per-member breakdown from each repo's contributors")
+    parser.add_argument("--include-forks", action="store_true",
+                        help="with --org, count forked repos too")
+    parser.add_argument("--api-url", default="https://api.github.com",
+                        help="GitHub API base URL, e.g. a local mock server")
+    args = parser.parse_args(argv)
+    if (args.cprofile or args.tracemalloc) and not args.profile:
+        args.profile = "out/profile.json"
+    return args
+
+def print_card(user_stats: dict, ascii_art: str, color: bool):
+    """Stream the text card to stdout; no canvas, font or PNG encoder involved."""
+    from src.config import CONFIG
+    from src.gen_readme import fetch_lines
+
+    for line in fetch_lines(CONFIG, user_stats, ascii_art, color=color):
+        sys.stdout.write(line + "\n")
+
+def render_stage(args):
+    """Build the outputs from a saved snapshot, without any GitHub access."""
+    from src.config import CONFIG
+    from src.snapshot import load_snapshot, render_snapshot, snapshot_stats
+
+    snapshot = load_snapshot(args.snapshot)
+    if args.format not in ("png", "svg"):
+        print_card(snapshot_stats(snapshot), snapshot["ascii"], color=args.format == "ansi")
+        return 0
+    from src.gen_readme import update_readme
+
+    output_path = f"out/fetch.{args.format}"
+    render_snapshot(snapshot, CONFIG, output_path)
+    update_readme(output_path)
+    print(f"✨ README updated from the snapshot fetched at {snapshot['fetched_at']}!")
+    return 0
+
+def run(args):
+    from src import draw_ascii
+
+    if args.no_cache:
+        draw_ascii.LOGO_CACHE.directory = None
+    profiler = None
+    if args.profile:
+        from src import profiling
+
+        profiler = args.profiler = profiling.Profiler()
+        profiling.instrument(profiler)
+    if args.stage == "render":
+        return render_stage(args)
+
+    from dotenv import load_dotenv
+    from src import http_cache
+
+    # Every client shares one pooled session; --no-cache only drops the disk caches
+    session_cache = http_cache.install(cache=not args.no_cache, record=args.record, replay=args.replay)
+    if profiler is not None:
+        profiler.watch_session(http_cache.get_session())
+    load_dotenv()
+    if args.batch:
+        from src.batch import parse_batch_file, run_batch
+
+        results = run_batch(parse_batch_file(args.batch), api_url=args.api_url)
+        return 1 if any("error" in result for result in results.values()) else 0
+
+    # Replayed requests aren't keyed on the token, so any placeholder will do
+    token = os.getenv("GH_TOKEN") or ("replay" if args.replay else None)
+    if not token:
+        raise ValueError("GH_TOKEN environment variable not set")
+    if args.serve:
+        return serve(args, token)
+    if args.org:
+        return org(args, token)
+        
+    # Requests are paced by src.scheduler from the rate-limit headers instead of PyGithub's fixed delays,
+    # and throttled responses reach the scheduler instead of being slept through inside urllib3
+    g = http_cache.github_client(token, args.api_url)
+    if args.stage == "fetch":
+        from src.snapshot import save_snapshot, take_snapshot
+
+        save_snapshot(take_snapshot(g), args.snapshot)
+        print(f"📦 Snapshot written to {args.snapshot}")
+        return 0
+    if args.format not in ("png", "svg"):
+        from src.snapshot import snapshot_stats, take_snapshot
+
+        snapshot = take_snapshot(g)
+        print_card(snapshot_stats(snapshot), snapshot["ascii"], color=args.format == "ansi")
         return 0
+    from src.gen_readme import generate_readme  # After instrument(), so --profile sees the wrapped function
+
+    generate_readme(g, report=bool(args.profile), output_path=f"out/fetch.{args.format}")
+    print("✨ README updated successfully! Wahooo!")
+    if args.profile and session_cache is not None:
+        print(f"HTTP cache: {session_cache.stats}")
+    return 0
+
+def serve(args, token: str):
+    from src.server import CardServer
+
+    host, _, port = args.serve.rpartition(":")
+    server = CardServer(token, api_url=args.api_url, host=host or "127.0.0.1", port=int(port),
+                        ttl=args.cache_ttl, max_bytes=int(args.cache_mb * 1024 * 1024),
+                        webhook_secret=os.getenv("WEBHOOK_SECRET"), logins=args.logins,
+                        max_logins=args.max_logins, verbose=True)
+    print(f"🌐 Serving cards on {server.base_url}/<login>/fetch.png")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+def org(args, token: str):
+    from src.http_cache import github_client
+    from src.org_stats import PAGE_SIZE, fetch_org_stats, print_org_stats, save_org_stats
+
+    # The org listing is paged by hand, so ask for GitHub's largest pages
+    g = github_client(token, args.api_url, per_page=PAGE_SIZE)
+    stats = fetch_org_stats(g, args.org, members=args.members, include_forks=args.include_forks)
+    path = os.path.join("out", args.org, "org_stats.json")
+    save_org_stats(stats, path)
+    print_org_stats(stats)
+    print(f"📊 Organization stats written to {path}")
+    return 0
+
+def run_profiled(args):
+    """run() with the optional cProfile and tracemalloc collectors around it, then the report."""
+    profile = None
+    if args.cprofile:
+        import cProfile
+
+        profile = cProfile.Profile()
+    if args.tracemalloc:
+        import tracemalloc
+
+        tracemalloc.start(25)
+    try:
+        if profile is not None:
+            return profile.runcall(run, args)
+        return run(args)
+    finally:
+        if profile is not None:
+            profile.dump_stats(args.cprofile)
+            print(f"cProfile stats written to {args.cprofile}")
+        if args.tracemalloc:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            snapshot.dump(args.tracemalloc)
+            print(f"tracemalloc snapshot written to {args.tracemalloc} (peak {peak / 1024 / 1024:.1f} MiB); top allocations:")
+            for stat in snapshot.statistics("lineno")[:10]:
+                print(f"  {stat}")
+        profiler = getattr(args, "profiler", None)
+        if profiler is not None:
+            profiler.report()
+            profiler.write_trace(args.profile)
+            print(f"Trace written to {args.profile}")
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        return run_profiled(args) if args.profile else run(args)
         
     except Exception as e:
 
@@ -24,4 +211,4 @@ def main():
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
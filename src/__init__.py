@@ -3,10 +3,15 @@
 Exposes common ASCII helpers for convenient imports in tests and scripts.
 """
 
-from .draw_ascii import DEFAULT_WIDTH, get_ascii_char, image_to_ascii  # noqa: F401
+from .draw_ascii import (DEFAULT_WIDTH, get_ascii_char, image_to_ascii, iter_ascii_frames,  # noqa: F401
+                         iter_ascii_rows, iter_frames, open_for_ascii)
 
 __all__ = [
     "DEFAULT_WIDTH",
     "get_ascii_char",
     "image_to_ascii",
+    "iter_ascii_frames",
+    "iter_ascii_rows",
+    "iter_frames",
+    "open_for_ascii",
 ]
@@ -0,0 +1,111 @@
+"""Convert a whole directory of images to ASCII art on a process pool.
+
+Every image under the source directory becomes a ``.txt`` file at the same
+relative path under the output directory (``a/b.gif`` -> ``a/b.gif.txt``).
+Animated GIF/WebP files get every frame, with a blank line between frames.
+Workers stream rows straight into the file with ``iter_ascii_rows``, so a
+worker's memory depends on the image size, not on how many images it has
+converted. The parent walks the tree lazily and keeps at most ``max_pending``
+conversions in flight.
+"""
+import os
+import time
+from collections import namedtuple
+
+from src.draw_ascii import DEFAULT_WIDTH
+
+IMAGE_EXTENSIONS = (".bmp", ".gif", ".jpeg", ".jpg", ".png", ".webp")
+
+ConvertResult = namedtuple("ConvertResult", "source output frames rows seconds error")
+
+
+def iter_images(src_dir: str):
+    """Image paths under src_dir in sorted order, found while walking (the tree is never listed whole)."""
+    for root, dirs, files in os.walk(src_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield os.path.join(root, name)
+
+
+def output_path(source: str, src_dir: str, out_dir: str) -> str:
+    # Keeps the extension, so photo.png and photo.jpg don't share an output
+    return os.path.join(out_dir, os.path.relpath(source, src_dir) + ".txt")
+
+
+def _convert(source: str, output: str, width: int, contrast: str, dither: str) -> tuple:
+    """Process-pool worker: (frames, rows, seconds)."""
+    from src.draw_ascii import grid_size, iter_ascii_rows, iter_frames
+
+    start = time.perf_counter()
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    frames = rows = 0
+    # Written beside the output and renamed, so a failed image leaves no partial file
+    partial = output + ".partial"
+    try:
+        with open(partial, "w", encoding="utf-8") as f:
+            for frame in iter_frames(source, width):
+                if frames:
+                    f.write("\n")
+                f.writelines(iter_ascii_rows(frame, width, contrast, dither))
+                frames += 1
+                rows += grid_size(frame.size, width)[1]
+        os.replace(partial, output)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return frames, rows, time.perf_counter() - start
+
+
+def convert_directory(src_dir: str, out_dir: str, width: int = DEFAULT_WIDTH, workers: int = None,
+                      max_pending: int = None, contrast: str = None, dither: str = None):
+    """Convert every image under src_dir, yielding a ConvertResult for each as it finishes.
+
+    max_pending (default twice the worker count) bounds the submitted but
+    unfinished conversions. The walk pauses until one completes, so a huge
+    tree never turns into a huge queue.
+    """
+    import multiprocessing
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+
+    def result(future, source, output):
+        try:
+            frames, rows, seconds = future.result()
+        except Exception as e:
+            return ConvertResult(source, output, 0, 0, 0.0, str(e))
+        return ConvertResult(source, output, frames, rows, seconds, None)
+
+    # spawn, as in src.batch: workers start clean instead of inheriting the caller's state
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending = {}
+        for source in iter_images(src_dir):
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield result(future, *pending.pop(future))
+            output = output_path(source, src_dir, out_dir)
+            pending[pool.submit(_convert, source, output, width, contrast, dither)] = (source, output)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield result(future, *pending.pop(future))
+
+
+def run_directory(src_dir: str, out_dir: str, width: int = DEFAULT_WIDTH, workers: int = None, **options) -> tuple:
+    """convert_directory with a line per image and a summary; returns (converted, failed)."""
+    converted = failed = 0
+    start = time.perf_counter()
+    for result in convert_directory(src_dir, out_dir, width, workers, **options):
+        if result.error:
+            failed += 1
+            print(f"❌ {result.source}: {result.error}")
+        else:
+            converted += 1
+            frames = f", {result.frames} frames" if result.frames > 1 else ""
+            print(f"✅ {result.source} -> {result.output}: {result.rows} rows{frames} in {result.seconds:.2f}s")
+    print(f"⏱️ {converted} converted, {failed} failed in {time.perf_counter() - start:.2f}s")
+    return converted, failed
@@ -0,0 +1,72 @@
+"""Content-addressed cache for rendered ASCII art.
+
+Entries are keyed on the SHA-256 of the source image bytes plus the target
+width and palette, so an unchanged avatar is never decoded or converted again.
+Lookups go to an in-process LRU first, then to text files on disk.
+"""
+import hashlib
+import os
+from collections import OrderedDict
+from threading import Lock, get_ident
+
+DEFAULT_CACHE_DIR = ".cache/ascii"
+
+
+class AsciiCache:
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_entries: int = 32):
+        self.directory = directory  # None keeps the cache in memory only
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+        self._memory = OrderedDict()
+        self._lock = Lock()
+
+    @staticmethod
+    def key(data: bytes, width: int, palette: str) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        variant = hashlib.sha256(f"{width}:{palette}".encode()).hexdigest()[:16]
+        return f"{digest}-{variant}"
+
+    def get_or_render(self, data: bytes, width: int, palette: str, render) -> str:
+        """Return the cached ASCII for these image bytes, calling render() only on a miss."""
+        key = self.key(data, width, palette)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._memory[key]
+
+        text = self._read(key)
+        with self._lock:
+            self.stats["disk_hits" if text is not None else "misses"] += 1
+        if text is None:
+            text = render()
+            self._write(key, text)
+
+        with self._lock:
+            self._memory[key] = text
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+        return text
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.txt")
+
+    def _read(self, key: str):
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="ascii") as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _write(self, key: str, text: str):
+        if self.directory is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        # Per-thread temp file: batch fetchers can render the same avatar at once
+        tmp_path = f"{self._path(key)}.{get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="ascii", newline="") as f:
+            f.write(text)
+        os.replace(tmp_path, self._path(key))
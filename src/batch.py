@@ -0,0 +1,123 @@
+"""Generate fetch cards for many accounts in one process.
+
+A batch file lists one account per line, either ``login`` (public profile,
+fetched with ``GH_TOKEN``) or ``login:ENV_VAR`` (the account that owns the
+token in ``ENV_VAR``). Blank lines and ``#`` comments are ignored.
+
+Fetches are I/O-bound and run on a thread pool, all sharing the pooled session
+from ``src.http_cache``. As each one finishes, its card is rasterized on a
+process pool, so the CPU-bound rendering overlaps with the remaining fetches.
+Each account gets its own ``out/<login>/`` directory with the card and the
+incremental fetch state.
+"""
+import os
+import time
+from collections import namedtuple
+
+from src.config import CONFIG
+
+DEFAULT_API_URL = "https://api.github.com"
+
+BatchEntry = namedtuple("BatchEntry", "login token_env")
+
+
+def parse_batch_file(path: str) -> list:
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            login, _, token_env = line.partition(":")
+            if not login.strip():
+                raise ValueError(f"{path}:{number}: missing login")
+            entries.append(BatchEntry(login.strip(), token_env.strip() or None))
+    return entries
+
+
+def _fetch(entry: BatchEntry, api_url: str, out_dir: str):
+    from src.draw_ascii import generate_logo
+    from src.fetch_info import fetch_stats
+    from src.http_cache import github_client
+
+    if entry.token_env:
+        token = os.getenv(entry.token_env)
+        if not token:
+            raise ValueError(f"{entry.token_env} environment variable not set")
+        login = None  # The token's own account, including what only its owner can list
+    else:
+        token = os.getenv("GH_TOKEN")
+        login = entry.login
+    g = github_client(token, api_url)
+    state_path = os.path.join(out_dir, entry.login, "stats_state.json")
+    return generate_logo(g, login=login), fetch_stats(g, login=login, state_path=state_path)
+
+
+def _render(config: dict, user_stats: dict, ascii_art: str, output_path: str) -> tuple:
+    """Process-pool worker: (changed, seconds)."""
+    from src.gen_readme import write_card
+
+    start = time.perf_counter()
+    changed = write_card(config, user_stats, ascii_art, output_path)
+    return changed, time.perf_counter() - start
+
+
+def run_batch(entries: list, api_url: str = DEFAULT_API_URL, out_dir: str = "out",
+              fetch_workers: int = 8, render_workers: int = None) -> dict:
+    """Fetch and render every entry; returns {login: {"fetch", "render", "total", "changed"|"error"}}."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+    config = CONFIG.data()
+    results = {}
+    start = time.perf_counter()
+
+    def fetch(entry):
+        began = time.perf_counter()
+        ascii_art, user_stats = _fetch(entry, api_url, out_dir)
+        return ascii_art, user_stats, began, time.perf_counter() - began
+
+    # spawn keeps forked copies of the fetch threads' locks and sockets out of the workers
+    context = multiprocessing.get_context("spawn")
+    with ThreadPoolExecutor(max_workers=fetch_workers) as fetchers, \
+            ProcessPoolExecutor(max_workers=render_workers, mp_context=context) as renderers:
+        fetches = {fetchers.submit(fetch, entry): entry for entry in entries}
+        renders = {}
+        for future in as_completed(fetches):
+            entry = fetches[future]
+            try:
+                ascii_art, user_stats, began, fetch_time = future.result()
+            except Exception as e:
+                results[entry.login] = {"error": f"fetch failed: {e}"}
+                continue
+            output_path = os.path.join(out_dir, entry.login, "fetch.png")
+            renders[renderers.submit(_render, config, user_stats, ascii_art, output_path)] = (entry, began, fetch_time)
+
+        for future in as_completed(renders):
+            entry, began, fetch_time = renders[future]
+            try:
+                changed, render_time = future.result()
+            except Exception as e:
+                results[entry.login] = {"fetch": fetch_time, "error": f"render failed: {e}"}
+                continue
+            results[entry.login] = {
+                "fetch": fetch_time,
+                "render": render_time,
+                "total": time.perf_counter() - began,
+                "changed": changed,
+            }
+
+    report(results, time.perf_counter() - start)
+    return results
+
+
+def report(results: dict, elapsed: float):
+    for login in sorted(results):
+        result = results[login]
+        if "error" in result:
+            print(f"❌ {login}: {result['error']}")
+        else:
+            status = "updated" if result["changed"] else "unchanged"
+            print(f"✅ {login}: fetch {result['fetch']:.2f}s, render {result['render']:.2f}s, "
+                  f"total {result['total']:.2f}s ({status})")
+    print(f"⏱️ {len(results)} accounts in {elapsed:.2f}s")
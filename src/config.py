@@ -0,0 +1,155 @@
+"""Shared, validated view of config.json.
+
+``CONFIG`` is parsed on first use and re-parsed only when the file's mtime
+changes, so every module can call ``CONFIG.get(...)`` freely. Unknown keys
+and known misspellings produce a warning; wrong types raise ConfigError.
+Values outside a key's ``CHOICES`` warn and fall back to the default.
+"""
+import json
+import os
+import re
+import threading
+
+
+class ConfigError(ValueError):
+    pass
+
+
+# key -> (accepted types, default); defaults of None mean the key is required
+SCHEMA = {
+    "display_stats": (list, None),
+    "additional_info": (str, None),
+    "preferred_color": (str, None),
+    "max_languages": (int, -1),
+    "append_automatic": (bool, True),
+    "exclude_organizations": (bool, True),
+    "backend": (str, "rest"),
+    "max_workers": (int, 8),
+    "incremental": (bool, True),
+    "state_file": (str, "out/stats_state.json"),
+    "ascii_contrast": (str, "none"),
+    "ascii_dither": (str, "none"),
+    "variants": (list, []),
+    # Antialiasing steps per text colour (src.gen_readme.COVERAGE_LEVELS); null keeps all 256, pixel-exact
+    "coverage_levels": ((int, type(None)), 64),
+}
+
+# Allowed values of string keys; the modes of src.draw_ascii.image_to_ascii, with "none" for off
+CHOICES = {
+    "ascii_contrast": ("none", "autocontrast", "equalize"),
+    "ascii_dither": ("none", "ordered", "floyd-steinberg"),
+}
+
+# Keys of a "variants" entry; preferred_color defaults to the top-level one
+VARIANT_SCHEMA = {
+    "name": (str, None),
+    "background": (str, "dark"),
+    "preferred_color": (str, ""),
+    "scale": ((int, float), 1),
+}
+BACKGROUNDS = ("dark", "light")
+
+# Misspellings seen in the wild -> the key they were meant to be
+ALIASES = {
+    "exclude_orgainzations": "exclude_organizations",
+}
+
+
+def validate(raw: dict, path: str = "config.json") -> dict:
+    """Return raw with aliases resolved and defaults filled in."""
+    if not isinstance(raw, dict):
+        raise ConfigError(f"{path}: expected a JSON object at the top level")
+    data = {}
+    for key, value in raw.items():
+        if key in ALIASES:
+            print(f"⚠️ {path}: '{key}' is misspelled, treating it as '{ALIASES[key]}'")
+            key = ALIASES[key]
+            if key in raw:
+                continue
+        elif key not in SCHEMA:
+            print(f"⚠️ {path}: unknown key '{key}' is ignored")
+        data[key] = value
+
+    for key, (types, default) in SCHEMA.items():
+        if key not in data:
+            if default is None:
+                raise ConfigError(f"{path}: missing required key '{key}'")
+            data[key] = default
+            continue
+        value = data[key]
+        # bool is an int subclass, so check it explicitly for int fields
+        if not isinstance(value, types) or (types is not bool and isinstance(value, bool)):
+            expected = " or ".join(t.__name__ for t in types) if isinstance(types, tuple) else types.__name__
+            raise ConfigError(f"{path}: '{key}' should be {expected}, got {type(value).__name__}")
+        if key in CHOICES and value not in CHOICES[key]:
+            print(f"⚠️ {path}: '{key}' should be one of {CHOICES[key]}, got '{value}'; using '{default}'")
+            data[key] = default
+
+    if data["coverage_levels"] is not None and not 2 <= data["coverage_levels"] <= 256:
+        raise ConfigError(f"{path}: 'coverage_levels' should be between 2 and 256, or null")
+    if not all(isinstance(stat, str) for stat in data["display_stats"]):
+        raise ConfigError(f"{path}: 'display_stats' should be a list of strings")
+    data["variants"] = [validate_variant(variant, data, f"{path}: variants[{i}]")
+                        for i, variant in enumerate(data["variants"])]
+    names = [variant["name"] for variant in data["variants"]]
+    if len(set(names)) != len(names):
+        raise ConfigError(f"{path}: variant names must be unique")
+    return data
+
+
+def validate_variant(raw, config: dict, where: str) -> dict:
+    if not isinstance(raw, dict):
+        raise ConfigError(f"{where}: expected an object")
+    variant = {}
+    for key, (types, default) in VARIANT_SCHEMA.items():
+        if key not in raw:
+            if default is None:
+                raise ConfigError(f"{where}: missing required key '{key}'")
+            variant[key] = default
+            continue
+        value = raw[key]
+        if not isinstance(value, types) or isinstance(value, bool):
+            expected = "number" if isinstance(types, tuple) else types.__name__
+            raise ConfigError(f"{where}: '{key}' should be {expected}, got {type(value).__name__}")
+        variant[key] = value
+    for key in raw.keys() - VARIANT_SCHEMA.keys():
+        print(f"⚠️ {where}: unknown key '{key}' is ignored")
+    # The name becomes part of a file name
+    if not re.fullmatch(r"[A-Za-z0-9_-]+", variant["name"]):
+        raise ConfigError(f"{where}: 'name' may only contain letters, digits, '-' and '_'")
+    if variant["background"] not in BACKGROUNDS:
+        raise ConfigError(f"{where}: 'background' should be one of {BACKGROUNDS}")
+    if not 0 < variant["scale"] <= 4:
+        raise ConfigError(f"{where}: 'scale' should be between 0 and 4")
+    variant["preferred_color"] = variant["preferred_color"] or config["preferred_color"]
+    return variant
+
+
+class Config:
+    def __init__(self, path: str = "config.json"):
+        self.path = path
+        self._data = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def data(self) -> dict:
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._data = validate(json.load(f), self.path)
+                    self._mtime = mtime
+        return self._data
+
+    def get(self, key: str, default=None):
+        return self.data().get(key, default)
+
+    def __getitem__(self, key: str):
+        return self.data()[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.data()
+
+
+CONFIG = Config()
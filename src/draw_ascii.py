@@ -1,18 +1,23 @@
-from PIL import Image
 from io import BytesIO
+from src.ascii_cache import AsciiCache
 
 # Shared default width for ASCII rendering
 DEFAULT_WIDTH: int = 50
 
+# Rendered avatars, shared by every generate_logo call in the process
+LOGO_CACHE = AsciiCache()
+
+# Soft gradient palette: dark (dense) to light (sparse/space)
+# Each character represents a different density level
+ASCII_CHARS = '.:-=+. ##@'
+
 def get_ascii_char(pixel):
     """
     Converts a pixel to an ASCII character based on brightness.
     Uses luminance formula for more accurate brightness perception.
     Soft palette: dark to light with spaces as background.
     """
-    # Soft gradient palette: dark (dense) to light (sparse/space)
-    # Each character represents a different density level
-    ascii_chars = '.:-=+. ##@'
+    ascii_chars = ASCII_CHARS
     
     # Luminance formula: weights colors by human eye sensitivity
     # Green appears brighter to humans than red or blue
@@ -27,33 +32,260 @@ def get_ascii_char(pixel):
     
     return ascii_chars[char_index]
 
-def image_to_ascii(image, width: int = DEFAULT_WIDTH) -> str:
-    aspect_ratio = image.width / image.height
-    height = int((width*aspect_ratio)*0.5)
+def _build_luma_table(ascii_chars: str = ASCII_CHARS) -> bytes:
+    """
+    256-entry bytes.translate table from PIL 'L' values to palette characters.
+
+    PIL rounds luminance to an integer, so the true brightness of a pixel with
+    L = v lies within v +/- 0.51. Where a palette boundary (255 * k / steps)
+    falls inside that window the character can't be decided from L alone;
+    those entries map to NUL and are resolved exactly with get_ascii_char.
+    """
+    steps = len(ascii_chars) - 1
+    boundaries = [255 * k / steps for k in range(1, steps + 1)]
+    table = bytearray(256)
+    for value in range(256):
+        if any(abs(value - boundary) <= 0.51 for boundary in boundaries):
+            continue
+        index = min(int(value / 255 * steps), steps)
+        table[value] = ord(ascii_chars[index])
+    return bytes(table)
+
+_LUMA_TABLE = _build_luma_table()
+
+# Optional quality modes for image_to_ascii: contrast stretch before quantizing,
+# then dithering across the palette levels instead of plain rounding down
+CONTRAST_MODES = (None, "autocontrast", "equalize")
+DITHER_MODES = (None, "ordered", "floyd-steinberg")
+
+_STEPS = len(ASCII_CHARS) - 1
+# L value -> palette index, rounding down like get_ascii_char (for Image.point)
+_LEVEL_TABLE = [min(int(value / 255 * _STEPS), _STEPS) for value in range(256)]
+# Palette index -> character (for bytes.translate)
+_INDEX_TABLE = bytes(ord(ASCII_CHARS[min(index, _STEPS)]) for index in range(256))
+
+def _bayer(order: int = 3) -> list:
+    """Rows of the 2**order square Bayer threshold matrix, values 0 .. 4**order - 1."""
+    matrix = [[0]]
+    for _ in range(order):
+        matrix = [[4 * v + left for v in row] + [4 * v + right for v in row]
+                  for left, right in ((0, 2), (3, 1)) for row in matrix]
+    return matrix
+
+_BAYER = _bayer()
+_bayer_tiles = {}
+
+def _bayer_offsets(size: tuple):
+    """'L' image of Bayer thresholds scaled to one palette step, tiled to size.
+
+    Adding it before rounding down spreads each pixel between its two nearest
+    palette levels in proportion to where it falls between them.
+    """
+    if size not in _bayer_tiles:
+        from PIL import Image
+
+        width, height = size
+        n = len(_BAYER)
+        rows = [bytes(int((v + 0.5) / (n * n) * 255 / _STEPS) for v in row) for row in _BAYER]
+        rows = [(row * (width // n + 1))[:width] for row in rows]
+        _bayer_tiles[size] = Image.frombytes("L", size, b"".join(rows[y % n] for y in range(height)))
+    return _bayer_tiles[size]
+
+_gray_palette = None
+
+def _palette_image():
+    """'P' image holding the palette levels as greys, for Image.quantize."""
+    global _gray_palette
+    if _gray_palette is None:
+        from PIL import Image
+
+        _gray_palette = Image.new("P", (1, 1))
+        levels = [round(index * 255 / _STEPS) for index in range(_STEPS + 1)]
+        _gray_palette.putpalette([channel for level in levels for channel in (level, level, level)])
+    return _gray_palette
+
+def _quality_cells(image, contrast: str = None, dither: str = None) -> bytes:
+    """Palette characters for an RGB image, using whole-image PIL operations only."""
+    from PIL import Image, ImageChops, ImageOps
+
+    luma = image.convert('L')
+    if contrast == "autocontrast":
+        luma = ImageOps.autocontrast(luma, cutoff=1)
+    elif contrast == "equalize":
+        luma = ImageOps.equalize(luma)
+
+    if dither == "floyd-steinberg":
+        # Quantizing an 'L' image ignores the palette, so go through RGB
+        indices = luma.convert('RGB').quantize(palette=_palette_image(), dither=Image.Dither.FLOYDSTEINBERG)
+    else:
+        if dither == "ordered":
+            luma = ImageChops.add(luma, _bayer_offsets(luma.size))
+        indices = luma.point(_LEVEL_TABLE)
+    return indices.tobytes().translate(_INDEX_TABLE)
+
+# Cells converted at a time when streaming rows; each band's text is yielded and dropped
+BAND_CELLS = 1 << 16
+
+def _plain_cells(image) -> bytearray:
+    """Palette characters for an RGB image, identical to get_ascii_char per pixel."""
+    cells = bytearray(image.convert('L').tobytes().translate(_LUMA_TABLE))
+    undecided = cells.find(0)
+    if undecided != -1:
+        rgb = image.tobytes()
+        resolved = {}
+        while undecided != -1:
+            pixel = rgb[undecided * 3:undecided * 3 + 3]
+            if pixel not in resolved:
+                resolved[pixel] = ord(get_ascii_char(pixel))
+            cells[undecided] = resolved[pixel]
+            undecided = cells.find(0, undecided + 1)
+    return cells
+
+def iter_ascii_rows(image, width: int = DEFAULT_WIDTH, contrast: str = None, dither: str = None):
+    """
+    Yields the lines of image_to_ascii one at a time, each ending in a newline.
+
+    The resized image is converted BAND_CELLS cells at a time, so a very wide
+    render can be written to a file or stdout without ever holding the whole
+    text. The contrast and dither modes look at the whole image (histogram,
+    error diffusion), so they convert every cell up front and only the text
+    is streamed.
+    """
+    if contrast not in CONTRAST_MODES:
+        raise ValueError(f"Unknown contrast mode '{contrast}', expected one of {CONTRAST_MODES[1:]}")
+    if dither not in DITHER_MODES:
+        raise ValueError(f"Unknown dither mode '{dither}', expected one of {DITHER_MODES[1:]}")
+    return _rows(image, width, contrast, dither)
 
+def _rows(image, width: int, contrast: str, dither: str):
+    _, height = grid_size(image.size, width)
     image = image.resize((width, height))
     image = image.convert('RGB')
-    ascii_str = ""
 
-    for y in range(height): 
-        for x in range(width):
-            pixel = image.getpixel((x,y))
-            ascii_str += get_ascii_char(pixel)
-        ascii_str += "\n"
+    if contrast or dither:
+        cells = _quality_cells(image, contrast, dither)
+        for y in range(height):
+            yield cells[y * width:(y + 1) * width].decode('ascii') + "\n"
+        return
+
+    band_rows = max(1, BAND_CELLS // width)
+    for top in range(0, height, band_rows):
+        band = image if band_rows >= height else image.crop((0, top, width, min(height, top + band_rows)))
+        text = _plain_cells(band).decode('ascii')
+        for y in range(band.height):
+            yield text[y * width:(y + 1) * width] + "\n"
+
+def image_to_ascii(image, width: int = DEFAULT_WIDTH, contrast: str = None, dither: str = None) -> str:
+    """
+    Converts an image to ASCII art, one row per line.
+
+    Luminance is computed by PIL for a band of rows at a time and mapped
+    through a lookup table; output is identical to applying get_ascii_char to
+    every pixel.
+
+    contrast ("autocontrast" or "equalize") stretches the luminance first and
+    dither ("ordered" or "floyd-steinberg") spreads it across the palette, which
+    keeps low-contrast avatars from collapsing into one or two characters.
+    """
+    return "".join(iter_ascii_rows(image, width, contrast, dither))
+
+# Decoded pixels allowed per image, after draft()/reduce(); 24 MP is about 96 MB as RGBA
+MAX_DECODE_PIXELS = 24_000_000
+
+# Source pixels kept per output cell along each axis, so resize() still averages
+OVERSAMPLE = 4
+
+# GitHub serves avatars up to this size; larger s= values are clamped anyway
+MAX_AVATAR_SIZE = 460
+
+def grid_size(image_size: tuple, width: int) -> tuple:
+    """(columns, rows) image_to_ascii produces for an image of this size."""
+    image_width, image_height = image_size
+    return width, int((width * image_width / image_height) * 0.5)
+
+def _open_checked(source, width: int, max_pixels: int) -> tuple:
+    """(image, oversampled target size), with draft() applied and the decode budget checked."""
+    from PIL import Image
+
+    image = Image.open(source)
+    columns, rows = grid_size(image.size, width)
+    target = (columns * OVERSAMPLE, max(1, rows) * OVERSAMPLE)
+    image.draft(None, target)
+    if image.width * image.height > max_pixels:
+        raise ValueError(f"image is {image.width}x{image.height} pixels, over the "
+                         f"{max_pixels:,} pixel decode budget")
+    return image, target
+
+def _reduced(image, target: tuple):
+    factor = min(image.width // target[0], image.height // target[1])
+    if factor >= 2 and image.mode not in ("P", "1"):
+        return image.reduce(factor)
+    return image
+
+def open_for_ascii(source, width: int = DEFAULT_WIDTH, max_pixels: int = MAX_DECODE_PIXELS):
+    """
+    Open an image for image_to_ascii at the given width, decoding no more than needed.
+
+    JPEGs are decoded at a reduced DCT scale via draft(); other formats are
+    box-reduced by an integer factor right after decoding. Both keep at least
+    OVERSAMPLE source pixels per cell. Images that would still decode to more
+    than max_pixels are rejected before any pixel data is read.
+    """
+    image, target = _open_checked(source, width, max_pixels)
+    return _reduced(image, target)
+
+def iter_frames(source, width: int = DEFAULT_WIDTH, max_pixels: int = MAX_DECODE_PIXELS):
+    """
+    Every frame of an animated GIF/WebP, prepared like open_for_ascii; a still image yields once.
+
+    Frames are decoded one at a time as the iterator advances, so only the
+    current frame is in memory.
+    """
+    from PIL import ImageSequence
+
+    image, target = _open_checked(source, width, max_pixels)
+    with image:
+        for frame in ImageSequence.Iterator(image):
+            reduced = _reduced(frame, target)
+            # The next seek() overwrites the frame in place
+            yield reduced if reduced is not frame else frame.copy()
+
+def iter_ascii_frames(source, width: int = DEFAULT_WIDTH, contrast: str = None, dither: str = None):
+    """image_to_ascii of each frame from iter_frames, converted lazily."""
+    for frame in iter_frames(source, width):
+        yield image_to_ascii(frame, width, contrast, dither)
+
+def avatar_request_url(avatar_url: str, width: int = DEFAULT_WIDTH) -> str:
+    """avatar_url with an s= size parameter matching the ASCII grid, so GitHub sends a small image."""
+    from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+    parts = urlsplit(avatar_url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key not in ("s", "size")]
+    query.append(("s", str(min(width * OVERSAMPLE, MAX_AVATAR_SIZE))))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+def ascii_from_bytes(data: bytes, width: int = DEFAULT_WIDTH, cache: AsciiCache = LOGO_CACHE,
+                     contrast: str = None, dither: str = None) -> str:
+    """ASCII art for encoded image bytes; decodes (and imports PIL) only when the cache has no entry."""
+    def render():
+        return image_to_ascii(open_for_ascii(BytesIO(data), width), width, contrast, dither)
 
-    return ascii_str
+    # The quality modes change the output, so they're part of the cache key
+    palette = ASCII_CHARS if not (contrast or dither) else f"{ASCII_CHARS}|{contrast}|{dither}"
+    return cache.get_or_render(data, width, palette, render)
 
-def generate_logo(g) -> str:
+def generate_logo(g, width: int = DEFAULT_WIDTH, login: str = None) -> str:
     """Generate ASCII logo from GitHub user avatar.
     
-    Note: This function imports requests and Github lazily to avoid
+    Note: This function imports requests lazily (via src.http_cache) to avoid
     loading heavy dependencies when only using basic ASCII functions.
     """
-    import requests
-    from github import Github
+    from src.config import CONFIG
+    from src.http_cache import get_session
     
-    user_pfp = g.get_user().avatar_url
-    response = requests.get(user_pfp)
-    img = Image.open(BytesIO(response.content))
+    user = g.get_user(login) if login else g.get_user()
+    response = get_session().get(avatar_request_url(user.avatar_url, width))
 
-    return image_to_ascii(img)
+    contrast, dither = CONFIG["ascii_contrast"], CONFIG["ascii_dither"]
+    return ascii_from_bytes(response.content, width, contrast=None if contrast == "none" else contrast,
+                            dither=None if dither == "none" else dither)
@@ -1,65 +1,315 @@
-import os
-import json
-from dotenv import load_dotenv
-from github import Github
-from collections import Counter
+from __future__ import annotations
 
-with open("config.json", "r") as f:
-    config = json.load(f)
+from collections import Counter
+from collections import namedtuple
+from typing import TYPE_CHECKING
+from src.config import CONFIG as config
+from src.scheduler import SKIPPED, FetchScheduler, is_throttled
+from src.stats_state import STATE_VERSION, load_state, save_state
 
-with open('config.json') as config_file:
-    config = json.load(config_file)
+if TYPE_CHECKING:
+    from github import Github
 
-def get_repos(g: Github):
-    exclude_organizations = config.get("exclude_organizations", True)
-    repos = [repo for repo in g.get_user().get_repos(type="public") if repo.visibility == "public"]
+def get_repos(g: Github, login: str = None):
+    exclude_organizations = config["exclude_organizations"]
+    if login is None:
+        listing = g.get_user().get_repos(type="public")
+    else:
+        listing = g.get_user(login).get_repos(type="owner")
+    repos = [repo for repo in listing if repo.visibility == "public"]
     if exclude_organizations:
         repos = [repo for repo in repos if repo.owner.type != "Organization"]
     return repos
 
-def get_lines_of_code(g: Github) -> int:
-    total_lines = 0
-    for repo in get_repos(g):
-        if repo.visibility == "public":  # Double check visibility again!
-            try:
-                languages = repo.get_languages()
-                total_lines += sum(languages.values())
-            except Exception:
+def _iso(value) -> str:
+    if value is None or isinstance(value, str):
+        return value
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _attempt(call, fallback) -> tuple:
+    """(call(), True), or (fallback, False) if it failed for any reason other than throttling."""
+    try:
+        return call(), True
+    except Exception as e:
+        if is_throttled(e):
+            raise
+        return fallback, False
+
+def _counts(repo):
+    from github import GithubException
+
+    try:
+        commits = repo.get_commits().totalCount
+    except GithubException as e:
+        if e.status == 409:  # Empty repository: there is nothing to count, and that won't change until a push
+            return None
+        raise
+    return commits, repo.get_issues().totalCount, repo.get_pulls().totalCount
+
+def repo_languages(repo) -> dict:
+    """Language byte counts for a repo, or {} if the API call failed."""
+    return _attempt(repo.get_languages, {})[0]
+
+def repo_counters(repo):
+    """(commits, issues, prs) for a repo, or None if it is empty or any call failed."""
+    return _attempt(lambda: _counts(repo), None)[0]
+
+def repo_stamp(repo) -> list:
+    """What a repo's stored counters were computed at; any change means refetch.
+
+    open_issues_count covers issue/PR activity, which doesn't touch pushed_at.
+    """
+    return [_iso(repo.pushed_at), _iso(repo.updated_at), repo.open_issues_count]
+
+class RepoSnapshot:
+    """In-memory view of the user's public repos, listed once per run.
+
+    Every derived stat reads from this snapshot, so the repo listing is paged
+    through a single time and each repo's detail endpoints are hit at most once.
+    Detail calls are prefetched through a FetchScheduler. With ``state`` from
+    the last run, repos whose pushed_at/updated_at/open issue count haven't
+    moved reuse their stored values, and repos the quota can't cover fall back
+    to them as well.
+    """
+
+    def __init__(self, g: Github, scheduler: FetchScheduler = None, state: dict = None, login: str = None):
+        self.user = g.get_user(login) if login else g.get_user()
+        self.repos = get_repos(g, login)
+        self._languages = {}
+        self._counters = {}
+        self._stamps = {}
+        self.prefetch(scheduler or FetchScheduler(g, config["max_workers"]), state)
+
+    def prefetch(self, scheduler: FetchScheduler, state: dict = None):
+        last_known = (state or {}).get("repos", {})
+        changed = []
+        for repo in self.public_repos():
+            known = last_known.get(repo.full_name)
+            if known is not None and known.get("stamp") == repo_stamp(repo):
+                self._restore(repo, known)
+            else:
+                changed.append(repo)
+
+        costs = [1 if repo.fork else 4 for repo in changed]
+        budget = scheduler.preflight(costs)
+        if budget < len(changed):
+            print(f"⚠️ Rate limit quota covers {budget}/{len(changed)} repos, using last known values for the rest")
+        results = scheduler.map(self._fetch_details, changed[:budget]) + [SKIPPED] * (len(changed) - budget)
+        for repo, result in zip(changed, results):
+            if result is True:
+                self._stamps[repo.full_name] = repo_stamp(repo)
+            elif result is SKIPPED or repo.full_name in last_known:
+                self._restore(repo, last_known.get(repo.full_name, {}))
+            else:
+                # A failed call leaves partial values; no stamp, so the next run fetches them again
+                self._stamps[repo.full_name] = None
+
+    def _restore(self, repo, known: dict):
+        # Keep the stamp the values were computed at, so a degraded repo is refetched next run
+        self._stamps[repo.full_name] = known.get("stamp")
+        self._languages[repo.full_name] = known.get("languages", {})
+        counters = known.get("counters")
+        self._counters[repo.full_name] = tuple(counters) if counters is not None else None
+
+    def _fetch_details(self, repo) -> bool:
+        """Fetch a repo's languages (and counters, unless it's a fork); True if every call succeeded."""
+        self._languages[repo.full_name], complete = _attempt(repo.get_languages, {})
+        if not repo.fork:
+            self._counters[repo.full_name], counted = _attempt(lambda: _counts(repo), None)
+            complete = complete and counted
+        return complete
+
+    def languages(self, repo) -> dict:
+        """Language byte counts for a repo, or {} if the API call failed."""
+        if repo.full_name not in self._languages:
+            self._languages[repo.full_name] = repo_languages(repo)
+        return self._languages[repo.full_name]
+
+    def counters(self, repo):
+        """(commits, issues, prs) for a repo, or None if any call failed."""
+        if repo.full_name not in self._counters:
+            self._counters[repo.full_name] = repo_counters(repo)
+        return self._counters[repo.full_name]
+
+    def to_state(self) -> dict:
+        return {
+            "version": STATE_VERSION,
+            "repos": {
+                repo.full_name: {
+                    "languages": self._languages.get(repo.full_name, {}),
+                    "counters": self._counters.get(repo.full_name),
+                    "stamp": self._stamps.get(repo.full_name),
+                }
+                for repo in self.public_repos()
+            },
+        }
+
+    def public_repos(self, include_forks: bool = True) -> list:
+        return [
+            repo for repo in self.repos
+            if repo.visibility == "public" and (include_forks or not repo.fork)  # Double check visibility again!
+        ]
+
+    def total_stars(self) -> int:
+        return sum(repo.stargazers_count for repo in self.repos)
+
+    def bytes_of_code(self) -> int:
+        return sum(sum(self.languages(repo).values()) for repo in self.public_repos())
+
+    def language_totals(self) -> dict:
+        languages = Counter()
+        for repo in self.public_repos(include_forks=False):
+            languages.update(self.languages(repo))
+        return dict(languages)
+
+    def activity_totals(self) -> tuple:
+        total_commits = total_issues = total_prs = 0
+        for repo in self.public_repos(include_forks=False):
+            counters = self.counters(repo)
+            if counters is None:
                 continue
-    return total_lines
-
-def get_languages(g: Github) -> dict:
-    languages = Counter()
-    for repo in get_repos(g):
-        if not repo.fork and repo.visibility == "public":  # Double check visibility again!
-            try:
-                for lang, bytes_count in repo.get_languages().items():
-                    languages[lang] += bytes_count
-            except Exception:
+            commits, issues, prs = counters
+            total_commits += commits
+            total_issues += issues
+            total_prs += prs
+        return total_commits, total_issues, total_prs
+
+RepoRef = namedtuple(
+    "RepoRef",
+    "full_name fork visibility stargazers_count owner_type pushed_at updated_at open_issues_count",
+)
+
+# Everything node_values() reads from a repository node
+REPO_FIELDS = """
+        nameWithOwner
+        isFork
+        isPrivate
+        stargazerCount
+        pushedAt
+        updatedAt
+        owner { __typename }
+        defaultBranchRef { target { ... on Commit { history { totalCount } } } }
+        issues(states: OPEN) { totalCount }
+        pullRequests(states: OPEN) { totalCount }
+        languages(first: 100) { edges { size node { name } } }
+"""
+
+# %(owner)s is "viewer" for the token's own account or "user(login: $login)" for anyone else
+REPOS_QUERY = """
+query($first: Int!, $after: String%(login_var)s) {
+  %(owner)s {
+    repositories(first: $first, after: $after, privacy: PUBLIC, ownerAffiliations: [%(affiliations)s]) {
+      pageInfo { hasNextPage endCursor }
+      nodes {%(fields)s      }
+    }
+  }
+}
+"""
+
+def node_values(node: dict) -> tuple:
+    """(RepoRef, languages, counters) from a GraphQL repository node, counted like the REST backend."""
+    prs = node["pullRequests"]["totalCount"]
+    repo = RepoRef(
+        node["nameWithOwner"], node["isFork"], "public" if not node["isPrivate"] else "private",
+        node["stargazerCount"], node["owner"]["__typename"], node["pushedAt"], node["updatedAt"],
+        node["issues"]["totalCount"] + prs,
+    )
+    languages = {edge["node"]["name"]: edge["size"] for edge in node["languages"]["edges"]}
+    branch = node["defaultBranchRef"]
+    if branch is None:  # Empty repo: REST get_commits() fails with 409 and the repo is skipped
+        counters = None
+    else:
+        counters = (branch["target"]["history"]["totalCount"], node["issues"]["totalCount"] + prs, prs)
+    return repo, languages, counters
+
+def graphql_nodes(g: Github, query: str, root: str, variables: dict, page_size: int):
+    """Repository nodes of data[root].repositories, requested page by page as they are consumed."""
+    cursor = None
+    while True:
+        _, data = g.requester.graphql_query(query, dict(variables, first=page_size, after=cursor))
+        repositories = data["data"][root]["repositories"]
+        yield from repositories["nodes"]
+        if not repositories["pageInfo"]["hasNextPage"]:
+            return
+        cursor = repositories["pageInfo"]["endCursor"]
+
+class GraphQLSnapshot(RepoSnapshot):
+    """RepoSnapshot filled from batched GraphQL pages instead of per-repo REST calls.
+
+    Each page carries the stars, languages and commit/issue/PR counts of up to
+    ``page_size`` repos, so a run costs one request per page rather than four
+    per repo. Counts match the REST backend: REST ``get_issues()`` includes open
+    pull requests, so they are added to the issue count here too.
+    """
+
+    def __init__(self, g: Github, scheduler: FetchScheduler = None, state: dict = None, login: str = None,
+                 page_size: int = 50):
+        self.user = g.get_user(login) if login else g.get_user()
+        self.repos = []
+        self._languages = {}
+        self._counters = {}
+        self._stamps = {}
+        exclude_organizations = config["exclude_organizations"]
+        for node in self._nodes(g, page_size, login):
+            repo, languages, counters = node_values(node)
+            if repo.visibility != "public":
+                continue
+            if exclude_organizations and repo.owner_type == "Organization":
                 continue
-    return dict(languages)
+            self.repos.append(repo)
+            self._stamps[repo.full_name] = repo_stamp(repo)
+            self._languages[repo.full_name] = languages
+            self._counters[repo.full_name] = counters
+
+    @staticmethod
+    def _nodes(g: Github, page_size: int, login: str = None):
+        if login is None:
+            query = REPOS_QUERY % {"login_var": "", "owner": "viewer",
+                                   "affiliations": "OWNER, COLLABORATOR, ORGANIZATION_MEMBER", "fields": REPO_FIELDS}
+            root, variables = "viewer", {}
+        else:
+            # Only the repos the user owns, like REST get_repos(type="owner")
+            query = REPOS_QUERY % {"login_var": ", $login: String!", "owner": "user(login: $login)",
+                                   "affiliations": "OWNER", "fields": REPO_FIELDS}
+            root, variables = "user", {"login": login}
+        return graphql_nodes(g, query, root, variables, page_size)
+
+BACKENDS = {
+    "rest": RepoSnapshot,
+    "graphql": GraphQLSnapshot,
+}
+
+def get_lines_of_code(g: Github, snapshot: RepoSnapshot = None) -> int:
+    snapshot = snapshot or RepoSnapshot(g)
+    return snapshot.bytes_of_code()
+
+def get_languages(g: Github, snapshot: RepoSnapshot = None) -> dict:
+    snapshot = snapshot or RepoSnapshot(g)
+    return snapshot.language_totals()
 
 def format_languages(languages: dict) -> str:
     sorted_lang = sorted(languages.items(), key=lambda x: x[1], reverse=True)
-    max_languages = config.get("max_languages", -1)
+    max_languages = config["max_languages"]
     if max_languages != -1:
         sorted_lang = sorted_lang[:max_languages]
     return '\n' + '\n'.join([f"- {lang}: {bytes_count} bytes of code" for lang, bytes_count in sorted_lang]) # The GitHUB API returns the bytes of code written in a language, not the lines of code
 
-def fetch_stats(g: Github) -> dict:
-    user = g.get_user()
-    total_commits = 0
-    total_issues = 0
-    total_prs = 0
-
-    for repo in get_repos(g):
-        if not repo.fork and repo.visibility == "public":  # Check both fork and visibility
-            try:
-                total_commits += repo.get_commits().totalCount
-                total_issues += repo.get_issues().totalCount
-                total_prs += repo.get_pulls().totalCount
-            except Exception:
-                continue
+def fetch_stats(g: Github, backend: str = None, login: str = None, state_path: str = None) -> dict:
+    """Stats for the token's account, or for ``login`` when given."""
+    return collect_stats(g, backend, login, state_path)[0]
+
+def collect_stats(g: Github, backend: str = None, login: str = None, state_path: str = None) -> tuple:
+    """(stats, language byte totals); the raw totals let a snapshot be re-formatted later."""
+    backend = backend or config["backend"]
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown fetch backend '{backend}', expected one of {sorted(BACKENDS)}")
+    state_path = state_path or config["state_file"]
+    state = load_state(state_path) if config["incremental"] else None
+    snapshot = BACKENDS[backend](g, state=state, login=login)
+    save_state(snapshot.to_state(), state_path)
+    user = snapshot.user
+    total_commits, total_issues, total_prs = snapshot.activity_totals()
+    languages = dict(get_languages(g, snapshot))
 
     return {
         "username": user.login,
@@ -67,8 +317,8 @@ def fetch_stats(g: Github) -> dict:
         "following": user.following,
         "public_repos": user.public_repos,
         "public_gists": user.public_gists,
-        "total_stars": sum([repo.stargazers_count for repo in get_repos(g)]),
-        "bytes_of_code": get_lines_of_code(g),
+        "total_stars": snapshot.total_stars(),
+        "bytes_of_code": get_lines_of_code(g, snapshot),
         "bio": user.bio,
         "location": user.location,
         "company": user.company,
@@ -77,8 +327,8 @@ def fetch_stats(g: Github) -> dict:
         "hireable": user.hireable,
         "created_at": user.created_at.strftime("%d-%m-%Y"),
         "updated_at": user.updated_at.strftime("%d-%m-%Y"),
-        "languages": format_languages(get_languages(g)),
+        "languages": format_languages(languages),
         "total_commits": total_commits,
         "total_issues": total_issues,
         "total_prs": total_prs,
-    }
\ No newline at end of file
+    }, languages
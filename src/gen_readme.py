@@ -1,39 +1,65 @@
-import json, os, re 
+from __future__ import annotations
+
+import hashlib, json, os, re, zlib
+from io import BytesIO
+from typing import TYPE_CHECKING
+from src.config import CONFIG
 from src.draw_ascii import generate_logo
 from src.fetch_info import fetch_stats
-from PIL import Image, ImageDraw, ImageFont
-from github import Github
+from src.layout import TextMeasurer, layout_card
+from src.task_graph import TaskGraph
 
-def generate_fetch(g:Github) -> str:
-    with open("config.json", "r") as f:
-        config = json.load(f)
+# PIL and PyGithub are imported where they're first needed, so text-only callers never load them
+if TYPE_CHECKING:
+    from github import Github
 
-    user = fetch_stats(g)
-    pfp = generate_logo(g)
+ANSI_RESET = "\x1b[0m"
 
+def ansi_color(rgba: tuple) -> str:
+    """24-bit foreground escape for an (r, g, b, a) colour."""
+    r, g, b = rgba[:3]
+    return f"\x1b[38;2;{r};{g};{b}m"
 
-    stats = f"{user['username']}@github.com\n------------------------------\n"
-    for stat in config['display_stats']:
-        if stat in user:
-            stats += f"{stat.replace('_', ' ').title()}: {user[stat]}\n"
-    stats += f"\n{config['additional_info']}\n"
+def fetch_lines(config, user_stats: dict, ascii_art: str, color: bool = False):
+    """Yield the side-by-side text card one line at a time.
 
-    pfp_lines = pfp.split("\n")
-    stats_lines = stats.split("\n")
+    With color, the ASCII art, title and labels use preferred_color like the
+    PNG card. Padding is computed on the plain text, so columns line up either way.
+    """
+    accent = ansi_color(return_preffered_color(config['preferred_color'])) if color else ""
+    reset = ANSI_RESET if color else ""
 
-    max_lines = max(len(pfp_lines), len(stats_lines))
-    pfp_lines += [""] * (max_lines - len(pfp_lines))
-    stats_lines += [""] * (max_lines - len(stats_lines))
+    # (accent, plain) pairs per line, so escapes never count towards the padding
+    stats = [(f"{user_stats['username']}@github.com", ""), ("------------------------------", "")]
+    for stat in config['display_stats']:
+        if stat in user_stats:
+            first, *rest = str(user_stats[stat]).split("\n")
+            stats.append((f"{stat.replace('_', ' ').title()}:", f" {first}"))
+            stats.extend(("", line) for line in rest)
+    stats.append(("", ""))
+    for line in config['additional_info'].split("\n"):
+        label, sep, value = line.partition(":")
+        stats.append((label + sep, value) if sep else (line, ""))
+    stats.append(("", ""))
 
-    combined = "\n".join(f"{pfp_line:<50} {stats_line}" for pfp_line, stats_line in zip(pfp_lines, stats_lines))
-    
-    return combined
+    pfp_lines = ascii_art.split("\n")
+    for i in range(max(len(pfp_lines), len(stats))):
+        pfp_line = pfp_lines[i] if i < len(pfp_lines) else ""
+        label, value = stats[i] if i < len(stats) else ("", "")
+        pad = " " * (50 - len(pfp_line))
+        if color:
+            pfp_line = f"{accent}{pfp_line}{reset}" if pfp_line else ""
+            label = f"{accent}{label}{reset}" if label else ""
+        yield f"{pfp_line}{pad} {label}{value}"
 
-def return_preffered_color() -> tuple:
-    with open("config.json", "r") as f:
-        config = json.load(f)
-    
-    color = config['preferred_color']
+def generate_fetch(g:Github) -> str:
+    user = fetch_stats(g)
+    pfp = generate_logo(g)
+    return "\n".join(fetch_lines(CONFIG, user, pfp))
+
+def return_preffered_color(color: str = None) -> tuple:
+    if color is None:
+        color = CONFIG['preferred_color']
     color_map = {
         "red": (255, 0, 0, 255),
         "green": (0, 128, 0, 255),
@@ -55,229 +81,375 @@ def return_preffered_color() -> tuple:
 
 def calculate_content_height(config, user_stats, font, ascii_lines, line_spacing, box_margin, content_padding, ascii_width, text_margin, width):
     """Calculate the total height needed for all content without drawing."""
-    y_offset = box_margin + content_padding
-    x_text = ascii_width + text_margin
-    max_text_width = width - ascii_width - (text_margin * 2)
-    
-    # Account for ASCII art height
-    ascii_height = len(ascii_lines) * line_spacing
-    
-    # Calculate text section height
-    text_y = box_margin + content_padding
-    
-    # Header + separator
-    text_y += line_spacing * 2
-    
-    # Stats
-    for stat in config['display_stats']:
-        if stat in user_stats and user_stats[stat] is not None:
-            value = str(user_stats[stat]).replace("//", "\n -")
-            title = f"{stat.replace('_', ' ').title()}:"
-            title_width = font.getlength(title)
-            remaining_width = max_text_width - title_width - 5
-            
-            if '\n' in value:
-                value_lines = value.split('\n')
-                for i, line in enumerate(value_lines):
-                    if i == 0 and line.strip():
-                        text_y += line_spacing
-                    elif line.strip():
-                        text_y += line_spacing
-                    elif i == 0:
-                        text_y += line_spacing
-            else:
-                words = value.split()
-                if not words:
-                    text_y += line_spacing
-                    continue
-                    
-                line = []
-                for word in words:
-                    test_line = ' '.join(line + [word])
-                    text_width = font.getlength(test_line)
-                    if text_width <= remaining_width:
-                        line.append(word)
-                    else:
-                        if line:
-                            text_y += line_spacing
-                            line = [word]
-                        else:
-                            text_y += line_spacing
-                if line:
-                    text_y += line_spacing
-    
-    # Additional info
-    if config['additional_info']:
-        additional_lines = config['additional_info'].split('\n')
-        for line in additional_lines:
-            if line.strip():
-                text_y += line_spacing
-    
-    # Return max of ASCII height and text height, plus bottom padding
-    return max(ascii_height, text_y) + box_margin + content_padding
+    return layout_card(
+        config, user_stats, ascii_lines, TextMeasurer(font),
+        width=width, ascii_width=ascii_width, text_margin=text_margin, line_spacing=line_spacing,
+        box_margin=box_margin, content_padding=content_padding,
+    ).height
 
 
-def gen_image(g: Github):
-    width = 1200
-    ascii_width = 450
-    text_margin = 60
-    
-    # Transparent background (RGBA, alpha=0)
-    bg_color = (0, 0, 0, 0)
-    value_color = return_preffered_color()
-    text_color = (255, 255, 255, 255)  # RGBA format
-    font_size = 16
-
-    font = None
-    font_paths = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
-        "/usr/share/fonts/truetype/ubuntu/UbuntuMono-R.ttf",
-        "/usr/share/fonts/liberation-mono/LiberationMono-Regular.ttf",
-        "monospace",
-        "consola.ttf"
-    ]
-    
-    # Get ASCII art and user stats separately instead of using combined fetch
-    from src.draw_ascii import generate_logo
-    ascii_art = generate_logo(g)
-    user_stats = fetch_stats(g)
-    
-    with open("config.json", "r") as f:
-        config = json.load(f)
-    
-    for font_path in font_paths:
+FONT_SIZE = 16
+FONT_PATHS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
+    "/usr/share/fonts/truetype/ubuntu/UbuntuMono-R.ttf",
+    "/usr/share/fonts/liberation-mono/LiberationMono-Regular.ttf",
+    "monospace",
+    "consola.ttf"
+]
+
+# Bump when the drawing code changes so cached renders are invalidated
+RENDER_VERSION = 2
+
+# Antialiasing steps per text colour. Two colours at 64 steps over the box keep
+# a card well under 256 colours, so encode_png can store it as an exact palette image.
+# config.json's "coverage_levels": null keeps FreeType's full antialiasing instead.
+COVERAGE_LEVELS = 64
+
+# (zlib level, strategy) per PNG colour type, picked with benchmarks/bench_png.py.
+# Pillow's own default strategy for RGBA is Z_FILTERED, which compresses the card worse.
+PNG_ZLIB = {"P": (6, zlib.Z_FILTERED), "RGBA": (6, zlib.Z_DEFAULT_STRATEGY)}
+
+# config.json keys that affect the rendered card
+RENDER_CONFIG_KEYS = ("display_stats", "additional_info", "preferred_color", "coverage_levels")
+
+def load_font(font_size: int = FONT_SIZE):
+    """Return (font, font_path) for the first available monospace font, or (None, None)."""
+    from PIL import ImageFont
+
+    for font_path in FONT_PATHS:
         try:
-            font = ImageFont.truetype(font_path, font_size)
-            break
+            return ImageFont.truetype(font_path, font_size), font_path
         except IOError:
             continue
-    
-    if font is None:
-        print("No suitable fonts found. Aborting!")
-        return
-    
-    # Calculate dimensions
-    ascii_lines = ascii_art.split("\n")
-    box_margin = 5
-    content_padding = 10
-    line_spacing = font_size + 4
-    
-    # Calculate required height
-    required_height = calculate_content_height(
-        config, user_stats, font, ascii_lines, line_spacing,
-        box_margin, content_padding, ascii_width, text_margin, width
+    return None, None
+
+def render_fingerprint(config, user_stats, ascii_art, font_path, font_size, variant: dict = None) -> str:
+    """Hash of everything that determines the card's pixels."""
+    from PIL import ImageFont, __version__ as pil_version
+
+    payload = {
+        "version": RENDER_VERSION,
+        "stats": user_stats,
+        "ascii": ascii_art,
+        "config": {key: config.get(key) for key in RENDER_CONFIG_KEYS},
+        "font": [font_path, font_size, pil_version, ImageFont.core.freetype2_version],
+    }
+    if variant is not None:
+        payload["variant"] = {"background": variant["background"], "scale": variant["scale"]}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+# Card geometry at scale 1; variants multiply every length by their scale
+CARD_WIDTH = 1200
+ASCII_WIDTH = 450
+TEXT_MARGIN = 60
+BOX_MARGIN = 5
+CONTENT_PADDING = 10
+MIN_HEIGHT = 550
+
+# Box fill and value colour per background; the outline and titles use preferred_color
+THEMES = {
+    "dark": {"box": (0, 0, 0, 200), "text": (255, 255, 255, 255)},
+    "light": {"box": (255, 255, 255, 230), "text": (0, 0, 0, 255)},
+}
+
+def _scaled(length: int, scale: float) -> int:
+    return int(round(length * scale))
+
+def card_layout(config, user_stats, ascii_art, font, scale: float = 1):
+    """Lay out every line once; the canvas size and the drawing both use it.
+
+    Depends only on the text and the font metrics, so variants that differ in
+    colour or background share one layout.
+    """
+    return layout_for(config, user_stats, ascii_art, TextMeasurer(font), font.size, scale)
+
+def layout_for(config, user_stats, ascii_art, measurer: TextMeasurer, font_size: int, scale: float = 1):
+    """The card geometry at scale, for any measurer (a PIL font's or a fixed advance)."""
+    return layout_card(
+        config, user_stats, ascii_art.split("\n"), measurer,
+        width=_scaled(CARD_WIDTH, scale), ascii_width=_scaled(ASCII_WIDTH, scale),
+        text_margin=_scaled(TEXT_MARGIN, scale), line_spacing=font_size + _scaled(4, scale),
+        box_margin=_scaled(BOX_MARGIN, scale), content_padding=_scaled(CONTENT_PADDING, scale),
+        label_gap=_scaled(5, scale), indent=_scaled(10, scale),
     )
+
+def _coverage_lut(levels: int) -> list:
+    """Snap 0-255 glyph coverage to levels evenly spaced steps."""
+    return [round(round(c * (levels - 1) / 255) * 255 / (levels - 1)) for c in range(256)]
+
+def rasterize(layout, font, value_color: tuple, background: str = "dark", scale: float = 1,
+              coverage_levels: int = COVERAGE_LEVELS):
+    """Draw the card; coverage_levels=None keeps FreeType's full 256-step antialiasing."""
+    from PIL import Image, ImageDraw
+    from src.glyph_atlas import draw_text_block
+
+    width = _scaled(CARD_WIDTH, scale)
+    box_margin = _scaled(BOX_MARGIN, scale)
+    line_spacing = font.size + _scaled(4, scale)
+    theme = THEMES[background]
+    
+    # Transparent background (RGBA, alpha=0)
+    bg_color = (0, 0, 0, 0)
+    text_color = theme["text"]
     
     # Create image at the correct size from the start
-    final_height = max(550, required_height + 20)
+    final_height = max(_scaled(MIN_HEIGHT, scale), layout.height + _scaled(20, scale))
     image = Image.new("RGBA", (width, final_height), bg_color)
     draw = ImageDraw.Draw(image)
     
-    # Draw black box with colored outline as background
+    # Draw the box with a coloured outline as background
     draw.rectangle(
         [(box_margin, box_margin), (width - box_margin - 1, final_height - box_margin - 1)],
-        fill=(0, 0, 0, 200),
+        fill=theme["box"],
         outline=value_color,
-        width=3
+        width=_scaled(3, scale)
     )
     
-    # Draw ASCII art on the left
-    y_offset = box_margin + content_padding
-    x_ascii = box_margin + content_padding
-    for ascii_line in ascii_lines:
-        draw.text((x_ascii, y_offset), ascii_line, fill=value_color, font=font)
-        y_offset += line_spacing
-
-    # Draw user info on the right
-    y_offset = box_margin + content_padding
-    x_text = ascii_width + text_margin
-    max_text_width = width - ascii_width - (text_margin * 2)
-    
-    # Draw header
-    header = f"{user_stats['username']}@github.com"
-    draw.text((x_text, y_offset), header, fill=value_color, font=font)
-    y_offset += line_spacing
-    
-    separator = "------------------------------"
-    draw.text((x_text, y_offset), separator, fill=value_color, font=font)
-    y_offset += line_spacing
-    
-    # Draw stats
-    for stat in config['display_stats']:
-        if stat in user_stats and user_stats[stat] is not None:
-            title = f"{stat.replace('_', ' ').title()}:"
-            value = str(user_stats[stat]).replace("//", "\n -")
-            
-            title_width = font.getlength(title)
-            draw.text((x_text, y_offset), title, fill=value_color, font=font)
-            
-            x_value = x_text + title_width + 5
-            remaining_width = max_text_width - title_width - 5
-            
-            # Handle text wrapping for long values
-            if '\n' in value:  # Handle multi-line values like languages
-                value_lines = value.split('\n')
-                for i, line in enumerate(value_lines):
-                    if i == 0 and line.strip():  # First line goes next to title
-                        draw.text((x_value, y_offset), line.strip(), fill=text_color, font=font)
-                        y_offset += line_spacing
-                    elif line.strip():  # Subsequent lines with small indent
-                        draw.text((x_text + 10, y_offset), line.strip(), fill=text_color, font=font)
-                        y_offset += line_spacing
-                    elif i == 0:  # Empty first line, just move to next line
-                        y_offset += line_spacing
-            else:
-                # Single line value with word wrapping
-                words = value.split()
-                line = []
-                x_current = x_value
-                
-                for word in words:
-                    test_line = ' '.join(line + [word])
-                    text_width = font.getlength(test_line)
-                    
-                    if text_width <= remaining_width:
-                        line.append(word)
-                    else:
-                        if line:
-                            draw.text((x_current, y_offset), ' '.join(line), fill=text_color, font=font)
-                            y_offset += line_spacing
-                            line = [word]
-                            x_current = x_text + text_margin
-                        else:
-                            draw.text((x_current, y_offset), word, fill=text_color, font=font)
-                            y_offset += line_spacing
-                if line:
-                    draw.text((x_current, y_offset), ' '.join(line), fill=text_color, font=font)
-                    y_offset += line_spacing
+    colors = {"accent": value_color, "text": text_color}
+    if coverage_levels is None:
+        targets = {role: (draw, color) for role, color in colors.items()}
+    else:
+        # Collect each colour's coverage in a mask and blend it once, snapped to fewer steps
+        masks = {role: Image.new("L", image.size, 0) for role in colors}
+        targets = {role: (ImageDraw.Draw(mask), 255) for role, mask in masks.items()}
+
+    # ASCII art on the left, composed from cached glyph tiles
+    ascii_ops = [op for op in layout.ops if op.role == "ascii"]
+    if ascii_ops:
+        target, fill = targets["accent"]
+        draw_text_block(target, (ascii_ops[0].x, ascii_ops[0].y), [op.text for op in ascii_ops],
+                        line_spacing, fill, font)
+
+    for op in layout.ops:
+        if op.role != "ascii":
+            target, fill = targets[op.role]
+            target.text((op.x, op.y), op.text, fill=fill, font=font)
+
+    if coverage_levels is not None:
+        lut = _coverage_lut(coverage_levels)
+        for role, mask in masks.items():
+            bbox = mask.getbbox()
+            if bbox:
+                draw.bitmap(bbox[:2], mask.crop(bbox).point(lut), fill=colors[role])
+
+    return image
+
+def render_image(config, user_stats, ascii_art, font, scale: float = 1, background: str = "dark"):
+    layout = card_layout(config, user_stats, ascii_art, font, scale)
+    return rasterize(layout, font, return_preffered_color(config['preferred_color']), background, scale,
+                     config.get("coverage_levels", COVERAGE_LEVELS))
+
+def write_if_changed(path: str, data: bytes) -> bool:
+    """Atomically replace path with data unless it already holds exactly those bytes."""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+# Three of the four RGBA bands, tried in order, to tell a card's colours apart
+_KEY_BANDS = ((0, 1, 3), (0, 2, 3), (1, 2, 3), (0, 1, 2))
+
+def palette_image(image):
+    """An exact mode P copy of an RGBA image (alpha in tRNS), or None when it has more than 256 colours.
+
+    Quantizing an image with at most 256 distinct colours keeps every one of
+    them, so three bands that tell the colours apart are quantized as RGB and
+    the palette is mapped back to the full RGBA colours. The result is
+    compared against the input pixel for pixel; anything short of identical
+    gives None.
+    """
+    from PIL import Image
+
+    counted = image.getcolors(256) if image.mode == "RGBA" else None
+    if counted is None:
+        return None
+    colors = [color for _, color in counted]
+    for bands in _KEY_BANDS:
+        keys = [tuple(color[i] for i in bands) for color in colors]
+        if len(set(keys)) == len(keys):
+            break
+    else:
+        return None
+    channels = image.split()
+    indexed = Image.merge("RGB", [channels[i] for i in bands]).quantize(
+        len(colors), method=Image.Quantize.MAXCOVERAGE, dither=Image.Dither.NONE)
+    by_key = dict(zip(keys, colors))
+    flat = indexed.getpalette()
+    palette = [by_key.get(tuple(flat[i:i + 3]), (0, 0, 0, 0)) for i in range(0, len(flat), 3)]
+    indexed.putpalette([channel for color in palette for channel in color[:3]])
+    indexed.info["transparency"] = bytes(color[3] for color in palette)
+    if indexed.convert("RGBA").tobytes() != image.tobytes():
+        return None
+    return indexed
+
+def encode_png(image, palette: bool = True) -> bytes:
+    """PNG bytes, as an exact palette image when the colours allow it and full RGBA otherwise."""
+    indexed = palette_image(image) if palette else None
+    # Fixed settings and no metadata chunks, so identical pixels give identical bytes
+    buffer = BytesIO()
+    if indexed is not None:
+        level, strategy = PNG_ZLIB["P"]
+        indexed.save(buffer, format="PNG", compress_level=level, compress_type=strategy, optimize=False,
+                     transparency=indexed.info["transparency"])
+    else:
+        level, strategy = PNG_ZLIB.get(image.mode, PNG_ZLIB["RGBA"])
+        image.save(buffer, format="PNG", compress_level=level, compress_type=strategy, optimize=False)
+    return buffer.getvalue()
+
+def _fingerprint_path(output_path: str) -> str:
+    return os.path.splitext(output_path)[0] + ".fingerprint"
+
+def _is_current(output_path: str, fingerprint: str) -> bool:
+    try:
+        with open(_fingerprint_path(output_path), "r", encoding="utf-8") as f:
+            return f.read().strip() == fingerprint and os.path.exists(output_path)
+    except FileNotFoundError:
+        return False
+
+def _save(image, output_path: str, fingerprint: str) -> bool:
+    changed = write_if_changed(output_path, encode_png(image))
+    write_if_changed(_fingerprint_path(output_path), (fingerprint + "\n").encode())
+    return changed
+
+def write_card(config, user_stats: dict, ascii_art: str, output_path: str = "out/fetch.png", font: tuple = None) -> bool:
+    """Render the card to output_path; returns False when the existing image is already up to date.
+
+    Only needs plain data, so it can run in a worker process. font is a
+    load_font() result, probed here when not given.
+    """
+    font, font_path = font or load_font(FONT_SIZE)
+    if font is None:
+        print("No suitable fonts found. Aborting!")
+        return False
     
-    # Add additional_info
-    if config['additional_info']:
-        additional_lines = config['additional_info'].split('\n')
-        for line in additional_lines:
-            if line.strip():
-                # Split on first colon to separate label from value
-                if ':' in line:
-                    parts = line.split(':', 1)
-                    label = parts[0] + ':'
-                    value = parts[1].strip()
-                    
-                    label_width = font.getlength(label)
-                    draw.text((x_text, y_offset), label, fill=value_color, font=font)
-                    draw.text((x_text + label_width + 5, y_offset), value, fill=text_color, font=font)
-                else:
-                    # No colon, just draw as colored text
-                    draw.text((x_text, y_offset), line.strip(), fill=value_color, font=font)
-                y_offset += line_spacing
-
-    os.makedirs("out", exist_ok=True)
-    image.save("out/fetch.png")
-
-def generate_readme(g: Github):
-        gen_image(g)
-        
-        image_pattern = r'<div align=\'center\'>\s*<img src=\'out/fetch\.png\' alt=\'Github Fetch\'>\s*</div>'
-        image_content = "\n## Example Output\n<div align='center'>\n  <img src='out/fetch.png' alt='Github Fetch'>\n</div>\n"
+    # Skip rasterizing and encoding when nothing that affects the pixels changed
+    fingerprint = render_fingerprint(config, user_stats, ascii_art, font_path, FONT_SIZE)
+    if _is_current(output_path, fingerprint):
+        return False
+
+    image = render_image(config, user_stats, ascii_art, font)
+    return _save(image, output_path, fingerprint)
+
+def card_image(config, user_stats: dict, ascii_art: str, variant: dict = None, font=None):
+    """The card, or one of config["variants"], as an RGBA image.
+
+    font must already be at the variant's scaled size; it's loaded here when not given.
+    """
+    scale = variant["scale"] if variant else 1
+    if font is None:
+        font, _ = load_font(_scaled(FONT_SIZE, scale))
+        if font is None:
+            raise RuntimeError("No suitable fonts found")
+    if variant is None:
+        return render_image(config, user_stats, ascii_art, font)
+    layout = card_layout(config, user_stats, ascii_art, font, scale)
+    return rasterize(layout, font, return_preffered_color(variant["preferred_color"]),
+                     variant["background"], scale, config.get("coverage_levels", COVERAGE_LEVELS))
+
+def card_png(config, user_stats: dict, ascii_art: str, variant: dict = None, font=None) -> bytes:
+    """card_image as PNG bytes, without touching out/."""
+    return encode_png(card_image(config, user_stats, ascii_art, variant, font))
+
+def _render_variant(layout, font_path: str, font_size: int, variant: dict, output_path: str, fingerprint: str,
+                    coverage_levels: int = COVERAGE_LEVELS) -> bool:
+    """Process-pool worker for write_variants."""
+    from PIL import ImageFont
+
+    font = ImageFont.truetype(font_path, font_size)
+    image = rasterize(layout, font, return_preffered_color(variant["preferred_color"]),
+                      variant["background"], variant["scale"], coverage_levels)
+    return _save(image, output_path, fingerprint)
+
+def write_variants(config, user_stats: dict, ascii_art: str, out_dir: str = "out", max_workers: int = None) -> dict:
+    """Render every config["variants"] entry to out/fetch-<name>.png from one set of stats.
+
+    Variants with the same scale share one layout, and the variants that
+    changed are rasterized in parallel on a process pool. Returns {name: changed}.
+    """
+    results, jobs, fonts, layouts = {}, [], {}, {}
+    for variant in config["variants"]:
+        scale = variant["scale"]
+        font_size = _scaled(FONT_SIZE, scale)
+        if scale not in fonts:
+            fonts[scale] = load_font(font_size)
+            if fonts[scale][0] is None:
+                print("No suitable fonts found. Aborting!")
+                return results
+        font, font_path = fonts[scale]
+        variant_config = {key: config[key] for key in RENDER_CONFIG_KEYS}
+        variant_config["preferred_color"] = variant["preferred_color"]
+        fingerprint = render_fingerprint(variant_config, user_stats, ascii_art, font_path, font_size, variant)
+        output_path = os.path.join(out_dir, f"fetch-{variant['name']}.png")
+        if _is_current(output_path, fingerprint):
+            results[variant["name"]] = False
+            continue
+        if scale not in layouts:
+            layouts[scale] = card_layout(config, user_stats, ascii_art, font, scale)
+        jobs.append((variant["name"], (layouts[scale], font_path, font_size, variant, output_path, fingerprint,
+                                       config.get("coverage_levels", COVERAGE_LEVELS))))
+
+    if len(jobs) > 1:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # spawn, as in src.batch: this runs on a TaskGraph thread, and forking a threaded process can copy held locks
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=min(len(jobs), max_workers or os.cpu_count() or 1),
+                                 mp_context=context) as pool:
+            futures = {name: pool.submit(_render_variant, *job) for name, job in jobs}
+        results.update({name: future.result() for name, future in futures.items()})
+    else:
+        results.update({name: _render_variant(*job) for name, job in jobs})
+    return results
+
+def card_graph(g: Github, output_path: str = "out/fetch.png", max_workers: int = None) -> TaskGraph:
+    """The fetch-and-render pipeline as a task graph, not yet run.
+
+    The avatar (download and ASCII conversion), the stats and the font don't
+    depend on each other, so they run concurrently; the card and its variants
+    start once their inputs are in. max_workers=1 runs the tasks one at a time.
+    An output_path ending in .svg writes the SVG card and variants instead.
+    """
+    graph = TaskGraph(max_workers)
+    config = graph.add("config", CONFIG.data)
+    logo = graph.add("logo", lambda: generate_logo(g))
+    stats = graph.add("stats", lambda: fetch_stats(g))
+    if output_path.endswith(".svg"):
+        from src.svg_card import write_svg
+
+        graph.add("card", lambda config, ascii_art, user_stats:
+                  write_svg(config, user_stats, ascii_art, output_path), config, logo, stats)
+        return graph
+    font = graph.add("font", load_font)
+    graph.add("card", lambda config, font, ascii_art, user_stats:
+              write_card(config, user_stats, ascii_art, output_path, font), config, font, logo, stats)
+    graph.add("variants", lambda config, ascii_art, user_stats:
+              write_variants(config, user_stats, ascii_art, os.path.dirname(output_path) or "."), config, logo, stats)
+    return graph
+
+def gen_image(g: Github, output_path: str = "out/fetch.png", report: bool = False) -> bool:
+    """Fetch stats and render the card; returns False when the existing image is already up to date."""
+    graph = card_graph(g, output_path)
+    changed = graph.run()["card"]
+    if report:
+        graph.report()
+    return changed
+
+def generate_readme(g: Github, report: bool = False, output_path: str = "out/fetch.png"):
+        gen_image(g, output_path, report=report)
+        update_readme(output_path)
+
+def update_readme(image: str = "out/fetch.png"):
+        image_pattern = r'<div align=\'center\'>\s*<img src=\'out/fetch\.(?:png|svg)\' alt=\'Github Fetch\'>\s*</div>'
+        image_content = f"\n## Example Output\n<div align='center'>\n  <img src='{image}' alt='Github Fetch'>\n</div>\n"
         
         try:
             with open("README.md", "r", encoding="utf-8") as f:
@@ -288,14 +460,13 @@ def generate_readme(g: Github):
             pattern = re.compile(f"{start_comment}.*?{end_comment}", re.DOTALL)
             content = re.sub(pattern, "", content)
             
-            with open("config.json", "r") as f:
-                config = json.load(f)
-            append_automatic = config.get("append_automatic", True)
+            append_automatic = CONFIG["append_automatic"]
             
             if append_automatic and not re.search(image_pattern, content):
                 content = content.rstrip() + "\n\n" + image_content
+            # Point the card at the format that was just rendered
+            content = re.sub(r"(<img src=')out/fetch\.(?:png|svg)(' alt='Github Fetch'>)", rf"\g<1>{image}\g<2>", content)
         except FileNotFoundError:
             content = image_content
         
-        with open("README.md", "w", encoding="utf-8") as f:
-            f.write(content)
\ No newline at end of file
+        write_if_changed("README.md", content.encode("utf-8"))
@@ -0,0 +1,86 @@
+"""Glyph atlas for drawing the ASCII-art block without per-line FreeType calls.
+
+Each character is rasterized once per font into a cell-sized coverage tile
+(``advance`` x ``ascent + descent``). A block of text is then composed by
+joining tile scanlines into a single 'L' mask and blended onto the canvas
+with one ``draw.bitmap``, which uses the same blend as ``draw.text``.
+
+The result is pixel-identical to drawing each line with ``draw.text``, as
+long as every glyph sits on an integer advance and stays inside its cell.
+``GlyphAtlas.supports`` checks that, and callers fall back to ``draw.text``
+otherwise.
+"""
+from PIL import Image, ImageDraw
+
+_atlases = {}
+
+
+class GlyphAtlas:
+    def __init__(self, font):
+        self.font = font
+        ascent, descent = font.getmetrics()
+        self.cell_height = ascent + descent
+        advance = font.getlength("M")
+        self.advance = int(advance) if advance == int(advance) else None
+        self._scanlines = {}  # char -> list of per-scanline bytes, None if the glyph leaves its cell
+        self._rows = [{} for _ in range(self.cell_height)]  # scanline -> {char: bytes}, for map()
+
+    def _tile(self, char: str):
+        if char not in self._scanlines:
+            w, h = self.advance, self.cell_height
+            # Render with a one-cell margin on every side to detect ink outside the cell
+            frame = Image.new("L", (w * 3, h * 3), 0)
+            ImageDraw.Draw(frame).text((w, h), char, fill=255, font=self.font)
+            bbox = frame.getbbox()
+            fits = (
+                self.font.getlength(char) == w
+                and (bbox is None or (bbox[0] >= w and bbox[1] >= h and bbox[2] <= 2 * w and bbox[3] <= 2 * h))
+            )
+            if fits:
+                data = frame.crop((w, h, 2 * w, 2 * h)).tobytes()
+                self._scanlines[char] = [data[k * w:(k + 1) * w] for k in range(h)]
+                for k, row in enumerate(self._scanlines[char]):
+                    self._rows[k][char] = row
+            else:
+                self._scanlines[char] = None
+        return self._scanlines[char]
+
+    def supports(self, lines: list) -> bool:
+        if self.advance is None:
+            return False
+        return all(self._tile(char) is not None for char in set("".join(lines)))
+
+    def render_mask(self, lines: list, line_spacing: int) -> Image.Image:
+        """Coverage mask for lines drawn line_spacing apart, as draw.text would produce."""
+        w, h = self.advance, self.cell_height
+        columns = max((len(line) for line in lines), default=0)
+        height = (len(lines) - 1) * line_spacing + h if lines else 0
+        gap = b"\0" * (columns * w * (line_spacing - h))
+        chunks = []
+        for i, line in enumerate(lines):
+            pad = b"\0" * ((columns - len(line)) * w)
+            chunks.extend(b"".join(map(row.__getitem__, line)) + pad for row in self._rows)
+            if i < len(lines) - 1:
+                chunks.append(gap)
+        return Image.frombytes("L", (columns * w, height), b"".join(chunks))
+
+
+def get_atlas(font) -> GlyphAtlas:
+    """Shared atlas per font file and size; tiles are colour-free coverage, so colour isn't part of the key."""
+    key = (font.path, font.size) if getattr(font, "path", None) else id(font)
+    if key not in _atlases:
+        _atlases[key] = GlyphAtlas(font)
+    return _atlases[key]
+
+
+def draw_text_block(draw: ImageDraw.ImageDraw, xy: tuple, lines: list, line_spacing: int, fill, font):
+    """Draw lines line_spacing apart from the atlas, falling back to draw.text when the font doesn't fit it."""
+    if not any(lines):
+        return
+    atlas = get_atlas(font)
+    x, y = xy
+    if line_spacing >= atlas.cell_height and atlas.supports(lines):
+        draw.bitmap((x, y), atlas.render_mask(lines, line_spacing), fill=fill)
+        return
+    for i, line in enumerate(lines):
+        draw.text((x, y + i * line_spacing), line, fill=fill, font=font)
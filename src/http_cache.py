@@ -0,0 +1,315 @@
+"""On-disk conditional-request cache for GitHub API and avatar responses.
+
+Responses carrying an ``ETag`` or ``Last-Modified`` header are stored on disk.
+The next request for the same URL sends ``If-None-Match``/``If-Modified-Since``
+and a ``304 Not Modified`` is answered from the stored body. GitHub doesn't
+count 304s against the rate limit, so an unchanged account costs almost no
+quota. The cache is size-bounded and evicts least recently used entries.
+
+Call ``install()`` once before creating any ``Github`` client. From then on
+every client, and ``get_session()`` for raw downloads such as the avatar, share
+a single pooled ``requests.Session`` (keep-alive connections and TLS sessions
+are reused across clients), with the cache mounted unless ``cache=False``.
+
+The same entry format backs record/replay: ``install(record=dir)`` saves every
+response, and ``install(replay=dir)`` later answers from it offline.
+"""
+import hashlib
+import json
+import os
+import threading
+
+import requests
+from github.Requester import HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass, Requester
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+DEFAULT_CACHE_DIR = ".cache/http"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Recordings are never evicted from; this only guards against runaway growth
+RECORDING_MAX_BYTES = 1024 * 1024 * 1024
+
+# Headers that describe the original transfer, not the decoded body we keep
+_DROP_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+_active_cache = None
+_session = None
+
+
+class HttpCache:
+    """Directory of ``<sha256>.entry`` files: one JSON header line followed by the raw body."""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._total = None
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(request: requests.PreparedRequest) -> str:
+        # Authenticated responses differ per token (e.g. /user), so the credential is part of the key
+        auth = request.headers.get("Authorization", "")
+        return hashlib.sha256(f"{request.method} {request.url} {auth}".encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.entry")
+
+    def count(self, name: str):
+        """Bump one of the stats counters; adapters on several threads share the cache."""
+        with self._lock:
+            self.stats[name] += 1
+
+    def get(self, key: str):
+        """(meta, body) for a stored response, or None. Marks the entry as recently used."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return meta, body
+
+    def put(self, key: str, meta: dict, body: bytes):
+        path = self._path(key)
+        data = json.dumps(meta).encode() + b"\n" + body
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self.stats["stores"] += 1
+            self._total = self._disk_usage() if self._total is None else self._total - previous + len(data)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> list:
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".entry"):
+                st = os.stat(os.path.join(self.directory, name))
+                entries.append((st.st_mtime, st.st_size, name))
+        return entries
+
+    def _disk_usage(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """Drop least recently used entries until the cache is back under 90% of its budget."""
+        for _, size, name in sorted(self._entries()):
+            if self._total <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            self._total -= size
+            self.stats["evictions"] += 1
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter that revalidates stored GET responses instead of refetching them."""
+
+    def __init__(self, cache: HttpCache, **kwargs):
+        self.cache = cache
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+        key = self.cache.key(request)
+        entry = self.cache.get(key)
+        if entry is not None:
+            meta, _ = entry
+            if meta.get("etag"):
+                request.headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                request.headers["If-Modified-Since"] = meta["last_modified"]
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.count("hits")
+            return self._from_cache(request, response, *entry)
+        self.cache.count("misses")
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 200 and (etag or last_modified):
+            headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS}
+            meta = {"url": request.url, "etag": etag, "last_modified": last_modified, "headers": headers}
+            self.cache.put(key, meta, response.content)
+        return response
+
+    @staticmethod
+    def _from_cache(request, not_modified, meta: dict, body: bytes) -> requests.Response:
+        headers = dict(meta["headers"])
+        # Keep the fresh rate-limit and date headers from the 304
+        headers.update({k: v for k, v in not_modified.headers.items() if k.lower() not in _DROP_HEADERS})
+        response = _stored_response(request, 200, "OK", headers, body, not_modified.url)
+        response.connection = not_modified.connection
+        return response
+
+
+def _stored_response(request, status: int, reason: str, headers: dict, body: bytes, url: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = url
+    response.request = request
+    response._content = body
+    response.from_cache = True
+    return response
+
+
+def cassette_key(request: requests.PreparedRequest) -> str:
+    """Recording key: method, URL and body (GraphQL queries are POSTs), but not the token,
+    so a recording can be replayed with any credentials."""
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode()
+    return hashlib.sha256(f"{request.method} {request.url} ".encode() + body).hexdigest()
+
+
+class RecordingAdapter(HTTPAdapter):
+    """HTTPAdapter that stores every response, whatever its status, in a cassette directory."""
+
+    def __init__(self, cassette: HttpCache, **kwargs):
+        self.cassette = cassette
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS}
+        meta = {"url": response.url, "status": response.status_code, "reason": response.reason, "headers": headers}
+        self.cassette.put(cassette_key(request), meta, response.content)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Answers every request from a recorded cassette, without touching the network."""
+
+    def __init__(self, cassette: HttpCache):
+        self.cassette = cassette
+        super().__init__()
+
+    def send(self, request, **kwargs):
+        entry = self.cassette.get(cassette_key(request))
+        if entry is None:
+            raise requests.ConnectionError(f"{request.method} {request.url} is not in the recording at "
+                                           f"{self.cassette.directory}", request=request)
+        meta, body = entry
+        return _stored_response(request, meta["status"], meta["reason"], meta["headers"], body, meta["url"])
+
+    def close(self):
+        pass
+
+
+def api_retry():
+    """Retries for dropped connections and 5xx responses only.
+
+    PyGithub's default GithubRetry also handles 403/429 inside urllib3 and can
+    sleep until the rate limit resets, up to an hour. Leaving those to
+    src.scheduler lets it back off, or skip repos and fall back to their last
+    known values. POST is retried too: this project only POSTs GraphQL
+    queries, which are reads.
+    """
+    from urllib3.util.retry import Retry
+
+    return Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                 allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+                 respect_retry_after_header=False, raise_on_status=False)
+
+
+def github_client(token: str, base_url: str, **options):
+    """Github client with api_retry() and no fixed request spacing (src.scheduler paces from the rate-limit headers).
+
+    GraphQL queries are POSTs, which PyGithub would otherwise space a full second apart as "writes".
+    """
+    from github import Auth, Github
+
+    return Github(auth=Auth.Token(token) if token else None, base_url=base_url, seconds_between_requests=None,
+                  seconds_between_writes=None, retry=api_retry(), **options)
+
+
+def _build_session(cache, pool_size: int, record: str = None, replay: str = None) -> requests.Session:
+    session = requests.Session()
+    # Disable the .netrc fallback, as PyGithub does for its own sessions
+    session.auth = Requester.noopAuth
+    cassette = HttpCache(replay or record, RECORDING_MAX_BYTES) if replay or record else None
+    for scheme in ("https://", "http://"):
+        options = dict(max_retries=api_retry(), pool_connections=pool_size, pool_maxsize=pool_size)
+        if replay:
+            adapter = ReplayAdapter(cassette)
+        elif record:
+            adapter = RecordingAdapter(cassette, **options)
+        elif cache is not None:
+            adapter = CachingAdapter(cache, **options)
+        else:
+            adapter = HTTPAdapter(**options)
+        session.mount(scheme, adapter)
+    return session
+
+
+class PooledHTTPSConnection(HTTPSRequestsConnectionClass):
+    """PyGithub connection that sends everything through the process-wide session."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session.close()
+        self.session = _session
+
+    def close(self):
+        pass  # The shared session outlives any single client
+
+
+class PooledHTTPConnection(HTTPRequestsConnectionClass):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session.close()
+        self.session = _session
+
+    def close(self):
+        pass
+
+
+def install(directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+            cache: bool = True, pool_size: int = 32, record: str = None, replay: str = None):
+    """Share one pooled session between every PyGithub client created from now on
+    and get_session(), optionally behind the disk cache. Returns the HttpCache or None.
+
+    ``record`` stores every response in that directory; ``replay`` serves every
+    request from such a recording and fails on anything that wasn't recorded.
+    Both bypass the conditional cache so recordings hold complete responses.
+    """
+    global _active_cache, _session
+    _active_cache = HttpCache(directory, max_bytes) if cache and not (record or replay) else None
+    _session = _build_session(_active_cache, pool_size, record, replay)
+    Requester.injectConnectionClasses(PooledHTTPConnection, PooledHTTPSConnection)
+    return _active_cache
+
+
+def uninstall():
+    global _active_cache, _session
+    _active_cache = None
+    _session = None
+    Requester.resetConnectionClasses()
+
+
+def active_cache():
+    return _active_cache
+
+
+def get_session() -> requests.Session:
+    """Shared session for non-PyGithub downloads such as the avatar."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
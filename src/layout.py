@@ -0,0 +1,142 @@
+"""Single-pass layout for the fetch card.
+
+``layout_card`` word-wraps and positions every piece of text once and returns
+a list of draw operations plus the content height. Canvas sizing and drawing
+both consume the same result, so they can't drift apart.
+"""
+from collections import namedtuple
+
+# role is "ascii" (the avatar block), "accent" (titles and labels) or "text" (values).
+# ASCII lines are emitted first, one per line_spacing, so they can be drawn as one block.
+DrawOp = namedtuple("DrawOp", "x y text role")
+Layout = namedtuple("Layout", "height ops")
+
+HEADER_SEPARATOR = "------------------------------"
+
+
+class TextMeasurer:
+    """Cached text widths for one font.
+
+    For a monospace font every width is ``advance * len(text)``, so nothing is
+    measured after the first glyph. Proportional fonts cache each string's
+    width; wrapped lines are measured as the sum of their words and spaces.
+    ``advance`` can be passed directly when no PIL font is involved.
+    """
+
+    def __init__(self, font=None, advance: float = None):
+        self.font = font
+        self.advance = advance
+        if advance is None and font is not None:
+            widths = {font.getlength(ch) for ch in "iW.@ "}
+            if len(widths) == 1:
+                self.advance = widths.pop()
+        self._cache = {}
+
+    def width(self, text: str) -> float:
+        if self.advance is not None:
+            return self.advance * len(text)
+        if text not in self._cache:
+            self._cache[text] = self.font.getlength(text)
+        return self._cache[text]
+
+    def extend(self, line_width: float, line_chars: int, word: str) -> float:
+        """Width of an existing line with ' ' + word appended, without re-measuring the line."""
+        if self.advance is not None:
+            return self.advance * (line_chars + (1 if line_chars else 0) + len(word))
+        return line_width + (self.width(" ") if line_chars else 0) + self.width(word)
+
+
+def _wrap(words: list, measurer: TextMeasurer, max_width: float) -> list:
+    """Greedy wrap, one measurement per word. A word wider than max_width on
+    an empty line is emitted on a line of its own, as (text, starts_new_line)."""
+    lines = []
+    line, line_width, line_chars = [], 0.0, 0
+    for word in words:
+        text_width = measurer.extend(line_width, line_chars, word)
+        if text_width <= max_width:
+            line.append(word)
+            line_width, line_chars = text_width, line_chars + (1 if line_chars else 0) + len(word)
+        elif line:
+            lines.append((" ".join(line), True))
+            line, line_width, line_chars = [word], measurer.width(word), len(word)
+        else:
+            lines.append((word, False))
+    if line:
+        lines.append((" ".join(line), True))
+    return lines
+
+
+def layout_card(config: dict, user_stats: dict, ascii_lines: list, measurer: TextMeasurer, *,
+                width: int, ascii_width: int, text_margin: int, line_spacing: int,
+                box_margin: int, content_padding: int, label_gap: int = 5, indent: int = 10) -> Layout:
+    ops = []
+
+    # ASCII art on the left
+    y_offset = box_margin + content_padding
+    x_ascii = box_margin + content_padding
+    for ascii_line in ascii_lines:
+        ops.append(DrawOp(x_ascii, y_offset, ascii_line, "ascii"))
+        y_offset += line_spacing
+    ascii_height = len(ascii_lines) * line_spacing
+
+    # User info on the right
+    y_offset = box_margin + content_padding
+    x_text = ascii_width + text_margin
+    max_text_width = width - ascii_width - (text_margin * 2)
+
+    ops.append(DrawOp(x_text, y_offset, f"{user_stats['username']}@github.com", "accent"))
+    y_offset += line_spacing
+    ops.append(DrawOp(x_text, y_offset, HEADER_SEPARATOR, "accent"))
+    y_offset += line_spacing
+
+    for stat in config['display_stats']:
+        if stat in user_stats and user_stats[stat] is not None:
+            title = f"{stat.replace('_', ' ').title()}:"
+            value = str(user_stats[stat]).replace("//", "\n -")
+
+            title_width = measurer.width(title)
+            ops.append(DrawOp(x_text, y_offset, title, "accent"))
+
+            x_value = x_text + title_width + label_gap
+            remaining_width = max_text_width - title_width - label_gap
+
+            if '\n' in value:  # Multi-line values like languages
+                value_lines = value.split('\n')
+                for i, line in enumerate(value_lines):
+                    if i == 0 and line.strip():  # First line goes next to title
+                        ops.append(DrawOp(x_value, y_offset, line.strip(), "text"))
+                        y_offset += line_spacing
+                    elif line.strip():  # Subsequent lines with small indent
+                        ops.append(DrawOp(x_text + indent, y_offset, line.strip(), "text"))
+                        y_offset += line_spacing
+                    elif i == 0:  # Empty first line, just move to next line
+                        y_offset += line_spacing
+            else:
+                words = value.split()
+                if not words:  # Empty value: keep the title on its own line
+                    y_offset += line_spacing
+                    continue
+                # Wrapped lines continue at a fixed indent under the first one
+                x_current = x_value
+                for text, starts_new_line in _wrap(words, measurer, remaining_width):
+                    ops.append(DrawOp(x_current, y_offset, text, "text"))
+                    y_offset += line_spacing
+                    if starts_new_line:
+                        x_current = x_text + text_margin
+
+    if config['additional_info']:
+        for line in config['additional_info'].split('\n'):
+            if line.strip():
+                # Split on first colon to separate label from value
+                if ':' in line:
+                    label, value = line.split(':', 1)
+                    label += ':'
+                    ops.append(DrawOp(x_text, y_offset, label, "accent"))
+                    ops.append(DrawOp(x_text + measurer.width(label) + label_gap, y_offset, value.strip(), "text"))
+                else:
+                    ops.append(DrawOp(x_text, y_offset, line.strip(), "accent"))
+                y_offset += line_spacing
+
+    # Max of ASCII height and text height, plus bottom padding
+    height = max(ascii_height, y_offset) + box_margin + content_padding
+    return Layout(height, ops)
@@ -0,0 +1,503 @@
+"""Local stand-in for the GitHub REST and GraphQL APIs.
+
+Serves a synthetic, deterministic dataset so the fetch code can be exercised
+without network access or a token:
+
+    with MockGitHub(n_repos=100) as api:
+        g = Github(base_url=api.base_url, auth=Auth.Token("octocat"))
+        stats = fetch_stats(g)
+
+Only the endpoints this project calls are implemented. The GraphQL endpoint
+parses the repository queries in ``src.fetch_info`` and ``src.org_stats`` and
+filters on their arguments (``privacy``, ``isFork``, ``ownerAffiliations``);
+any other query is answered with an error.
+
+``latency`` delays every response, ``rate_limit``/``reset_after`` emulate the
+primary quota (403 once exhausted) and ``throttle_every`` answers every Nth
+request with a secondary-limit 429 carrying ``Retry-After``. ``failures``
+maps request paths to the error status they always answer with. GET responses
+carry an ``ETag`` and honour ``If-None-Match`` with a 304 that, like GitHub's,
+doesn't count against the quota.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+LANGUAGES = ["Python", "JavaScript", "TypeScript", "C#", "Java", "Go", "Rust", "HTML", "CSS", "Shell"]
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def _iso(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def make_dataset(logins=("octocat",), n_repos: int = 10, seed: int = 0, orgs: dict = None) -> dict:
+    """Build {login: {"user": {...}, "repos": [...]}} with reproducible contents.
+
+    orgs maps organization logins to a repo count; every login is a member of
+    each organization and its repos' contributors are drawn from the members
+    plus a few outside collaborators.
+    """
+    rng = random.Random(seed)
+    dataset = {}
+    for login in logins:
+        repos = []
+        for i in range(n_repos):
+            owner_type = "Organization" if i % 10 == 9 else "User"
+            owner = f"{login}-org" if owner_type == "Organization" else login
+            pushed = EPOCH + timedelta(days=rng.randrange(1500))
+            empty = i % 17 == 16
+            repos.append({
+                "name": f"repo-{i}",
+                "full_name": f"{owner}/repo-{i}",
+                "owner": {"login": owner, "type": owner_type},
+                "fork": i % 7 == 6,
+                "private": False,
+                "visibility": "public",
+                "stargazers_count": rng.randrange(50),
+                "pushed_at": _iso(pushed),
+                "updated_at": _iso(pushed + timedelta(hours=rng.randrange(48))),
+                "languages": {} if empty else {
+                    lang: rng.randrange(1, 200_000) for lang in rng.sample(LANGUAGES, rng.randrange(1, 4))
+                },
+                "commits": None if empty else rng.randrange(1, 400),
+                "open_issues": 0 if empty else rng.randrange(10),
+                "open_prs": 0 if empty else rng.randrange(5),
+            })
+            repos[-1]["contributors"] = {} if empty else {owner: repos[-1]["commits"]}
+        dataset[login] = {
+            "user": {
+                "login": login,
+                "type": "User",
+                "followers": rng.randrange(100),
+                "following": rng.randrange(100),
+                "public_repos": n_repos,
+                "public_gists": rng.randrange(5),
+                "bio": f"Synthetic user {login}",
+                "location": None,
+                "company": None,
+                "email": None,
+                "blog": "",
+                "hireable": None,
+                "created_at": _iso(EPOCH),
+                "updated_at": _iso(EPOCH + timedelta(days=1000)),
+            },
+            "repos": repos,
+        }
+    for org, count in (orgs or {}).items():
+        dataset[org] = _make_org(org, list(logins), count, random.Random(f"{seed}/{org}"))
+    return dataset
+
+
+def _make_org(org: str, members: list, n_repos: int, rng: random.Random) -> dict:
+    outsiders = [f"{org}-outsider-{i}" for i in range(max(1, len(members) // 4))]
+    repos = []
+    for i in range(n_repos):
+        pushed = EPOCH + timedelta(days=rng.randrange(1500))
+        empty = i % 17 == 16
+        commits = None if empty else rng.randrange(1, 2000)
+        contributors = {}
+        if not empty:
+            authors = rng.sample(members, min(len(members), rng.randrange(1, 6))) + rng.sample(outsiders, rng.randrange(2))
+            for author in authors:
+                contributors[author] = rng.randrange(1, commits + 1)
+        repos.append({
+            "name": f"repo-{i}",
+            "full_name": f"{org}/repo-{i}",
+            "owner": {"login": org, "type": "Organization"},
+            "fork": i % 7 == 6,
+            # A member token lists private repos too; the org filters have to drop them
+            "private": i % 11 == 10,
+            "visibility": "private" if i % 11 == 10 else "public",
+            "stargazers_count": rng.randrange(500),
+            "pushed_at": _iso(pushed),
+            "updated_at": _iso(pushed + timedelta(hours=rng.randrange(48))),
+            "languages": {} if empty else {
+                lang: rng.randrange(1, 2_000_000) for lang in rng.sample(LANGUAGES, rng.randrange(1, 5))
+            },
+            "commits": commits,
+            "open_issues": 0 if empty else rng.randrange(40),
+            "open_prs": 0 if empty else rng.randrange(15),
+            "contributors": contributors,
+        })
+    return {
+        "user": {
+            "login": org,
+            "type": "Organization",
+            "name": org.title(),
+            "description": f"Synthetic organization {org}",
+            "followers": rng.randrange(1000),
+            "following": 0,
+            "public_repos": sum(1 for repo in repos if not repo["private"]),
+            "location": None,
+            "email": None,
+            "blog": "",
+            "created_at": _iso(EPOCH),
+            "updated_at": _iso(EPOCH + timedelta(days=1000)),
+        },
+        "repos": repos,
+        "members": members,
+    }
+
+
+# GET /orgs/<org>/repos?type= filters
+ORG_REPO_TYPES = {
+    "all": lambda repo: True,
+    "member": lambda repo: True,
+    "public": lambda repo: not repo["private"],
+    "private": lambda repo: repo["private"],
+    "forks": lambda repo: repo["fork"],
+    "sources": lambda repo: not repo["fork"],
+}
+
+
+# The repository connection's arguments this mock understands, and the affiliations it defaults to
+REPOSITORY_ARGUMENTS = ("first", "after", "privacy", "isFork", "ownerAffiliations")
+AFFILIATIONS = ("OWNER", "COLLABORATOR", "ORGANIZATION_MEMBER")
+_REPOSITORIES_QUERY = re.compile(
+    r"\s*query\s*(?:\([^)]*\))?\s*\{\s*(\w+)\s*(?:\(([^)]*)\))?\s*\{\s*repositories\s*\(([^)]*)\)", re.S)
+_ARGUMENT = re.compile(r"(\w+)\s*:\s*(\[[^\]]*\]|\$?\w+)")
+
+
+def _arguments(text: str, variables: dict) -> dict:
+    """GraphQL arguments as Python values: $variables resolved, enum lists as tuples, enums as strings."""
+    arguments = {}
+    for name, value in _ARGUMENT.findall(text or ""):
+        if value.startswith("$"):
+            arguments[name] = variables.get(value[1:])
+        elif value.startswith("["):
+            arguments[name] = tuple(re.findall(r"\w+", value))
+        elif value in ("true", "false"):
+            arguments[name] = value == "true"
+        else:
+            arguments[name] = value
+    return arguments
+
+
+def parse_repositories_query(query: str, variables: dict) -> tuple:
+    """(root, login, repositories arguments) of a viewer/user/organization repositories query.
+
+    Raises ValueError for anything else, so a query the mock doesn't understand
+    fails loudly instead of being answered as if it were another one.
+    """
+    match = _REPOSITORIES_QUERY.match(query)
+    if match is None:
+        raise ValueError("Only viewer, user and organization repositories queries are supported")
+    root = match.group(1)
+    root_arguments, arguments = _arguments(match.group(2), variables), _arguments(match.group(3), variables)
+    if root not in ("viewer", "user", "organization"):
+        raise ValueError(f"Unsupported root field '{root}'")
+    if (root == "viewer") == ("login" in root_arguments):
+        raise ValueError(f"'{root}' takes {'no arguments' if root == 'viewer' else 'a login'}")
+    unknown = sorted(arguments.keys() - set(REPOSITORY_ARGUMENTS))
+    if unknown:
+        raise ValueError(f"Unsupported repositories arguments: {', '.join(unknown)}")
+    if root == "organization" and "ownerAffiliations" in arguments:
+        raise ValueError("ownerAffiliations isn't supported on an organization's repositories")
+    return root, root_arguments.get("login"), arguments
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "MockGitHub/1.0"
+    protocol_version = "HTTP/1.1"
+    # Send headers and body in one segment; keep-alive plus delayed ACKs otherwise adds ~40ms per request
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    # -- plumbing ---------------------------------------------------------
+
+    @property
+    def api(self) -> "MockGitHub":
+        return self.server.api
+
+    def _send(self, status: int, body=None, headers: dict = None, content_type: str = "application/json; charset=utf-8"):
+        payload = b"" if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode())
+        headers = dict(headers or {})
+        if status == 200 and self.command == "GET":
+            etag = '"%s"' % hashlib.sha1(payload).hexdigest()
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                self.api.refund()
+                status, payload = 304, b""
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in self.api.rate_limit_headers().items():
+            self.send_header(key, value)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _login(self) -> str:
+        token = self.headers.get("Authorization", "").split(" ")[-1]
+        return token if token in self.api.dataset else next(iter(self.api.dataset))
+
+    def _paginate(self, items: list, total: int = None, make_item=None):
+        """Serve one page of a list, with GitHub-style Link headers."""
+        query = parse_qs(urlparse(self.path).query)
+        per_page = min(100, int(query.get("per_page", ["30"])[0]))  # GitHub's cap
+        page = int(query.get("page", ["1"])[0])
+        total = len(items) if total is None else total
+        start = (page - 1) * per_page
+        stop = min(start + per_page, total)
+        if make_item is None:
+            body = items[start:stop]
+        else:
+            body = [make_item(i) for i in range(start, stop)]
+        last = max(1, -(-total // per_page))
+        links = []
+        base = self.api.base_url + urlparse(self.path).path
+        for rel, number in (("next", page + 1), ("last", last)):
+            if page < last:
+                params = {k: v[0] for k, v in query.items()}
+                params.update(page=number, per_page=per_page)
+                links.append(f'<{base}?{urlencode(params)}>; rel="{rel}"')
+        self._send(200, body, {"Link": ", ".join(links)} if links else None)
+
+    # -- REST -------------------------------------------------------------
+
+    def do_GET(self):
+        error = self.api.admit("GET", self.path)
+        if error:
+            return self._send(*error)
+        path = urlparse(self.path).path.rstrip("/")
+        if path == "/user":
+            return self._send(200, self.api.user_json(self._login()))
+        match = re.fullmatch(r"/avatars/([^/]+)\.png", path)
+        if match and match.group(1) in self.api.dataset:
+            # Like avatars.githubusercontent.com, s= asks for a smaller square
+            size = parse_qs(urlparse(self.path).query).get("s", ["460"])[0]
+            avatar = self.api.avatar_png(match.group(1), min(460, max(1, int(size))))
+            return self._send(200, avatar, content_type="image/png")
+        if path == "/user/repos":
+            return self._paginate([self.api.repo_json(r) for r in self.api.dataset[self._login()]["repos"]])
+        match = re.fullmatch(r"/orgs/([^/]+)(?:/(repos|members))?", path)
+        if match and "members" in self.api.dataset.get(match.group(1), {}):
+            org = self.api.dataset[match.group(1)]
+            if match.group(2) is None:
+                return self._send(200, self.api.user_json(match.group(1)))
+            if match.group(2) == "members":
+                return self._paginate([{"login": login, "type": "User"} for login in org["members"]])
+            kind = parse_qs(urlparse(self.path).query).get("type", ["all"])[0]
+            if kind not in ORG_REPO_TYPES:
+                return self._send(422, {"message": "Validation Failed"})
+            repos = [r for r in org["repos"] if ORG_REPO_TYPES[kind](r)]
+            return self._paginate(repos, make_item=lambda i: self.api.repo_json(repos[i]))
+        match = re.fullmatch(r"/users/([^/]+)(/repos)?", path)
+        if match and match.group(1) in self.api.dataset:
+            login = match.group(1)
+            if match.group(2):
+                repos = [r for r in self.api.dataset[login]["repos"] if r["owner"]["login"] == login]
+                return self._paginate([self.api.repo_json(r) for r in repos])
+            return self._send(200, self.api.user_json(login))
+        match = re.fullmatch(r"/repos/([^/]+/[^/]+)(?:/(languages|commits|issues|pulls|contributors))?", path)
+        repo = match and self.api.find_repo(match.group(1))
+        if repo is None:
+            return self._send(404, {"message": "Not Found"})
+        endpoint = match.group(2)
+        if endpoint is None:
+            return self._send(200, self.api.repo_json(repo))
+        if endpoint == "languages":
+            return self._send(200, repo["languages"])
+        if endpoint == "contributors":
+            if repo["commits"] is None:
+                return self._send(204)  # GitHub's answer for an empty repository
+            ranked = sorted(repo["contributors"].items(), key=lambda item: (-item[1], item[0]))
+            return self._paginate([{"login": login, "type": "User", "contributions": n} for login, n in ranked])
+        if endpoint == "commits":
+            if repo["commits"] is None:
+                return self._send(409, {"message": "Git Repository is empty."})
+            return self._paginate([], repo["commits"], lambda i: {"sha": f"{i:040x}"})
+        if endpoint == "issues":
+            total = repo["open_issues"] + repo["open_prs"]
+            return self._paginate([], total, lambda i: {"number": i + 1, "title": f"Issue {i + 1}"})
+        return self._paginate([], repo["open_prs"], lambda i: {"number": i + 1, "title": f"PR {i + 1}"})
+
+    # -- GraphQL ----------------------------------------------------------
+
+    def do_POST(self):
+        error = self.api.admit("POST", self.path)
+        if error:
+            return self._send(*error)
+        if urlparse(self.path).path != "/graphql":
+            return self._send(404, {"message": "Not Found"})
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        variables = request.get("variables") or {}
+        try:
+            root, login, arguments = parse_repositories_query(request.get("query", ""), variables)
+        except ValueError as e:
+            return self._send(200, {"data": None, "errors": [{"type": "UNSUPPORTED", "message": str(e)}]})
+        if root == "organization":
+            org = self.api.dataset.get(login, {})
+            if "members" not in org:
+                return self._send(200, {"data": {"organization": None}, "errors": [
+                    {"type": "NOT_FOUND", "message": f"Could not resolve to an Organization with the login of "
+                                                     f"'{login}'."}
+                ]})
+            repos = org["repos"]
+        elif root == "viewer" or login in self.api.dataset:
+            login = self._login() if root == "viewer" else login
+            repos = self.api.dataset[login]["repos"]
+            # Without COLLABORATOR and ORGANIZATION_MEMBER, the repos of the user's organizations are left out
+            if set(arguments.get("ownerAffiliations", AFFILIATIONS)) == {"OWNER"}:
+                repos = [r for r in repos if r["owner"]["login"] == login]
+        else:
+            return self._send(200, {"data": {"user": None}, "errors": [
+                {"type": "NOT_FOUND", "message": f"Could not resolve to a User with the login of '{login}'."}
+            ]})
+        if arguments.get("privacy") == "PUBLIC":
+            repos = [r for r in repos if not r["private"]]
+        if "isFork" in arguments:
+            repos = [r for r in repos if r["fork"] == arguments["isFork"]]
+        first = min(int(arguments.get("first", 100)), 100)
+        start = int(arguments.get("after") or 0)
+        page = repos[start:start + first]
+        has_next = start + first < len(repos)
+        self._send(200, {"data": {root: {"repositories": {
+            "pageInfo": {"hasNextPage": has_next, "endCursor": str(start + first) if has_next else None},
+            "nodes": [self.api.repo_node(r) for r in page],
+        }}}})
+
+
+class MockGitHub:
+    """Threaded local server; use as a context manager or call start()/stop()."""
+
+    def __init__(self, dataset: dict = None, n_repos: int = 10, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, rate_limit: int = 5000, reset_after: float = 3600,
+                 throttle_every: int = 0, retry_after: int = 1, failures: dict = None):
+        self.dataset = dataset if dataset is not None else make_dataset(n_repos=n_repos)
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.reset_after = reset_after
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.failures = failures or {}
+        self.requests = []
+        self._avatars = {}
+        self._repo_index = {}
+        self.used = 0
+        self.reset_at = time.time() + reset_after
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.api = self
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockGitHub":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def admit(self, method: str, path: str):
+        """Record a request and return (status, body, headers) if it should be refused."""
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.requests.append((method, path))
+            if time.time() >= self.reset_at:
+                self.used = 0
+                self.reset_at = time.time() + self.reset_after
+            if self.throttle_every and len(self.requests) % self.throttle_every == 0:
+                return 429, {"message": "You have exceeded a secondary rate limit."}, {"Retry-After": str(self.retry_after)}
+            if path.split("?")[0] in self.failures:
+                return self.failures[path.split("?")[0]], {"message": "Injected failure"}, None
+            if self.used >= self.rate_limit:
+                return 403, {"message": "API rate limit exceeded for user."}, None
+            self.used += 1
+        return None
+
+    def refund(self):
+        """Give back the quota of a request answered with 304."""
+        with self._lock:
+            self.used = max(0, self.used - 1)
+
+    def avatar_png(self, login: str, size: int = 460) -> bytes:
+        if (login, size) not in self._avatars:
+            from io import BytesIO
+            from PIL import Image, ImageDraw
+
+            rng = random.Random(login)
+            image = Image.new("RGB", (460, 460), (255, 255, 255))
+            draw = ImageDraw.Draw(image)
+            for _ in range(12):
+                x, y, r = rng.randrange(460), rng.randrange(460), rng.randrange(20, 120)
+                draw.ellipse((x - r, y - r, x + r, y + r), fill=tuple(rng.randrange(256) for _ in range(3)))
+            if size != 460:
+                image = image.resize((size, size), Image.LANCZOS)
+            buffer = BytesIO()
+            image.save(buffer, "PNG")
+            self._avatars[login, size] = buffer.getvalue()
+        return self._avatars[login, size]
+
+    def rate_limit_headers(self) -> dict:
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(max(0, self.rate_limit - self.used)),
+            "X-RateLimit-Reset": str(int(self.reset_at)),
+        }
+
+    def find_repo(self, full_name: str):
+        # Indexed on first use (and again on a miss), so 5,000-repo orgs don't scan per request
+        if full_name not in self._repo_index:
+            self._repo_index = {repo["full_name"]: repo for entry in self.dataset.values() for repo in entry["repos"]}
+        return self._repo_index.get(full_name)
+
+    def user_json(self, login: str) -> dict:
+        user = dict(self.dataset[login]["user"])
+        kind = "orgs" if user["type"] == "Organization" else "users"
+        user["url"] = f"{self.base_url}/{kind}/{login}"
+        user["avatar_url"] = f"{self.base_url}/avatars/{login}.png"
+        return user
+
+    def repo_json(self, repo: dict) -> dict:
+        data = {k: v for k, v in repo.items()
+                if k not in ("languages", "commits", "open_issues", "open_prs", "contributors")}
+        data["url"] = f"{self.base_url}/repos/{repo['full_name']}"
+        data["open_issues_count"] = repo["open_issues"] + repo["open_prs"]
+        data["owner"] = dict(repo["owner"], url=f"{self.base_url}/users/{repo['owner']['login']}")
+        return data
+
+    def repo_node(self, repo: dict) -> dict:
+        return {
+            "nameWithOwner": repo["full_name"],
+            "isFork": repo["fork"],
+            "isPrivate": repo["private"],
+            "stargazerCount": repo["stargazers_count"],
+            "pushedAt": repo["pushed_at"],
+            "updatedAt": repo["updated_at"],
+            "owner": {"__typename": repo["owner"]["type"]},
+            "defaultBranchRef": None if repo["commits"] is None else {
+                "target": {"history": {"totalCount": repo["commits"]}}
+            },
+            "issues": {"totalCount": repo["open_issues"]},
+            "pullRequests": {"totalCount": repo["open_prs"]},
+            "languages": {"edges": [
+                {"size": size, "node": {"name": name}} for name, size in repo["languages"].items()
+            ]},
+        }
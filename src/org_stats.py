@@ -0,0 +1,235 @@
+"""Stats for a whole organization, aggregated in memory independent of its size.
+
+The repo listing is read one page at a time with ``PaginatedList.get_page``.
+Iterating a PaginatedList would keep every repo it has fetched. Filtering is
+done server-side: the REST listing asks for ``type=public`` and the GraphQL
+query for ``privacy: PUBLIC`` plus ``isFork: false`` unless forks are
+included. Each page's detail calls go through the FetchScheduler and are
+folded into an ``OrgTotals`` before the next page is requested, so only one
+page of repos is alive at a time.
+
+With ``members=True`` the member list is read the same way and every repo's
+contributors are credited to the members among them. That breakdown grows
+with the number of members, not repos.
+"""
+from __future__ import annotations
+
+import json
+import os
+from collections import Counter
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from src.config import CONFIG as config
+from src.fetch_info import (REPO_FIELDS, format_languages, graphql_nodes, node_values, repo_counters,
+                            repo_languages)
+from src.scheduler import SKIPPED, FetchScheduler, is_throttled
+
+if TYPE_CHECKING:
+    from github import Github
+
+# GitHub's largest page, for REST per_page and GraphQL first; create the client with Github(per_page=PAGE_SIZE)
+PAGE_SIZE = 100
+
+ORG_REPOS_QUERY = """
+query($org: String!, $first: Int!, $after: String) {
+  organization(login: $org) {
+    repositories(first: $first, after: $after, privacy: PUBLIC%(fork_filter)s) {
+      pageInfo { hasNextPage endCursor }
+      nodes {%(fields)s      }
+    }
+  }
+}
+"""
+
+
+def pages(listing, per_page: int):
+    """Pages of a PaginatedList via get_page(), so none are kept; a short page is the last one."""
+    number = 0
+    while True:
+        page = listing.get_page(number)
+        if page:
+            yield page
+        if len(page) < per_page:
+            return
+        number += 1
+
+
+def contributor_counts(repo, members: set, per_page: int) -> dict:
+    """{member login: contributions} for a repo, or {} if the call failed (empty repos answer 204)."""
+    counts = {}
+    try:
+        for page in pages(repo.get_contributors(), per_page):
+            counts.update((user.login, user.contributions) for user in page if user.login in members)
+    except Exception as e:
+        if is_throttled(e):
+            raise
+        return {}
+    return counts
+
+
+class OrgTotals:
+    """Running totals over an organization's repos, updated one repo at a time.
+
+    As in RepoSnapshot, forks count towards stars and bytes of code but not
+    languages or activity. Repos the quota didn't cover keep their listed
+    stars and are counted in ``skipped``.
+    """
+
+    def __init__(self, members: list = None):
+        self.repos = 0
+        self.forks = 0
+        self.skipped = 0
+        self.stars = 0
+        self.bytes_of_code = 0
+        self.languages = Counter()
+        self.commits = 0
+        self.issues = 0
+        self.prs = 0
+        self.members = None if members is None else {login: Counter() for login in members}
+
+    def add(self, fork: bool, stars: int, details):
+        """Fold in one repo; details is (languages, counters, contributors) or SKIPPED."""
+        self.repos += 1
+        self.stars += stars
+        if fork:
+            self.forks += 1
+        if details is SKIPPED:
+            self.skipped += 1
+            return
+        languages, counters, contributors = details
+        self.bytes_of_code += sum(languages.values())
+        if fork:
+            return
+        self.languages.update(languages)
+        if counters is not None:
+            commits, issues, prs = counters
+            self.commits += commits
+            self.issues += issues
+            self.prs += prs
+        if contributors is SKIPPED:
+            self.skipped += 1
+        elif self.members is not None:
+            for login, contributions in contributors.items():
+                member = self.members[login]
+                member["repos"] += 1
+                member["commits"] += contributions
+                member["stars"] += stars
+
+    def to_dict(self) -> dict:
+        totals = {
+            "repos": self.repos,
+            "forks": self.forks,
+            "skipped": self.skipped,
+            "total_stars": self.stars,
+            "bytes_of_code": self.bytes_of_code,
+            "languages": dict(self.languages.most_common()),
+            "total_commits": self.commits,
+            "total_issues": self.issues,
+            "total_prs": self.prs,
+        }
+        if self.members is not None:
+            ranked = sorted(self.members.items(), key=lambda item: (-item[1]["commits"], item[0]))
+            totals["members"] = {
+                login: {key: counts[key] for key in ("repos", "commits", "stars")} for login, counts in ranked
+            }
+        return totals
+
+
+def _rest_details(repo, members: set, per_page: int) -> tuple:
+    languages = repo_languages(repo)
+    if repo.fork:
+        return languages, None, None
+    contributors = contributor_counts(repo, members, per_page) if members is not None else None
+    return languages, repo_counters(repo), contributors
+
+
+def _rest_repos(g: Github, organization, scheduler: FetchScheduler, members: set, include_forks: bool):
+    """(fork, stars, details) per repo, one listing page in flight at a time."""
+    for page in pages(organization.get_repos(type="public"), g.per_page):
+        repos = [repo for repo in page if repo.visibility == "public" and (include_forks or not repo.fork)]
+        costs = [1 if repo.fork else 4 + (members is not None) for repo in repos]
+        budget = scheduler.preflight(costs)
+        results = scheduler.map(lambda repo: _rest_details(repo, members, g.per_page), repos[:budget])
+        for repo, details in zip(repos, results + [SKIPPED] * (len(repos) - budget)):
+            yield repo.fork, repo.stargazers_count, details
+
+
+def _graphql_repos(g: Github, organization, scheduler: FetchScheduler, members: set, include_forks: bool):
+    """(fork, stars, details) per repo from GraphQL pages; only contributors need REST calls."""
+    query = ORG_REPOS_QUERY % {"fork_filter": "" if include_forks else ", isFork: false", "fields": REPO_FIELDS}
+    page_size = min(g.per_page, PAGE_SIZE)
+    nodes = graphql_nodes(g, query, "organization", {"org": organization.login}, page_size)
+    while True:
+        page = [node_values(node) for node in islice(nodes, page_size)]
+        if not page:
+            return
+        page = [values for values in page if values[0].visibility == "public"]  # Double check visibility again!
+        contributors = [None] * len(page)
+        if members is not None:
+            sources = [i for i, (repo, _, _) in enumerate(page) if not repo.fork]
+            budget = scheduler.preflight([1] * len(sources))
+            results = scheduler.map(
+                lambda i: contributor_counts(g.get_repo(page[i][0].full_name, lazy=True), members, g.per_page),
+                sources[:budget],
+            )
+            for i, result in zip(sources, results + [SKIPPED] * (len(sources) - budget)):
+                contributors[i] = result
+        for (repo, languages, counters), contributed in zip(page, contributors):
+            yield repo.fork, repo.stargazers_count, (languages, counters, contributed)
+
+
+ORG_BACKENDS = {
+    "rest": _rest_repos,
+    "graphql": _graphql_repos,
+}
+
+
+def fetch_org_stats(g: Github, org: str, backend: str = None, members: bool = False,
+                    include_forks: bool = False, scheduler: FetchScheduler = None) -> dict:
+    """Totals over org's public repos, plus a per-member breakdown when members is True."""
+    backend = backend or config["backend"]
+    if backend not in ORG_BACKENDS:
+        raise ValueError(f"Unknown fetch backend '{backend}', expected one of {sorted(ORG_BACKENDS)}")
+    organization = g.get_organization(org)
+    scheduler = scheduler or FetchScheduler(g, config["max_workers"])
+    member_logins = None
+    if members:
+        member_logins = [user.login for page in pages(organization.get_members(), g.per_page) for user in page]
+    totals = OrgTotals(member_logins)
+    for fork, stars, details in ORG_BACKENDS[backend](g, organization, scheduler,
+                                                      None if member_logins is None else set(member_logins),
+                                                      include_forks):
+        totals.add(fork, stars, details)
+    if totals.skipped:
+        print(f"⚠️ Rate limit quota didn't cover {totals.skipped}/{totals.repos} repos, "
+              f"the details it missed are left out")
+
+    return {
+        "organization": organization.login,
+        "name": organization.name,
+        "description": organization.description,
+        "followers": organization.followers,
+        "public_repos": organization.public_repos,
+        "backend": backend,
+        **totals.to_dict(),
+    }
+
+
+def save_org_stats(stats: dict, path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def print_org_stats(stats: dict, top_members: int = 10):
+    print(f"🏢 {stats['organization']}: {stats['repos']} repos ({stats['forks']} forks), "
+          f"{stats['total_stars']} stars, {stats['bytes_of_code']} bytes of code")
+    print(f"   {stats['total_commits']} commits, {stats['total_issues']} issues, {stats['total_prs']} PRs")
+    print(f"   Languages:{format_languages(stats['languages'])}")
+    if "members" in stats:
+        print(f"   Top members of {len(stats['members'])}:")
+        for login, member in islice(stats["members"].items(), top_members):
+            print(f"   - {login}: {member['commits']} commits in {member['repos']} repos ({member['stars']} stars)")
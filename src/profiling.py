@@ -0,0 +1,228 @@
+"""Opt-in instrumentation for ``main.py --profile``.
+
+``instrument()`` wraps every function and method of the fetch and render
+modules (plus the ASCII and layout entry points) in a timer, and rebinds the
+names other ``src`` modules imported, so nothing in the pipeline has to call
+the profiler itself. Each call records wall time, the calling thread's CPU
+time and self time (wall minus instrumented children). ``watch_session()``
+adds a response hook that counts requests per endpoint and tracks the
+rate-limit headers to estimate the quota the run consumed.
+
+The JSON trace holds the aggregates plus a ``traceEvents`` list in Chrome
+trace format, so it opens directly in chrome://tracing or Perfetto.
+"""
+import functools
+import inspect
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+
+# module -> names to wrap, None for everything defined in the module
+INSTRUMENTED = {
+    "src.fetch_info": None,
+    "src.gen_readme": None,
+    "src.draw_ascii": ("generate_logo", "ascii_from_bytes", "image_to_ascii"),
+    "src.layout": ("layout_card",),
+}
+
+MAX_EVENTS = 100_000
+
+# Per-object path segments collapsed so requests group by endpoint
+_ENDPOINT_PATTERNS = [
+    (re.compile(r"^/repos/[^/]+/[^/]+"), "/repos/{owner}/{repo}"),
+    (re.compile(r"^/users/[^/]+"), "/users/{login}"),
+    (re.compile(r"^/avatars/.*"), "/avatars/{avatar}"),
+    (re.compile(r"^/u/\d+"), "/u/{id}"),
+]
+
+
+def endpoint(method: str, url: str) -> str:
+    from urllib.parse import urlsplit
+
+    path = urlsplit(url).path
+    # GitHub Enterprise serves the API under /api/v3
+    path = re.sub(r"^/api/v3(?=/)", "", path)
+    for pattern, replacement in _ENDPOINT_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return f"{method} {path}"
+
+
+class Profiler:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.phases = defaultdict(lambda: {"calls": 0, "wall": 0.0, "self": 0.0, "cpu": 0.0})
+        self.http = defaultdict(lambda: {"count": 0, "cached": 0, "errors": 0, "elapsed": 0.0})
+        self.quota = {}  # resource -> {"max": remaining, "min": remaining}
+        self.events = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def record(self, name: str, began: float, wall: float, cpu: float, children: float, calls: int = 1):
+        with self._lock:
+            phase = self.phases[name]
+            phase["calls"] += calls
+            phase["wall"] += wall
+            phase["self"] += wall - children
+            phase["cpu"] += cpu
+            if len(self.events) < MAX_EVENTS:
+                self.events.append({
+                    "name": name, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                    "ts": round((began - self.start) * 1e6), "dur": round(wall * 1e6),
+                    "args": {"cpu_us": round(cpu * 1e6)},
+                })
+
+    def phase(self, name: str, calls: int = 1):
+        return _Phase(self, name, calls)
+
+    def wrap(self, fn, name: str):
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def generator(*args, **kwargs):
+                # Time only the work done inside the generator, not the consumer's
+                gen = fn(*args, **kwargs)
+                calls = 1
+                while True:
+                    with self.phase(name, calls):
+                        try:
+                            item = next(gen)
+                        except StopIteration as stop:
+                            return stop.value
+                    calls = 0
+                    yield item
+            generator.__profiled__ = fn
+            return generator
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.phase(name):
+                return fn(*args, **kwargs)
+        wrapper.__profiled__ = fn
+        return wrapper
+
+    def on_response(self, response, *args, **kwargs):
+        """requests response hook."""
+        key = endpoint(response.request.method, response.url)
+        headers = response.headers
+        with self._lock:
+            entry = self.http[key]
+            entry["count"] += 1
+            entry["cached"] += response.status_code == 304 or getattr(response, "from_cache", False)
+            entry["errors"] += response.status_code >= 400
+            entry["elapsed"] += response.elapsed.total_seconds()
+            remaining = headers.get("X-RateLimit-Remaining")
+            if remaining is not None:
+                resource = headers.get("X-RateLimit-Resource", "core")
+                window = self.quota.setdefault(resource, {"max": int(remaining), "min": int(remaining)})
+                window["max"] = max(window["max"], int(remaining))
+                window["min"] = min(window["min"], int(remaining))
+        return response
+
+    def watch_session(self, session):
+        session.hooks["response"].append(self.on_response)
+
+    def quota_used(self) -> dict:
+        # The first counted request already spent one unit before its header was sent
+        return {resource: window["max"] - window["min"] + 1 for resource, window in self.quota.items()}
+
+    def summary(self) -> dict:
+        return {
+            "wall": time.perf_counter() - self.start,
+            "cpu": time.process_time() - self.cpu_start,
+            "phases": dict(self.phases),
+            "http": dict(self.http),
+            "quota_used": self.quota_used(),
+        }
+
+    def write_trace(self, path: str):
+        trace = dict(self.summary(), traceEvents=self.events, displayTimeUnit="ms")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f, indent=1)
+
+    def report(self, top: int = 25):
+        summary = self.summary()
+        print(f"\n⏱️ {summary['wall']:.2f}s wall, {summary['cpu']:.2f}s CPU")
+        print(f"{'phase':<48} {'calls':>6} {'wall':>9} {'self':>9} {'cpu':>9}")
+        ranked = sorted(summary["phases"].items(), key=lambda item: item[1]["wall"], reverse=True)
+        for name, phase in ranked[:top]:
+            print(f"{name:<48} {phase['calls']:>6} {phase['wall']:>8.3f}s {phase['self']:>8.3f}s {phase['cpu']:>8.3f}s")
+        if summary["http"]:
+            print(f"\n{'endpoint':<48} {'count':>6} {'cached':>6} {'errors':>6} {'elapsed':>9}")
+            for key, entry in sorted(summary["http"].items(), key=lambda item: item[1]["count"], reverse=True):
+                print(f"{key:<48} {entry['count']:>6} {entry['cached']:>6} {entry['errors']:>6} {entry['elapsed']:>8.3f}s")
+        for resource, used in summary["quota_used"].items():
+            print(f"Rate limit ({resource}): ~{used} used, {self.quota[resource]['min']} remaining")
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "calls", "began", "cpu")
+
+    def __init__(self, profiler: Profiler, name: str, calls: int):
+        self.profiler = profiler
+        self.name = name
+        self.calls = calls
+
+    def __enter__(self):
+        stack = self.profiler._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)  # Wall time of instrumented children
+        self.cpu = time.thread_time()
+        self.began = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.began
+        cpu = time.thread_time() - self.cpu
+        stack = self.profiler._local.stack
+        children = stack.pop()
+        if stack:
+            stack[-1] += wall
+        self.profiler.record(self.name, self.began, wall, cpu, children, self.calls)
+
+
+def _targets(module, names):
+    """(owner, attribute, function, qualified name) for everything to wrap in module."""
+    short = module.__name__.rsplit(".", 1)[-1]
+    for attr, value in list(vars(module).items()):
+        if names is not None and attr not in names:
+            continue
+        if inspect.isfunction(value) and value.__module__ == module.__name__:
+            yield module, attr, value, f"{short}.{attr}"
+        elif inspect.isclass(value) and value.__module__ == module.__name__ and names is None:
+            for method_name, method in list(vars(value).items()):
+                if method_name.startswith("__") and method_name != "__init__":
+                    continue
+                if isinstance(method, staticmethod):
+                    yield value, method_name, method, f"{short}.{value.__name__}.{method_name}"
+                elif inspect.isfunction(method):
+                    yield value, method_name, method, f"{short}.{value.__name__}.{method_name}"
+
+
+def instrument(profiler: Profiler, modules: dict = None):
+    """Wrap the configured modules' functions and rebind names imported elsewhere in src."""
+    import importlib
+
+    replaced = {}
+    for module_name, names in (modules or INSTRUMENTED).items():
+        module = importlib.import_module(module_name)
+        for owner, attr, fn, qualname in _targets(module, names):
+            if isinstance(fn, staticmethod):
+                if not hasattr(fn.__func__, "__profiled__"):
+                    setattr(owner, attr, staticmethod(profiler.wrap(fn.__func__, qualname)))
+            elif not hasattr(fn, "__profiled__"):
+                wrapped = profiler.wrap(fn, qualname)
+                setattr(owner, attr, wrapped)
+                if owner is module:
+                    replaced[id(fn)] = wrapped
+
+    # `from src.x import f` copied the original into the importer's namespace
+    for name, module in list(sys.modules.items()):
+        if module is None or not (name == "src" or name.startswith("src.") or name == "__main__"):
+            continue
+        for attr, value in list(vars(module).items()):
+            if id(value) in replaced and inspect.isfunction(value):
+                setattr(module, attr, replaced[id(value)])
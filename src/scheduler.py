@@ -0,0 +1,148 @@
+"""Bounded, rate-limit-aware thread pool for per-repo GitHub calls.
+
+The scheduler runs one callable per item on a small thread pool. Concurrency
+follows the ``X-RateLimit-Remaining`` quota PyGithub tracks from response
+headers, and throttling responses (primary limit, secondary limit,
+``Retry-After``) pause every worker and retry the item rather than failing
+the run. When the quota can't be recovered within ``max_wait`` seconds the
+remaining items are returned as ``SKIPPED`` so the caller can fall back to
+last known values; so is an item still throttled after ``max_retries``.
+"""
+import threading
+import time
+
+# Marker for items that were not fetched because the quota ran out
+SKIPPED = object()
+
+
+def is_throttled(exc: Exception) -> bool:
+    """True for GitHub responses that mean "slow down" rather than "failed"."""
+    from github import GithubException, RateLimitExceededException
+
+    if isinstance(exc, RateLimitExceededException):
+        return True
+    if isinstance(exc, GithubException):
+        headers = exc.headers or {}
+        return exc.status == 429 or (exc.status == 403 and "retry-after" in {k.lower() for k in headers})
+    return False
+
+
+def _header(headers: dict, name: str):
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+class FetchScheduler:
+    def __init__(self, g, max_workers: int = 8, max_wait: float = 300, reserve: int = 50, max_retries: int = 5):
+        self.g = g
+        self.max_workers = max(1, max_workers)
+        self.max_wait = max_wait
+        self.reserve = reserve
+        self.max_retries = max_retries
+        self.stats = {"calls": 0, "throttled": 0, "skipped": 0}
+        self._ceiling = self.max_workers
+        self._limit = self.max_workers
+        self._active = 0
+        self._paused_until = 0.0
+        self._aborted = False
+        self._cond = threading.Condition()
+
+    def quota(self) -> tuple:
+        """(remaining, reset_epoch) as last reported by the API."""
+        remaining, _ = self.g.rate_limiting
+        return remaining, self.g.rate_limiting_resettime
+
+    def preflight(self, costs: list) -> int:
+        """How many leading items fit in the current quota, given each item's call cost."""
+        remaining, _ = self.quota()
+        budget = remaining - self.reserve
+        fits = 0
+        for cost in costs:
+            if budget < cost:
+                break
+            budget -= cost
+            fits += 1
+        return fits
+
+    def map(self, fn, items: list) -> list:
+        """Run fn over items concurrently, preserving order. Unfetched items are SKIPPED."""
+        if not items:
+            return []
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(lambda item: self._run(fn, item), items))
+        self.stats["skipped"] += sum(1 for result in results if result is SKIPPED)
+        return results
+
+    def _run(self, fn, item):
+        attempt = 0
+        while True:
+            if not self._acquire():
+                return SKIPPED
+            try:
+                result = fn(item)
+            except Exception as e:
+                self._release()
+                if not is_throttled(e):
+                    raise
+                if attempt >= self.max_retries:
+                    return SKIPPED
+                attempt += 1
+                self._throttle(e, attempt)
+                continue
+            self._release()
+            self._adapt()
+            return result
+
+    def _acquire(self) -> bool:
+        with self._cond:
+            while True:
+                if self._aborted:
+                    return False
+                delay = self._paused_until - time.time()
+                if delay > 0:
+                    self._cond.wait(delay)
+                elif self._active >= self._limit:
+                    self._cond.wait()
+                else:
+                    self._active += 1
+                    self.stats["calls"] += 1
+                    return True
+
+    def _release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def _adapt(self):
+        """Scale concurrency with the remaining quota: full speed when plenty is left, serial near the floor."""
+        remaining, _ = self.g.rate_limiting
+        with self._cond:
+            self._limit = max(1, min(self._ceiling, (remaining - self.reserve) // 100))
+            self._cond.notify_all()
+
+    def _throttle(self, exc: Exception, attempt: int):
+        """Pause all workers for as long as the response asks; give up past max_wait."""
+        headers = exc.headers or {}
+        retry_after = _header(headers, "retry-after")
+        reset = _header(headers, "x-ratelimit-reset")
+        if retry_after is not None:
+            delay = float(retry_after)
+        elif _header(headers, "x-ratelimit-remaining") == "0" and reset is not None:
+            delay = float(reset) - time.time() + 1
+        else:
+            delay = min(2 ** attempt, 60)
+        with self._cond:
+            self.stats["throttled"] += 1
+            # Secondary limits are about concurrency, so halve the ceiling for the rest of the run
+            self._ceiling = max(1, self._ceiling // 2)
+            self._limit = min(self._limit, self._ceiling)
+            if delay > self.max_wait:
+                print(f"⚠️ Rate limit resets in {int(delay)}s, using last known values for the remaining repos")
+                self._aborted = True
+            else:
+                self._paused_until = max(self._paused_until, time.time() + delay)
+            self._cond.notify_all()
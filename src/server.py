@@ -0,0 +1,387 @@
+"""Serve fetch cards over HTTP from a long-running process.
+
+    GET  /<login>/fetch.png           the card (fetch.svg for the SVG card)
+    GET  /<login>/fetch-<variant>.png one of config.json's "variants", also as .svg
+    GET  /<login>/fetch.txt           the plain-text card (fetch.ansi for colour)
+    GET  /<login>/stats.json          the fetched stats
+    GET  /healthz                     cache statistics
+    POST /webhook                     GitHub push webhook, drops the pushed repo owner's entries
+
+Each user's fetch (avatar ASCII, stats and language totals, as in
+``src.snapshot``) and each rendered format sit in a ``MemoryCache``. It is an
+LRU bounded by bytes, and its entries expire after ``ttl`` seconds.
+Concurrent requests for an entry that isn't cached wait for one shared fetch
+or render instead of starting their own. Expired users are refetched with
+their incremental state under ``state_dir`` and through the shared HTTP
+cache, so a refresh only costs the repos that changed.
+
+Every fetch spends the operator's token, so only the configured ``logins``
+are served. Without a list, any login is, up to ``max_logins`` distinct ones;
+past either limit the answer is a 403 and nothing is fetched or written
+under ``state_dir``. The webhook needs a ``webhook_secret`` and deliveries
+must carry a matching ``X-Hub-Signature-256``; without a secret it answers
+403.
+"""
+import hashlib
+import hmac
+import json
+import os
+import re
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from src.config import CONFIG
+
+DEFAULT_API_URL = "https://api.github.com"
+DEFAULT_TTL = 600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_STATE_DIR = "out/server"
+DEFAULT_MAX_LOGINS = 100
+
+# GitHub logins: alphanumerics and single hyphens, at most 39 characters
+LOGIN_PATTERN = r"[A-Za-z0-9](?:[A-Za-z0-9-]{0,37}[A-Za-z0-9])?"
+_CARD_PATH = re.compile(rf"/({LOGIN_PATTERN})/(?:fetch(?:-([A-Za-z0-9_-]+))?\.(png|svg|txt|ansi)|(stats)\.json)")
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "txt": "text/plain; charset=utf-8",
+    "ansi": "text/plain; charset=utf-8",
+    "json": "application/json; charset=utf-8",
+}
+
+
+class LoginRefused(Exception):
+    """The login isn't one this server fetches for."""
+
+
+class MemoryCache:
+    """Thread-safe LRU of byte-sized values with a TTL and per-key request coalescing."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl: float = DEFAULT_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0, "expired": 0, "invalidations": 0}
+        self._entries = OrderedDict()  # key -> (value, size, expires)
+        self._pending = {}  # key -> Future of the computation in flight
+        self._generations = {}  # key[0] -> bumped by invalidate()
+        self._lock = threading.Lock()
+
+    def get(self, key, compute, size_of=len, expires=None):
+        """The cached value for key, or compute() run once however many threads ask at the same time.
+
+        expires() gives the new entry's deadline (time.monotonic()) instead of now + ttl.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[2] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry[0]
+                self._remove(key)
+                self.stats["expired"] += 1
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = Future()
+                generation = self._generations.get(key[0], 0)
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+        if not owner:
+            return pending.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            pending.set_exception(e)
+            raise
+        deadline = expires() if expires else time.monotonic() + self.ttl
+        size = size_of(value)
+        with self._lock:
+            del self._pending[key]
+            # An invalidation while this was computing means value may already be stale
+            if self._generations.get(key[0], 0) == generation:
+                self._store(key, value, size, deadline)
+        pending.set_result(value)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def deadline(self, key) -> float:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[2] if entry else 0.0
+
+    def invalidate(self, prefix) -> int:
+        """Drop every entry whose key's first element is prefix; returns how many there were."""
+        with self._lock:
+            self._generations[prefix] = self._generations.get(prefix, 0) + 1
+            keys = [key for key in self._entries if key[0] == prefix]
+            for key in keys:
+                self._remove(key)
+            self.stats["invalidations"] += 1
+            return len(keys)
+
+    def _store(self, key, value, size: int, deadline: float):
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes or deadline <= time.monotonic():
+            return
+        self._entries[key] = (value, size, deadline)
+        self.size += size
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.size -= size
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "FetchCard/1.0"
+    protocol_version = "HTTP/1.1"
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.cards.verbose:
+            super().log_message(format, *args)
+
+    def log_error(self, format, *args):
+        super().log_message(format, *args)
+
+    @property
+    def cards(self) -> "CardServer":
+        return self.server.cards
+
+    def _send(self, status: int, body=b"", content_type: str = CONTENT_TYPES["json"], headers: dict = None):
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def do_GET(self):
+        from github import GithubException, UnknownObjectException
+
+        path = urlparse(self.path).path
+        if path == "/healthz":
+            return self._send(200, self.cards.health())
+        match = _CARD_PATH.fullmatch(path)
+        if match is None:
+            return self._send(404, {"message": "Not Found"})
+        login, variant, fmt = match.group(1), match.group(2), match.group(3) or "json"
+        if variant is not None and (fmt not in ("png", "svg") or variant not in self.cards.variants()):
+            return self._send(404, {"message": f"Unknown variant '{variant}'"})
+        try:
+            body = self.cards.render(login, fmt, variant)
+        except LoginRefused:
+            return self._send(403, {"message": f"'{login}' isn't served here"})
+        except UnknownObjectException:
+            return self._send(404, {"message": f"Unknown user '{login}'"})
+        except GithubException as e:
+            return self._send(502, {"message": f"GitHub API error: {e.status}"})
+        except Exception:
+            # The details stay in the log: they can carry paths, tokens in URLs or API responses
+            self.log_error("Rendering %s failed\n%s", path, traceback.format_exc())
+            return self._send(500, {"message": "Internal Server Error"})
+
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={int(self.cards.expires_in(login))}",
+        }
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", "0")
+            return self.end_headers()
+        self._send(200, body, CONTENT_TYPES[fmt], headers)
+
+    do_HEAD = do_GET
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/webhook":
+            return self._send(404, {"message": "Not Found"})
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self.cards.webhook_secret:
+            return self._send(403, {"message": "Webhook disabled, no secret configured"})
+        if not self.cards.verify_signature(body, self.headers.get("X-Hub-Signature-256")):
+            return self._send(401, {"message": "Bad signature"})
+        event = self.headers.get("X-GitHub-Event", "push")
+        if event == "ping":
+            return self._send(200, {"message": "pong"})
+        try:
+            login = json.loads(body)["repository"]["owner"]["login"]
+        except (ValueError, KeyError, TypeError):
+            return self._send(400, {"message": "Expected a push payload with repository.owner.login"})
+        self._send(200, {"invalidated": login, "entries": self.cards.invalidate(login)})
+
+
+class CardServer:
+    """Threaded card server; use as a context manager, call start()/stop(), or serve_forever()."""
+
+    def __init__(self, token: str, api_url: str = DEFAULT_API_URL, host: str = "127.0.0.1", port: int = 8080,
+                 ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES, state_dir: str = DEFAULT_STATE_DIR,
+                 webhook_secret: str = None, logins: list = None, max_logins: int = DEFAULT_MAX_LOGINS,
+                 verbose: bool = False):
+        self.token = token
+        self.api_url = api_url
+        self.state_dir = state_dir
+        self.webhook_secret = webhook_secret
+        self.verbose = verbose
+        self.logins = None if logins is None else {login.lower() for login in logins}
+        self.max_logins = max_logins
+        self.cache = MemoryCache(max_bytes, ttl)
+        self.fetches = 0
+        self._fetched = set()  # Lowercased logins fetched so far, counted against max_logins
+        self._lock = threading.Lock()
+        self._fonts = {}  # scale -> (font, lock); a FreeType face is loaded once and used by one thread at a time
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.cards = self
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "CardServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def snapshot(self, login: str) -> dict:
+        def fetch():
+            from src.http_cache import github_client
+            from src.snapshot import take_snapshot
+
+            admitted = self._admit(login)
+            with self._lock:
+                self.fetches += 1
+            g = github_client(self.token, self.api_url)
+            try:
+                return take_snapshot(g, login=login,
+                                     state_path=os.path.join(self.state_dir, login.lower(), "stats_state.json"))
+            except BaseException:
+                # Unknown users and failed fetches don't use up a slot
+                if admitted:
+                    with self._lock:
+                        self._fetched.discard(login.lower())
+                raise
+
+        return self.cache.get((login.lower(), "snapshot"), fetch,
+                              size_of=lambda snapshot: len(json.dumps(snapshot, default=str)))
+
+    def _admit(self, login: str) -> bool:
+        """Raise LoginRefused unless login is configured or there is room under max_logins; True if newly counted."""
+        key = login.lower()
+        if self.logins is not None:
+            if key not in self.logins:
+                raise LoginRefused(login)
+            return False
+        with self._lock:
+            if key in self._fetched:
+                return False
+            if len(self._fetched) >= self.max_logins:
+                raise LoginRefused(login)
+            self._fetched.add(key)
+            return True
+
+    def variants(self) -> dict:
+        return {entry["name"]: entry for entry in CONFIG["variants"]}
+
+    def render(self, login: str, fmt: str, variant: str = None) -> bytes:
+        """The body for fetch.<fmt> (fetch-<variant>.<fmt>), or stats.json for fmt "json"."""
+        config = CONFIG.data()
+
+        def render():
+            from src.snapshot import snapshot_stats
+
+            snapshot = self.snapshot(login)
+            stats = snapshot_stats(snapshot)
+            if fmt == "json":
+                return json.dumps(stats, indent=1, default=str).encode()
+            entry = self.variants()[variant] if variant else None
+            if fmt == "svg":
+                from src.svg_card import render_svg
+
+                if entry is None:
+                    return render_svg(config, stats, snapshot["ascii"]).encode()
+                return render_svg(config, stats, snapshot["ascii"], entry["scale"], entry["background"],
+                                  entry["preferred_color"]).encode()
+            if fmt != "png":
+                from src.gen_readme import fetch_lines
+
+                lines = fetch_lines(config, stats, snapshot["ascii"], color=fmt == "ansi")
+                return "".join(line + "\n" for line in lines).encode()
+            from src.gen_readme import card_image, encode_png
+
+            font, lock = self._font(entry["scale"] if entry else 1)
+            with lock:
+                image = card_image(config, stats, snapshot["ascii"], entry, font)
+            return encode_png(image)
+
+        # Rendered formats go stale with the fetch they were drawn from
+        return self.cache.get((login.lower(), fmt, variant), render,
+                              expires=lambda: self.cache.deadline((login.lower(), "snapshot")))
+
+    def _font(self, scale: float) -> tuple:
+        """(font, lock) for a scale, shared by every request thread; hold the lock while drawing with it."""
+        from src.gen_readme import FONT_SIZE, _scaled, load_font
+
+        with self._lock:
+            if scale not in self._fonts:
+                font, _ = load_font(_scaled(FONT_SIZE, scale))
+                if font is None:
+                    raise RuntimeError("No suitable fonts found")
+                self._fonts[scale] = (font, threading.Lock())
+            return self._fonts[scale]
+
+    def expires_in(self, login: str) -> float:
+        return max(0.0, self.cache.deadline((login.lower(), "snapshot")) - time.monotonic())
+
+    def invalidate(self, login: str) -> int:
+        return self.cache.invalidate(login.lower())
+
+    def verify_signature(self, body: bytes, signature: str) -> bool:
+        if not self.webhook_secret:
+            return False
+        expected = "sha256=" + hmac.new(self.webhook_secret.encode(), body, hashlib.sha256).hexdigest()
+        return signature is not None and hmac.compare_digest(expected, signature)
+
+    def health(self) -> dict:
+        return dict(self.cache.stats, entries=len(self.cache), bytes=self.cache.size,
+                    max_bytes=self.cache.max_bytes, fetches=self.fetches,
+                    logins=len(self.logins if self.logins is not None else self._fetched))
@@ -0,0 +1,90 @@
+"""Fetch results saved to disk, so rendering doesn't need GitHub.
+
+A snapshot is everything the card is drawn from:
+
+    {"version": 1, "fetched_at": "2024-06-01T12:00:00Z", "login": "octocat" | null,
+     "stats": {...fetch_stats() output...},
+     "languages": {"Python": 123456, ...},
+     "ascii": "..."}
+
+``languages`` holds the raw byte totals; the ``stats["languages"]`` text is
+rebuilt from them at render time, so ``max_languages`` changes don't need a
+new fetch. Snapshots from another ``SNAPSHOT_VERSION`` are rejected.
+"""
+import json
+import os
+from datetime import datetime, timezone
+
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT_PATH = "out/snapshot.json"
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def take_snapshot(g, login: str = None, backend: str = None, state_path: str = None) -> dict:
+    from src.draw_ascii import generate_logo
+    from src.fetch_info import collect_stats
+    from src.task_graph import TaskGraph
+
+    # The avatar and the stats are independent, so fetch them side by side
+    graph = TaskGraph()
+    graph.add("logo", lambda: generate_logo(g, login=login))
+    graph.add("stats", lambda: collect_stats(g, backend, login, state_path))
+    results = graph.run()
+    ascii_art, (stats, languages) = results["logo"], results["stats"]
+    return {
+        "version": SNAPSHOT_VERSION,
+        "fetched_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "login": login,
+        "stats": stats,
+        "languages": languages,
+        "ascii": ascii_art,
+    }
+
+
+def save_snapshot(snapshot: dict, path: str = DEFAULT_SNAPSHOT_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str = DEFAULT_SNAPSHOT_PATH) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        raise SnapshotError(f"{path}: no snapshot, run the fetch stage first") from None
+    except json.JSONDecodeError as e:
+        raise SnapshotError(f"{path}: not a valid snapshot ({e})") from None
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise SnapshotError(f"{path}: snapshot version {snapshot.get('version')} "
+                            f"(expected {SNAPSHOT_VERSION}), run the fetch stage again")
+    return snapshot
+
+
+def snapshot_stats(snapshot: dict) -> dict:
+    """The snapshot's stats with the language list formatted for the current config."""
+    from src.fetch_info import format_languages
+
+    return dict(snapshot["stats"], languages=format_languages(snapshot["languages"]))
+
+
+def render_snapshot(snapshot: dict, config, output_path: str = "out/fetch.png") -> bool:
+    """Draw the card and its variants from a snapshot alone; returns False when the card was already up to date.
+
+    An output_path ending in .svg writes SVG instead of PNG.
+    """
+    from src.gen_readme import write_card, write_variants
+
+    stats = snapshot_stats(snapshot)
+    if output_path.endswith(".svg"):
+        from src.svg_card import write_svg
+
+        return write_svg(config, stats, snapshot["ascii"], output_path)
+    changed = write_card(config, stats, snapshot["ascii"], output_path)
+    write_variants(config, stats, snapshot["ascii"], os.path.dirname(output_path) or ".")
+    return changed
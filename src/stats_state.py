@@ -0,0 +1,37 @@
+"""Persisted per-repo values from the last successful fetch.
+
+Stored as JSON so it can be committed next to ``out/fetch.png``:
+
+    {"version": 1, "repos": {"owner/name": {
+        "languages": {...},
+        "counters": [commits, issues, prs] | null,
+        "stamp": [pushed_at, updated_at, open_issues_count] | null,
+    }}}
+
+``stamp`` records the repo listing fields the values were computed at, so a
+run only refetches repos whose stamp moved (see ``fetch_info.repo_stamp``).
+"""
+import json
+import os
+
+STATE_VERSION = 1
+DEFAULT_STATE_PATH = "out/stats_state.json"
+
+
+def load_state(path: str = DEFAULT_STATE_PATH) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"version": STATE_VERSION, "repos": {}}
+    if state.get("version") != STATE_VERSION:
+        return {"version": STATE_VERSION, "repos": {}}
+    return state
+
+
+def save_state(state: dict, path: str = DEFAULT_STATE_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
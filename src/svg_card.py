@@ -0,0 +1,89 @@
+"""SVG output for the fetch card, written without PIL.
+
+The card is monospace text on a box, so instead of rasterizing it this module
+emits one ``<text>`` element per layout line. It uses the same
+``layout_card`` operations, geometry, themes and colours as the PNG
+renderer. Text is measured from DejaVu Sans Mono's advance rather than from
+a loaded font. Every line carries a ``textLength``, so columns stay aligned
+when a viewer substitutes another monospace font.
+"""
+import os
+from xml.sax.saxutils import escape
+
+from src.gen_readme import (BOX_MARGIN, CARD_WIDTH, FONT_SIZE, MIN_HEIGHT, RENDER_CONFIG_KEYS, THEMES, _scaled,
+                            layout_for, return_preffered_color, write_if_changed)
+from src.layout import TextMeasurer
+
+# DejaVu Sans Mono metrics in em: advance 1233/2048, ascender 1901/2048.
+# PIL draws from the ascender line, SVG from the baseline.
+ADVANCE = 0.602
+ASCENT = 0.928
+FONT_FAMILY = "'DejaVu Sans Mono', 'Ubuntu Mono', 'Liberation Mono', Consolas, monospace"
+
+
+def _number(value: float, digits: int = 2) -> str:
+    return f"{value:.{digits}f}".rstrip("0").rstrip(".")
+
+
+def _paint(attribute: str, rgba: tuple) -> str:
+    """fill="#rrggbb" (or stroke=...) plus the matching opacity attribute when not opaque."""
+    paint = f'{attribute}="#%02x%02x%02x"' % rgba[:3]
+    if rgba[3] != 255:
+        paint += f' {attribute}-opacity="{_number(rgba[3] / 255, 3)}"'
+    return paint
+
+
+def render_svg(config, user_stats: dict, ascii_art: str, scale: float = 1, background: str = "dark",
+               preferred_color: str = None) -> str:
+    font_size = _scaled(FONT_SIZE, scale)
+    advance = ADVANCE * font_size
+    layout = layout_for(config, user_stats, ascii_art, TextMeasurer(advance=advance), font_size, scale)
+    width = _scaled(CARD_WIDTH, scale)
+    height = max(_scaled(MIN_HEIGHT, scale), layout.height + _scaled(20, scale))
+    box_margin = _scaled(BOX_MARGIN, scale)
+    stroke = _scaled(3, scale)
+    theme = THEMES[background]
+    accent = return_preffered_color(preferred_color or config["preferred_color"])
+    ascent = ASCENT * font_size
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">',
+        # PIL draws the outline inside the rectangle; an SVG stroke is centred on it
+        f'<rect x="{_number(box_margin + stroke / 2)}" y="{_number(box_margin + stroke / 2)}" '
+        f'width="{_number(width - 2 * box_margin - stroke)}" height="{_number(height - 2 * box_margin - stroke)}" '
+        f'{_paint("fill", theme["box"])} {_paint("stroke", accent)} stroke-width="{stroke}"/>',
+        # The ASCII art's leading and repeated spaces are significant
+        f'<g font-family="{FONT_FAMILY}" font-size="{font_size}" xml:space="preserve" style="white-space:pre">',
+    ]
+    groups = {
+        "accent": f'<g {_paint("fill", accent)}>',
+        "text": f'<g {_paint("fill", theme["text"])}>',
+    }
+    lines = {role: [] for role in groups}
+    for op in layout.ops:
+        if not op.text.strip():
+            continue
+        role = "accent" if op.role == "ascii" else op.role
+        # textLength pins each line to the layout's advance, whatever font the viewer falls back to
+        lines[role].append(f'<text x="{_number(op.x)}" y="{_number(op.y + ascent)}" '
+                           f'textLength="{_number(advance * len(op.text))}">{escape(op.text)}</text>')
+    for role, group in groups.items():
+        if lines[role]:
+            parts.append(group)
+            parts.extend(lines[role])
+            parts.append("</g>")
+    parts.append("</g>")
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
+
+
+def write_svg(config, user_stats: dict, ascii_art: str, output_path: str = "out/fetch.svg") -> bool:
+    """Write the card and every config["variants"] entry (fetch-<name>.svg beside it); returns whether the card changed."""
+    card_config = {key: config[key] for key in RENDER_CONFIG_KEYS}
+    changed = write_if_changed(output_path, render_svg(card_config, user_stats, ascii_art).encode())
+    out_dir = os.path.dirname(output_path) or "."
+    for variant in config["variants"]:
+        svg = render_svg(card_config, user_stats, ascii_art, variant["scale"], variant["background"],
+                         variant["preferred_color"])
+        write_if_changed(os.path.join(out_dir, f"fetch-{variant['name']}.svg"), svg.encode())
+    return changed
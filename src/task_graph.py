@@ -0,0 +1,97 @@
+"""Run a small graph of dependent tasks on a thread pool.
+
+Each task names the tasks whose results it takes as arguments and starts as
+soon as those have finished, so independent chains (the avatar download and
+ASCII conversion, the stats fetch, font loading) overlap and a run takes
+about as long as its longest chain instead of the sum of every phase.
+
+Dependencies have to be added before the tasks that use them, which keeps
+the graph acyclic by construction. Once a task raises, no further task is
+started, whether it depends on the failed one or not: ``run()`` has no
+results to return anyway. The tasks already running are allowed to finish,
+and the first exception is re-raised from ``run()``.
+
+``timings`` holds each task's start and end (seconds since ``run()`` began)
+and the thread that ran it, for ``report()`` or the caller's own logging.
+"""
+import threading
+import time
+from collections import namedtuple
+
+Task = namedtuple("Task", "name fn deps")
+
+
+class TaskGraph:
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers
+        self.tasks = {}
+        self.timings = {}
+        self.wall = None
+
+    def add(self, name: str, fn, *deps: str) -> str:
+        """Add fn(*results of deps) as task name; returns name so it can be passed as a dependency."""
+        if name in self.tasks:
+            raise ValueError(f"duplicate task '{name}'")
+        for dep in deps:
+            if dep not in self.tasks:
+                raise ValueError(f"task '{name}' depends on '{dep}', which hasn't been added")
+        self.tasks[name] = Task(name, fn, deps)
+        return name
+
+    def run(self) -> dict:
+        """Run every task; returns {name: result}."""
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        results, waiting, running, error = {}, dict(self.tasks), {}, None
+        start = time.perf_counter()
+
+        def call(task, args):
+            began = time.perf_counter()
+            try:
+                return task.fn(*args)
+            finally:
+                end = time.perf_counter()
+                self.timings[task.name] = {
+                    "start": began - start, "end": end - start, "wall": end - began,
+                    "thread": threading.current_thread().name,
+                }
+
+        workers = self.max_workers or max(1, len(self.tasks))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="task") as pool:
+            while True:
+                if error is None:
+                    for name, task in list(waiting.items()):
+                        if all(dep in results for dep in task.deps):
+                            del waiting[name]
+                            running[pool.submit(call, task, [results[dep] for dep in task.deps])] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except BaseException as e:
+                        error = error or e
+        self.wall = time.perf_counter() - start
+        if error is not None:
+            raise error
+        return results
+
+    def critical_path(self) -> list:
+        """The chain of tasks that determined the run's wall time, first to last."""
+        path, name = [], max(self.timings, key=lambda name: self.timings[name]["end"], default=None)
+        while name is not None:
+            path.append(name)
+            deps = [dep for dep in self.tasks[name].deps if dep in self.timings]
+            name = max(deps, key=lambda dep: self.timings[dep]["end"], default=None)
+        return path[::-1]
+
+    def report(self):
+        critical = set(self.critical_path())
+        print(f"{'task':<24} {'start':>8} {'wall':>8}  thread")
+        for name, timing in sorted(self.timings.items(), key=lambda item: item[1]["start"]):
+            marker = " *" if name in critical else ""
+            print(f"{name:<24} {timing['start']:>7.3f}s {timing['wall']:>7.3f}s  {timing['thread']}{marker}")
+        busy = sum(timing["wall"] for timing in self.timings.values())
+        print(f"⏱️ {self.wall:.2f}s wall for {busy:.2f}s of tasks (* critical path)")
@@ -4,7 +4,9 @@ Usage:
   python test_ascii.py                    # Show palette gradient only
   python test_ascii.py image.png          # Convert image to ASCII
   python test_ascii.py image.png 80       # Convert with custom width
+  python test_ascii.py photos/ 80 out/    # Convert every image in a directory (default out/ascii)
 """
+import os
 import sys
 try:
     from src.draw_ascii import DEFAULT_WIDTH
@@ -49,28 +51,13 @@ def show_palette():
 def test_ascii_local(image_path, width=DEFAULT_WIDTH):
     """Test ASCII conversion with a local image"""
     try:
-        from PIL import Image
-        from src.draw_ascii import get_ascii_char
-        
-        img = Image.open(image_path)
-        
-        # Resize image
-        aspect_ratio = img.width / img.height
-        height = int((width * aspect_ratio) * 0.5)
-        
-        img = img.resize((width, height))
-        img = img.convert('RGB')
-        
-        # Generate ASCII
-        ascii_str = ""
-        for y in range(height):
-            for x in range(width):
-                pixel = img.getpixel((x, y))
-                ascii_str += get_ascii_char(pixel)
-            ascii_str += "\n"
-        
-        print(ascii_str)
-        return ascii_str
+        from src.draw_ascii import iter_ascii_rows, iter_frames
+
+        # Rows are printed as they are converted; animated images print every frame
+        for index, frame in enumerate(iter_frames(image_path, width)):
+            if index:
+                print(f"\n--- frame {index + 1} ---\n")
+            sys.stdout.writelines(iter_ascii_rows(frame, width))
     
     except FileNotFoundError:
         print(f"Error: Image file not found at {image_path}")
@@ -78,6 +65,172 @@ def test_ascii_local(image_path, width=DEFAULT_WIDTH):
     except Exception as e:
         print(f"Error: {e}")
 
+def per_pixel_ascii(image, width):
+    """The original conversion: get_ascii_char on every pixel of the resized image."""
+    from src.draw_ascii import get_ascii_char, grid_size
+
+    _, height = grid_size(image.size, width)
+    image = image.resize((width, height)).convert('RGB')
+    return "".join("".join(get_ascii_char(image.getpixel((x, y))) for x in range(width)) + "\n"
+                   for y in range(height))
+
+def gradient_image(size=(64, 48)):
+    from PIL import Image
+
+    image = Image.new('RGB', size)
+    image.putdata([(x * 255 // size[0], y * 255 // size[1], (x + y) * 127 // sum(size))
+                   for y in range(size[1]) for x in range(size[0])])
+    return image
+
+def test_luma_table_matches_get_ascii_char():
+    from PIL import Image
+    from src.draw_ascii import _LUMA_TABLE, _plain_cells, get_ascii_char
+
+    colours = [(r, g, b) for r in range(0, 256, 5) for g in range(0, 256, 3) for b in range(0, 256, 7)]
+    colours += [(v, v, v) for v in range(256)]
+    image = Image.new('RGB', (len(colours), 1))
+    image.putdata(colours)
+    # The sample has to reach the undecided entries, which fall back to get_ascii_char
+    assert any(_LUMA_TABLE[value] == 0 for value in image.convert('L').tobytes())
+    assert _plain_cells(image).decode('ascii') == "".join(get_ascii_char(colour) for colour in colours)
+
+def test_image_to_ascii_matches_the_per_pixel_loop(monkeypatch):
+    from src import draw_ascii
+
+    image = gradient_image()
+    for width in (10, 50, 333):
+        assert draw_ascii.image_to_ascii(image, width) == per_pixel_ascii(image, width)
+    # More rows than fit in one band: the text is converted band by band
+    monkeypatch.setattr(draw_ascii, "BAND_CELLS", 100)
+    assert draw_ascii.image_to_ascii(image, 30) == per_pixel_ascii(image, 30)
+    assert draw_ascii.image_to_ascii(image, 150) == per_pixel_ascii(image, 150)
+
+def test_contrast_modes_spread_a_low_contrast_image():
+    from src.draw_ascii import image_to_ascii
+
+    image = gradient_image().point(lambda v: 100 + v * 30 // 255)
+    plain = image_to_ascii(image, 40)
+    assert len(set(plain) - {"\n"}) <= 2
+    for contrast in ("autocontrast", "equalize"):
+        text = image_to_ascii(image, 40, contrast=contrast)
+        assert [len(line) for line in text.splitlines()] == [len(line) for line in plain.splitlines()]
+        assert len(set(text) - {"\n"}) >= 6
+
+def test_dither_modes_mix_the_two_nearest_levels():
+    from PIL import Image
+    from src.draw_ascii import ASCII_CHARS, image_to_ascii
+
+    # Halfway between palette levels 4 and 5: plain rounding gives only level 4
+    grey = round(4.5 * 255 / (len(ASCII_CHARS) - 1))
+    image = Image.new('RGB', (64, 32), (grey, grey, grey))
+    assert set(image_to_ascii(image, 32)) == {ASCII_CHARS[4], "\n"}
+    for dither in ("ordered", "floyd-steinberg"):
+        cells = image_to_ascii(image, 32, dither=dither).replace("\n", "")
+        assert set(cells) == {ASCII_CHARS[4], ASCII_CHARS[5]}
+        assert 0.3 < cells.count(ASCII_CHARS[5]) / len(cells) < 0.7
+
+def test_unknown_quality_modes_raise():
+    import pytest
+    from src.draw_ascii import image_to_ascii
+
+    with pytest.raises(ValueError):
+        image_to_ascii(gradient_image(), 10, contrast="none")
+    with pytest.raises(ValueError):
+        image_to_ascii(gradient_image(), 10, dither="floyd_steinberg")
+
+def test_avatar_url_asks_for_the_grid_size():
+    from urllib.parse import parse_qs, urlsplit
+    from src.draw_ascii import MAX_AVATAR_SIZE, OVERSAMPLE, avatar_request_url
+
+    query = parse_qs(urlsplit(avatar_request_url("https://avatars.example/u/1?v=4&s=900", 50)).query)
+    assert query == {"v": ["4"], "s": [str(50 * OVERSAMPLE)]}
+    query = parse_qs(urlsplit(avatar_request_url("https://avatars.example/u/1", 500)).query)
+    assert query == {"s": [str(MAX_AVATAR_SIZE)]}
+
+def test_generate_logo_downloads_a_right_sized_avatar(monkeypatch):
+    from src import draw_ascii, http_cache
+    from src.mock_github import MockGitHub
+
+    monkeypatch.setattr(draw_ascii.LOGO_CACHE, "directory", None)
+    http_cache.install(cache=False)
+    try:
+        with MockGitHub(n_repos=1) as api:
+            art = draw_ascii.generate_logo(http_cache.github_client("octocat", api.base_url), 30)
+    finally:
+        http_cache.uninstall()
+    assert [path for _, path in api.requests if path.startswith("/avatars/")] == ["/avatars/octocat.png?s=120"]
+    assert len(art.splitlines()[0]) == 30
+
+def test_large_images_decode_near_the_grid_size(tmp_path):
+    import pytest
+    from src.draw_ascii import OVERSAMPLE, grid_size, image_to_ascii, open_for_ascii
+
+    big = gradient_image().resize((2400, 1800))
+    for name in ("big.jpg", "big.png"):
+        big.save(tmp_path / name)
+        image = open_for_ascii(str(tmp_path / name), 50)
+        columns, rows = grid_size(big.size, 50)
+        assert columns * OVERSAMPLE <= image.width < big.width // 2
+        assert rows * OVERSAMPLE <= image.height < big.height // 2
+        assert image_to_ascii(image, 50).count("\n") == rows
+    with pytest.raises(ValueError, match="decode budget"):
+        open_for_ascii(str(tmp_path / "big.png"), 50, max_pixels=1_000_000)
+
+def test_rows_stream_the_same_text(monkeypatch):
+    from src import draw_ascii
+
+    monkeypatch.setattr(draw_ascii, "BAND_CELLS", 64)
+    image = gradient_image()
+    rows = draw_ascii.iter_ascii_rows(image, 40)
+    first = next(rows)
+    assert first.endswith("\n") and len(first) == 41
+    assert first + "".join(rows) == per_pixel_ascii(image, 40)
+
+def test_animated_images_yield_every_frame(tmp_path):
+    from PIL import Image
+    from src.draw_ascii import iter_ascii_frames, iter_frames
+
+    frames = [gradient_image().rotate(angle) for angle in (0, 90, 180)]
+    path = str(tmp_path / "spin.gif")
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=100)
+    Image.new('RGB', (64, 48), (255, 255, 255)).save(tmp_path / "still.png")
+
+    texts = list(iter_ascii_frames(path, 20))
+    assert len(texts) == 3 and len(set(texts)) == 3
+    assert len(list(iter_frames(str(tmp_path / "still.png"), 20))) == 1
+
+def test_directories_convert_on_a_process_pool(tmp_path):
+    from src.ascii_batch import convert_directory
+    from src.draw_ascii import image_to_ascii
+
+    src_dir, out_dir = tmp_path / "images", tmp_path / "ascii"
+    (src_dir / "nested").mkdir(parents=True)
+    gradient_image().save(src_dir / "a.png")
+    gradient_image().rotate(90).save(src_dir / "nested" / "b.jpg")
+    (src_dir / "broken.png").write_bytes(b"not an image")
+    (src_dir / "notes.txt").write_text("skipped")
+
+    results = {os.path.relpath(result.source, src_dir): result
+               for result in convert_directory(str(src_dir), str(out_dir), 30, workers=2, max_pending=1)}
+    assert sorted(results) == ["a.png", "broken.png", os.path.join("nested", "b.jpg")]
+    assert results["broken.png"].error and not os.path.exists(out_dir / "broken.png.txt")
+    assert results["a.png"].rows == 20 and results["nested/b.jpg".replace("/", os.sep)].error is None
+    with open(out_dir / "a.png.txt", "r", encoding="utf-8") as f:
+        assert f.read() == image_to_ascii(gradient_image(), 30)
+    assert not [name for name in os.listdir(out_dir) if name.endswith(".partial")]
+
+def test_concurrent_cache_writes_of_one_key(tmp_path):
+    """Threads rendering the same avatar at once each write their own temp file."""
+    from concurrent.futures import ThreadPoolExecutor
+    from src.ascii_cache import AsciiCache
+
+    cache = AsciiCache(str(tmp_path))
+    key = cache.key(b"avatar", DEFAULT_WIDTH, "palette")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: cache._write(key, "@@\n" * 2000), range(200)))
+    assert cache._read(key) == "@@\n" * 2000
+    assert os.listdir(tmp_path) == [f"{key}.txt"]
+
 if __name__ == "__main__":
     print("\n" + "="*60)
     print("ASCII ART TESTER")
@@ -89,10 +242,15 @@ if __name__ == "__main__":
         image_path = sys.argv[1]
         width = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_WIDTH
 
-        print(f"\nConverting image: {image_path}")
+        print(f"\nConverting {'directory' if os.path.isdir(image_path) else 'image'}: {image_path}")
         print(f"   Width: {width} characters\n")
 
-        test_ascii_local(image_path, width)
+        if os.path.isdir(image_path):
+            from src.ascii_batch import run_directory
+
+            run_directory(image_path, sys.argv[3] if len(sys.argv) > 3 else os.path.join("out", "ascii"), width)
+        else:
+            test_ascii_local(image_path, width)
 
         print("\n" + "="*60)
         print("Done! ASCII art generated from image")
@@ -0,0 +1,39 @@
+"""
+Config tests - validation of config.json: defaults, misspelled and unknown
+keys, wrong types and values outside a key's choices.
+Usage:
+  python -m pytest -q test_config.py
+"""
+import pytest
+
+from src.config import ConfigError, validate
+
+REQUIRED = {"display_stats": ["followers"], "additional_info": "", "preferred_color": "lightblue"}
+
+
+def test_defaults_are_filled_in():
+    data = validate(dict(REQUIRED))
+    assert data["backend"] == "rest" and data["ascii_dither"] == "none" and data["variants"] == []
+
+
+def test_misspelled_and_unknown_keys_warn(capsys):
+    data = validate(dict(REQUIRED, exclude_orgainzations=False, colour="red"))
+    out = capsys.readouterr().out
+    assert data["exclude_organizations"] is False
+    assert "'exclude_orgainzations' is misspelled" in out
+    assert "unknown key 'colour'" in out
+
+
+def test_wrong_types_raise():
+    with pytest.raises(ConfigError, match="'max_workers' should be int"):
+        validate(dict(REQUIRED, max_workers="8"))
+    with pytest.raises(ConfigError, match="missing required key 'display_stats'"):
+        validate({"additional_info": "", "preferred_color": "lightblue"})
+
+
+@pytest.mark.parametrize("key", ["ascii_contrast", "ascii_dither"])
+def test_unknown_modes_fall_back_to_the_default(key, capsys):
+    data = validate(dict(REQUIRED, **{key: "floyd_steinberg"}))
+    assert data[key] == "none"
+    assert f"'{key}' should be one of" in capsys.readouterr().out
+
@@ -0,0 +1,216 @@
+"""
+Fetch tests - drive the stats collection against src.mock_github and check
+the results, including the throttling and quota fallback paths.
+Usage:
+  python -m pytest -q test_fetch.py
+"""
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from src import http_cache
+from src.config import CONFIG
+from src.fetch_info import RepoSnapshot, collect_stats
+from src.mock_github import MockGitHub, make_dataset
+from src.org_stats import PAGE_SIZE, fetch_org_stats
+from src.scheduler import SKIPPED, FetchScheduler
+
+CONFIG_PATH = Path(__file__).parent / "config.json"
+
+
+@pytest.fixture(autouse=True)
+def session():
+    http_cache.install(cache=False)
+    yield
+    http_cache.uninstall()
+
+
+@pytest.fixture
+def configure(tmp_path, monkeypatch):
+    """Point CONFIG at a copy of config.json with the given keys overridden."""
+    def configure(**overrides):
+        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data.update(overrides)
+        path = tmp_path / f"config-{time.monotonic_ns()}.json"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        monkeypatch.setattr(CONFIG, "path", str(path))
+
+    configure()
+    return configure
+
+
+def client(api: MockGitHub, login: str = "octocat"):
+    return http_cache.github_client(login, api.base_url)
+
+
+def endpoint_calls(api: MockGitHub, endpoint: str) -> int:
+    return sum(1 for _, path in api.requests if path.split("?")[0].endswith(f"/{endpoint}"))
+
+
+def test_throttled_responses_reach_the_scheduler(configure):
+    with MockGitHub(make_dataset(n_repos=30)) as api:
+        expected = RepoSnapshot(client(api))
+    with MockGitHub(make_dataset(n_repos=30), throttle_every=7, retry_after=0) as api:
+        g = client(api)
+        scheduler = FetchScheduler(g, max_workers=4)
+        snapshot = RepoSnapshot(g, scheduler)
+
+    assert scheduler.stats["throttled"] > 0
+    assert scheduler.stats["skipped"] == 0
+    assert snapshot.language_totals() == expected.language_totals()
+    assert snapshot.activity_totals() == expected.activity_totals()
+
+
+def test_exhausted_quota_skips_instead_of_waiting_for_the_reset(configure):
+    with MockGitHub(make_dataset(n_repos=20), rate_limit=12, reset_after=3600) as api:
+        g = client(api)
+        repos = list(g.get_user().get_repos())
+        scheduler = FetchScheduler(g, max_workers=2, max_wait=5)
+        start = time.monotonic()
+        results = scheduler.map(lambda repo: repo.get_languages(), repos)
+
+    assert time.monotonic() - start < 5
+    assert scheduler.stats["throttled"] >= 1
+    skipped = sum(1 for result in results if result is SKIPPED)
+    assert 0 < skipped < len(repos)
+    assert scheduler.stats["skipped"] == skipped
+
+
+def test_items_still_throttled_after_the_retries_are_skipped():
+    from github import GithubException
+
+    def throttled(item):
+        if item % 2:
+            raise GithubException(429, {"message": "secondary rate limit"}, {"Retry-After": "0"})
+        return item
+
+    # Only the remaining quota is read from the client
+    scheduler = FetchScheduler(SimpleNamespace(rate_limiting=(5000, 5000)), max_workers=2, max_retries=2)
+    assert scheduler.map(throttled, [0, 1, 2, 3]) == [0, SKIPPED, 2, SKIPPED]
+    assert scheduler.stats["throttled"] == 4 and scheduler.stats["skipped"] == 2
+
+
+def test_graphql_queries_are_retried_on_server_errors():
+    retry = http_cache.api_retry()
+    assert retry.is_retry("POST", 502) and retry.is_retry("GET", 503)
+    assert not retry.is_retry("POST", 429) and not retry.is_retry("GET", 403)
+
+
+def test_repos_past_the_quota_budget_use_last_known_values(configure, tmp_path):
+    state_path = str(tmp_path / "stats_state.json")
+    dataset = make_dataset(n_repos=20)
+    with MockGitHub(dataset) as api:
+        expected, _ = collect_stats(client(api), "rest", state_path=state_path)
+
+    # Every repo looks changed, but the quota only covers a few of them
+    for repo in dataset["octocat"]["repos"]:
+        repo["pushed_at"] = "2030-01-01T00:00:00Z"
+    with MockGitHub(dataset, rate_limit=75) as api:
+        stats, _ = collect_stats(client(api), "rest", state_path=state_path)
+        fetched = endpoint_calls(api, "languages")
+
+    assert 0 < fetched < len(dataset["octocat"]["repos"])
+    assert stats == expected
+    with open(state_path, "r", encoding="utf-8") as f:
+        stamps = [entry["stamp"] for entry in json.load(f)["repos"].values()]
+    # Skipped repos keep the stamp their values were computed at, so the next run refetches them
+    assert sum(1 for stamp in stamps if stamp and stamp[0] == "2030-01-01T00:00:00Z") == fetched
+
+
+def read_stamps(state_path: str) -> dict:
+    with open(state_path, "r", encoding="utf-8") as f:
+        return {name: entry["stamp"] for name, entry in json.load(f)["repos"].items()}
+
+
+def test_unchanged_repos_are_restored_from_the_state_file(configure, tmp_path):
+    state_path = str(tmp_path / "stats_state.json")
+    dataset = make_dataset(n_repos=20)
+    with MockGitHub(dataset) as api:
+        expected, _ = collect_stats(client(api), "rest", state_path=state_path)
+    with MockGitHub(dataset) as api:
+        stats, _ = collect_stats(client(api), "rest", state_path=state_path)
+        assert endpoint_calls(api, "languages") == 0
+
+    dataset["octocat"]["repos"][0]["pushed_at"] = "2030-01-01T00:00:00Z"
+    with MockGitHub(dataset) as api:
+        collect_stats(client(api), "rest", state_path=state_path)
+        assert [path for _, path in api.requests if path.endswith("/languages")] == ["/repos/octocat/repo-0/languages"]
+    assert stats == expected
+
+
+def test_failed_detail_calls_leave_the_repo_unstamped(configure, tmp_path):
+    state_path = str(tmp_path / "stats_state.json")
+    dataset = make_dataset(n_repos=10)
+    with MockGitHub(dataset) as api:
+        expected, _ = collect_stats(client(api), "rest", state_path=state_path)
+
+    fresh_path = str(tmp_path / "fresh_state.json")
+    with MockGitHub(dataset, failures={"/repos/octocat/repo-1/commits": 404}) as api:
+        degraded, _ = collect_stats(client(api), "rest", state_path=fresh_path)
+    stamps = read_stamps(fresh_path)
+    assert stamps["octocat/repo-1"] is None
+    assert all(stamps[name] for name in stamps if name != "octocat/repo-1")
+    assert degraded != expected
+
+    # Only the unstamped repo is fetched again, and its values are complete this time
+    with MockGitHub(dataset) as api:
+        stats, _ = collect_stats(client(api), "rest", state_path=fresh_path)
+        assert [path for _, path in api.requests if path.endswith("/languages")] == ["/repos/octocat/repo-1/languages"]
+    assert stats == expected
+    assert read_stamps(fresh_path)["octocat/repo-1"]
+
+
+@pytest.mark.parametrize("exclude_organizations", [True, False])
+@pytest.mark.parametrize("login", [None, "hubot"])
+def test_rest_and_graphql_backends_agree(configure, tmp_path, login, exclude_organizations):
+    configure(exclude_organizations=exclude_organizations)
+    with MockGitHub(make_dataset(logins=["octocat", "hubot"], n_repos=40)) as api:
+        results = {backend: collect_stats(client(api), backend, login, str(tmp_path / f"{backend}.json"))
+                   for backend in ("rest", "graphql")}
+    assert results["rest"] == results["graphql"]
+
+
+@pytest.mark.parametrize("include_forks", [False, True])
+def test_org_totals_agree_across_backends(configure, include_forks):
+    members = ["octocat", "hubot", "monalisa", "defunkt"]
+    dataset = make_dataset(logins=members, n_repos=0, orgs={"acme": 230})
+    with MockGitHub(dataset) as api:
+        g = http_cache.github_client("octocat", api.base_url, per_page=PAGE_SIZE)
+        totals = {backend: fetch_org_stats(g, "acme", backend, members=True, include_forks=include_forks)
+                  for backend in ("rest", "graphql")}
+        listing = [path for _, path in api.requests if path.startswith("/orgs/acme/repos")]
+    # Server-side filter and full pages: 230 repos take three listing requests
+    assert len(listing) == 3 and all("type=public" in path and "per_page=100" in path for path in listing)
+    assert totals["rest"].pop("backend") == "rest" and totals["graphql"].pop("backend") == "graphql"
+    assert totals["rest"] == totals["graphql"]
+
+    public = [repo for repo in dataset["acme"]["repos"] if not repo["private"] and (include_forks or not repo["fork"])]
+    sources = [repo for repo in public if not repo["fork"]]
+    stats = totals["rest"]
+    assert (stats["repos"], stats["forks"], stats["skipped"]) == (len(public), len(public) - len(sources), 0)
+    assert stats["total_stars"] == sum(repo["stargazers_count"] for repo in public)
+    assert stats["total_commits"] == sum(repo["commits"] or 0 for repo in sources)
+    assert stats["members"]["hubot"]["commits"] == sum(repo["contributors"].get("hubot", 0) for repo in sources)
+
+
+def test_mock_routes_graphql_on_the_query_arguments():
+    from github import GithubException
+    from src.fetch_info import REPO_FIELDS, REPOS_QUERY, graphql_nodes
+
+    query = REPOS_QUERY % {"login_var": ", $login: String!", "owner": "user(login: $login)",
+                           "affiliations": "OWNER", "fields": REPO_FIELDS}
+    # The same query laid out differently, with the arguments in another order
+    reformatted = query.replace("privacy: PUBLIC, ownerAffiliations: [OWNER]",
+                                "\n  ownerAffiliations:[ OWNER ],\n  privacy:PUBLIC\n")
+    with MockGitHub(make_dataset(logins=["octocat", "hubot"], n_repos=20)) as api:
+        g = client(api)
+        names = [[node["nameWithOwner"] for node in graphql_nodes(g, text, "user", {"login": "hubot"}, 50)]
+                 for text in (query, reformatted)]
+        with pytest.raises(GithubException, match="UNSUPPORTED"):
+            list(graphql_nodes(g, "query { viewer { login } }", "viewer", {}, 50))
+    assert names[0] == names[1] and names[0]
+    assert all(name.startswith("hubot/") for name in names[0])
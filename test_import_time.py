@@ -0,0 +1,67 @@
+"""
+Import-time tests - run `python -X importtime` on the project's modules and
+fail when one is too slow to import or pulls in PIL, PyGithub, requests or
+dotenv at import time, and check the text card is drawn without them.
+Usage:
+  python -m pytest -q test_import_time.py
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from test_render import STATS
+
+ROOT = Path(__file__).parent
+MODULES = ["src", "src.config", "src.layout", "src.fetch_info", "src.gen_readme"]
+HEAVY = ["PIL", "github", "requests", "dotenv"]
+BUDGET_MS = 50
+RUNS = 3
+
+
+def import_profile(module: str) -> dict:
+    """{imported module: cumulative microseconds} for one fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def heavy_modules(names) -> list:
+    return sorted(name for name in names if name.split(".")[0] in HEAVY)
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_stays_within_budget(module):
+    profiles = [import_profile(module) for _ in range(RUNS)]
+    assert min(profile[module] for profile in profiles) / 1000 <= BUDGET_MS
+    assert heavy_modules(profiles[-1]) == []
+
+
+TEXT_CARD = """
+import json, sys
+from src.config import CONFIG
+from src.draw_ascii import get_ascii_char
+from src.gen_readme import fetch_lines
+
+ascii_art = "".join(get_ascii_char((v, v, v)) for v in range(0, 256, 8)) + "\\n"
+lines = list(fetch_lines(CONFIG, json.loads(sys.argv[1]), ascii_art, color=True))
+print(json.dumps({"lines": len(lines), "modules": sorted(sys.modules)}))
+"""
+
+
+def test_text_card_needs_no_heavy_imports():
+    result = subprocess.run([sys.executable, "-c", TEXT_CARD, json.dumps(STATS)],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    output = json.loads(result.stdout)
+    assert output["lines"] > 0
+    assert heavy_modules(output["modules"]) == []
@@ -0,0 +1,12 @@
+"""
+Command-line tests - options that depend on each other.
+Usage:
+  python -m pytest -q test_main.py
+"""
+from main import parse_args
+
+
+def test_profiler_dumps_imply_profile():
+    assert parse_args(["--cprofile", "run.prof"]).profile == "out/profile.json"
+    assert parse_args(["--tracemalloc", "run.snap", "--profile", "trace.json"]).profile == "trace.json"
+    assert parse_args([]).profile is None
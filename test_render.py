@@ -0,0 +1,182 @@
+"""
+Render tests - check the card drawing shortcuts against what they replace:
+the glyph atlas against per-line draw.text and the palette PNG against the
+RGBA card it encodes, the SVG card against the layout, and that unchanged
+inputs skip rendering.
+Usage:
+  python -m pytest -q test_render.py
+"""
+import json
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from io import BytesIO
+
+import pytest
+from PIL import Image, ImageChops, ImageDraw
+
+from src.config import CONFIG, Config, ConfigError, validate
+from src.draw_ascii import image_to_ascii
+from src.gen_readme import encode_png, load_font, render_image, update_readme, write_card
+from src.glyph_atlas import draw_text_block, get_atlas
+from src.svg_card import render_svg
+from test_ascii import gradient_image
+
+COLOR = (173, 216, 230, 255)
+
+# Card contents, so rendering doesn't depend on the network
+STATS = {
+    "username": "octocat",
+    "bio": "Building things that fetch other things",
+    "location": "San Francisco",
+    "company": "@github",
+    "email": None,
+    "hireable": True,
+    "followers": 1234,
+    "following": 56,
+    "public_repos": 42,
+    "public_gists": 8,
+    "total_stars": 9001,
+    "bytes_of_code": 12345678,
+    "created_at": "25-01-2011",
+    "updated_at": "01-06-2024",
+    "languages": "\n- Python: 5123456 bytes of code\n- Go: 1234567 bytes of code",
+    "total_commits": 4321,
+    "total_issues": 123,
+    "total_prs": 45,
+}
+
+
+@pytest.fixture(scope="module")
+def font():
+    font, _ = load_font(16)
+    if font is None:
+        pytest.skip("no monospace font installed")
+    return font
+
+
+def draw_lines(lines, font, line_spacing, use_atlas) -> Image.Image:
+    canvas = Image.new("RGBA", (max(map(len, lines)) * 12 + 20, len(lines) * line_spacing + 40), (0, 0, 0, 200))
+    draw = ImageDraw.Draw(canvas)
+    if use_atlas:
+        draw_text_block(draw, (10, 10), lines, line_spacing, COLOR, font)
+    else:
+        for i, line in enumerate(lines):
+            draw.text((10, 10 + i * line_spacing), line, fill=COLOR, font=font)
+    return canvas
+
+
+def assert_same_pixels(lines, font, line_spacing):
+    reference = draw_lines(lines, font, line_spacing, use_atlas=False)
+    assert ImageChops.difference(reference, draw_lines(lines, font, line_spacing, use_atlas=True)).getbbox() is None
+
+
+def test_glyph_atlas_matches_draw_text(font):
+    lines = image_to_ascii(gradient_image(), 60).splitlines()
+    lines[0] = "@@ short line"
+    assert get_atlas(font).supports(lines)
+    assert_same_pixels(lines, font, font.size + 4)
+
+
+def test_glyph_atlas_falls_back_to_draw_text(font):
+    # The full block overflows its cell, and lines closer than a cell would overlap
+    lines = ["#█#", "@@@", ".:-=+"]
+    assert not get_atlas(font).supports(lines)
+    assert_same_pixels(lines, font, font.size + 4)
+    assert_same_pixels(["@@@", "...", "###"], font, 6)
+
+
+def card(font, **overrides):
+    config = dict(CONFIG.data(), **overrides)
+    return render_image(config, STATS, image_to_ascii(gradient_image(), 40), font)
+
+
+def test_palette_png_decodes_to_the_rendered_card(font):
+    image = card(font)
+    data = encode_png(image)
+    decoded = Image.open(BytesIO(data))
+    assert decoded.mode == "P"
+    assert decoded.convert("RGBA").tobytes() == image.tobytes()
+    assert encode_png(card(font)) == data
+
+
+def test_full_coverage_levels_stay_selectable(font):
+    exact = card(font, coverage_levels=None)
+    assert exact.getcolors(256) is None  # Too many colours for a palette, so the PNG is RGBA
+    decoded = Image.open(BytesIO(encode_png(exact)))
+    assert decoded.mode == "RGBA" and decoded.tobytes() == exact.tobytes()
+    assert validate(dict(CONFIG.data(), coverage_levels=None))["coverage_levels"] is None
+    with pytest.raises(ConfigError):
+        validate(dict(CONFIG.data(), coverage_levels=1))
+
+
+def test_unchanged_card_is_not_rendered_again(font, tmp_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(CONFIG.data()), encoding="utf-8")
+    config = Config(str(config_path))
+    ascii_art = image_to_ascii(gradient_image(), 40)
+    output_path = str(tmp_path / "out" / "fetch.png")
+
+    assert write_card(config, STATS, ascii_art, output_path)
+    written = os.stat(output_path).st_mtime_ns
+    assert not write_card(config, STATS, ascii_art, output_path)
+    assert os.stat(output_path).st_mtime_ns == written
+
+    # Changing config.json is picked up by mtime and changes the fingerprint
+    config_path.write_text(json.dumps(dict(CONFIG.data(), preferred_color="red")), encoding="utf-8")
+    os.utime(config_path, ns=(written + 10**9, written + 10**9))
+    assert config["preferred_color"] == "red"
+    assert write_card(config, STATS, ascii_art, output_path)
+    assert write_card(config, dict(STATS, total_stars=9002), ascii_art, output_path)
+
+
+def test_unchanged_readme_is_not_rewritten(tmp_path, monkeypatch):
+    monkeypatch.setattr(CONFIG, "path", os.path.abspath(CONFIG.path))
+    monkeypatch.chdir(tmp_path)
+    with open("README.md", "w", encoding="utf-8") as f:
+        f.write("# Profile\n<!--- START OF DELETION --->setup notes<!--- END OF DELETION --->\n")
+    update_readme("out/fetch.png")
+    written = os.stat("README.md").st_mtime_ns
+    update_readme("out/fetch.png")
+    assert os.stat("README.md").st_mtime_ns == written
+    update_readme("out/fetch.svg")
+    with open("README.md", "r", encoding="utf-8") as f:
+        content = f.read()
+    assert "setup notes" not in content and "<img src='out/fetch.svg'" in content
+
+
+SVG_TEXT = "{http://www.w3.org/2000/svg}text"
+
+
+def test_svg_card_has_a_text_element_per_layout_line():
+    ascii_art = image_to_ascii(gradient_image(), 40)
+    config = dict(CONFIG.data(), additional_info="Stack: C <3 & Rust")
+    root = ET.fromstring(render_svg(config, STATS, ascii_art))
+    texts = [element.text for element in root.iter(SVG_TEXT)]
+    art = [line for line in ascii_art.splitlines() if line.strip()]
+    assert texts[:len(art)] == art  # Spaces inside the art are kept
+    assert any("octocat" in text for text in texts)
+    assert any("C <3 & Rust" in text for text in texts)
+    assert all(float(element.get("textLength")) > 0 for element in root.iter(SVG_TEXT))
+
+
+SVG_CARD = """
+import json, sys
+from src.config import CONFIG
+from src.svg_card import write_svg
+
+config = dict(CONFIG.data(), variants=[{"name": "light", "background": "light", "scale": 2, "preferred_color": "red"}])
+stats, output_path = json.loads(sys.argv[1]), sys.argv[2]
+changed = [write_svg(config, stats, "@@\\n..", output_path) for _ in range(2)]
+print(json.dumps({"changed": changed, "pil": any(name.split(".")[0] == "PIL" for name in sys.modules)}))
+"""
+
+
+def test_svg_card_and_variants_are_written_without_pil(tmp_path):
+    output_path = str(tmp_path / "fetch.svg")
+    result = subprocess.run([sys.executable, "-c", SVG_CARD, json.dumps(STATS), output_path],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout) == {"changed": [True, False], "pil": False}
+    light = ET.parse(tmp_path / "fetch-light.svg").getroot()
+    assert light.get("width") == str(2 * int(ET.parse(output_path).getroot().get("width")))
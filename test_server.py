@@ -0,0 +1,81 @@
+"""
+Card server tests - run a CardServer against src.mock_github and check what
+it refuses: webhooks without a secret, logins past the allowlist or the cap,
+and the details of unexpected errors.
+Usage:
+  python -m pytest -q test_server.py
+"""
+import pytest
+import requests
+
+from src import draw_ascii, http_cache
+from src.mock_github import MockGitHub, make_dataset
+from src.server import CardServer
+
+LOGINS = ["octocat", "hubot", "monalisa"]
+
+
+@pytest.fixture(autouse=True)
+def session(monkeypatch):
+    monkeypatch.setattr(draw_ascii.LOGO_CACHE, "directory", None)
+    http_cache.install(cache=False)
+    yield
+    http_cache.uninstall()
+
+
+@pytest.fixture
+def api():
+    with MockGitHub(make_dataset(logins=LOGINS, n_repos=5)) as api:
+        yield api
+
+
+def serve(api, tmp_path, **options) -> CardServer:
+    return CardServer("octocat", api_url=api.base_url, port=0, state_dir=str(tmp_path / "server"), **options)
+
+
+def test_webhook_is_refused_without_a_secret(api, tmp_path):
+    with serve(api, tmp_path) as server:
+        response = requests.post(f"{server.base_url}/webhook", json={"repository": {"owner": {"login": "octocat"}}})
+    assert response.status_code == 403
+
+
+def test_logins_outside_the_allowlist_are_not_fetched(api, tmp_path):
+    with serve(api, tmp_path, logins=["OctoCat"]) as server:
+        assert requests.get(f"{server.base_url}/octocat/stats.json").status_code == 200
+        requests_before = len(api.requests)
+        assert requests.get(f"{server.base_url}/hubot/stats.json").status_code == 403
+    assert len(api.requests) == requests_before
+    assert not (tmp_path / "server" / "hubot").exists()
+
+
+def test_distinct_logins_are_capped(api, tmp_path):
+    with serve(api, tmp_path, max_logins=1) as server:
+        assert requests.get(f"{server.base_url}/nobody/stats.json").status_code == 404
+        assert requests.get(f"{server.base_url}/hubot/stats.json").status_code == 200
+        assert requests.get(f"{server.base_url}/octocat/stats.json").status_code == 403
+        assert requests.get(f"{server.base_url}/hubot/fetch.txt").status_code == 200
+
+
+def test_errors_are_logged_not_sent(api, tmp_path, monkeypatch, capsys):
+    def render(login, fmt, variant=None):
+        raise RuntimeError("secret detail")
+
+    with serve(api, tmp_path) as server:
+        monkeypatch.setattr(server, "render", render)
+        response = requests.get(f"{server.base_url}/octocat/stats.json")
+    assert response.status_code == 500
+    assert "secret detail" not in response.text
+    assert "secret detail" in capsys.readouterr().err
+
+
+def test_font_is_loaded_once_for_every_request_thread(api, tmp_path, monkeypatch):
+    from src import gen_readme
+
+    loads = []
+    load_font = gen_readme.load_font
+    monkeypatch.setattr(gen_readme, "load_font", lambda size: loads.append(size) or load_font(size))
+    with serve(api, tmp_path) as server:
+        for login in LOGINS:
+            response = requests.get(f"{server.base_url}/{login}/fetch.png")
+            assert response.status_code == 200 and response.content.startswith(b"\x89PNG")
+    assert len(loads) == 1
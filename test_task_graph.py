@@ -0,0 +1,45 @@
+"""
+Task graph tests - dependent tasks overlap where they can, and a failure
+stops the run.
+Usage:
+  python -m pytest -q test_task_graph.py
+"""
+import threading
+import time
+
+import pytest
+
+from src.task_graph import TaskGraph
+
+
+def test_independent_tasks_overlap():
+    graph = TaskGraph()
+    graph.add("a", lambda: time.sleep(0.2) or 1)
+    graph.add("b", lambda: time.sleep(0.2) or 2)
+    graph.add("sum", lambda a, b: a + b, "a", "b")
+    assert graph.run() == {"a": 1, "b": 2, "sum": 3}
+    assert graph.wall < 0.35
+    assert graph.critical_path()[-1] == "sum"
+
+
+def test_a_failure_starts_no_further_tasks():
+    started = []
+    release = threading.Event()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    def slow():
+        release.wait(5)
+        return "slow"
+
+    graph = TaskGraph(max_workers=2)
+    graph.add("fail", fail)
+    graph.add("slow", slow)
+    graph.add("after_fail", lambda _: started.append("after_fail"), "fail")
+    graph.add("independent", lambda _: started.append("independent"), "slow")
+    threading.Timer(0.2, release.set).start()
+    with pytest.raises(RuntimeError, match="boom"):
+        graph.run()
+    # slow was already running and finished, but nothing new started after the failure
+    assert started == [] and "slow" in graph.timings